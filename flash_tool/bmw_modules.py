@@ -9,7 +9,7 @@ Created: November 3, 2025
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
 class Protocol(Enum):
@@ -250,6 +250,14 @@ E60_N54_MODULES = [
 ]
 
 
+# Lookup tables built once from the static module list
+_BY_ABBR = {m.abbreviation: m for m in E60_N54_MODULES}
+_CAN_MODULES: Tuple[BMWModule, ...] = tuple(sorted(
+    (m for m in E60_N54_MODULES if m.can_id is not None),
+    key=lambda m: m.abbreviation,
+))
+
+
 def get_module_by_abbreviation(abbreviation: str) -> Optional[BMWModule]:
     """
     Get module by abbreviation (e.g., 'DME', 'EGS')
@@ -260,11 +268,7 @@ def get_module_by_abbreviation(abbreviation: str) -> Optional[BMWModule]:
     Returns:
         BMWModule if found, None otherwise
     """
-    abbreviation = abbreviation.upper()
-    for module in E60_N54_MODULES:
-        if module.abbreviation == abbreviation:
-            return module
-    return None
+    return _BY_ABBR.get(abbreviation.upper())
 
 
 def get_module_by_can_id(can_id: int) -> Optional[BMWModule]:
@@ -299,9 +303,9 @@ def get_module_by_kline_address(address: int) -> Optional[BMWModule]:
     return None
 
 
-def get_can_modules() -> List[BMWModule]:
-    """Get all modules accessible via CAN bus"""
-    return [m for m in E60_N54_MODULES if m.can_id is not None]
+def get_can_modules() -> Tuple[BMWModule, ...]:
+    """Get all modules accessible via CAN bus, sorted by abbreviation (shared, read-only tuple)"""
+    return _CAN_MODULES
 
 
 def get_kline_modules() -> List[BMWModule]:
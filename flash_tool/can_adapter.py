@@ -23,13 +23,14 @@ Message = _can.Message
 BusABC = getattr(_can, 'BusABC', object)
 
 
-def create_bus(interface: str, channel: str, bitrate: int):
+def create_bus(interface: str, channel: str, bitrate: int, fd: bool = False):
     """Create and return a python-can Bus instance.
 
     Args:
         interface: CAN interface type ('pcan', 'socketcan', 'kvaser', etc.)
         channel: CAN channel identifier (e.g., 'PCAN_USBBUS1', 'can0')
         bitrate: CAN bus bitrate in bits/second (typically 500000 for BMW)
+        fd: Open the channel in CAN-FD mode
 
     Returns:
         can.Bus: Configured CAN bus instance
@@ -47,6 +48,8 @@ def create_bus(interface: str, channel: str, bitrate: int):
         raise ImportError("python-can library required but not installed")
 
     try:
+        if fd:
+            return _can.Bus(interface=interface, channel=channel, bitrate=bitrate, fd=True)
         return _can.Bus(interface=interface, channel=channel, bitrate=bitrate)
     except Exception as e:
         raise OSError(
@@ -16,6 +16,7 @@ Classes:
     None (functional module)
 
 Functions:
+    main(batch: bool, cf_min_gap_ms: float, can_fd: bool) -> None
     main_menu() -> None
     hardware_connection_menu() -> None
     scan_com_ports_full() -> None
@@ -39,23 +40,37 @@ Functions:
 
 Variables (Module-level):
     logger: logging.Logger - Application logger instance
+    BACKUP_DIR: Path - Repository-level backups/ directory
+    HAS_TERMIOS: bool - termios/tty available for single-key pauses
 """
 
 import click
+import functools
+import io
+import json
 import logging
+import mmap
+import operator
 import os
 import sys
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Tuple, cast
+from typing import Callable, Optional, Dict, Any, List, Sequence, Tuple, cast
 from datetime import datetime
+try:
+    import termios
+    import tty
+    HAS_TERMIOS = True
+except ImportError:  # Windows console
+    HAS_TERMIOS = False
 from . import com_scanner
 from . import connection_manager
 from . import obd_reader
 from . import obd_session_manager
 from . import bmw_modules
-from . import dtc_database
 from . import map_manager
-from . import map_flasher
 from . import backup_manager
 from . import settings_manager
 from . import operation_logger
@@ -63,18 +78,180 @@ from . import help_system
 from . import uds_handler
 from . import tuning_parameters
 from . import validated_maps
-from . import map_patcher
-from . import software_detector
+from . import direct_can_flasher
 from .direct_can_flasher import DirectCANFlasher
+
+logger = logging.getLogger(__name__)
+
+# Banner rules shared by the menu screens
+_H60 = "=" * 60
+_H70 = "=" * 70
+_SEP = "─" * 70
+
+# Bytes per MiB for size displays
+_MB = 1 << 20
+
+# Repository-level backups/ directory, resolved once at import
+BACKUP_DIR = Path(__file__).resolve().parent.parent / "backups"
+
+
+# Batch mode (--batch / --no-prompt): skip "Press Enter to continue" pauses
+_BATCH = False
+
+
+def set_batch_mode(enabled: bool) -> None:
+    """Enable or disable batch mode for scripted runs."""
+    global _BATCH
+    _BATCH = enabled
+
+
+# Not attached to a terminal (piped/scripted) or UDS_CLI_BATCH set: never
+# block on "Press Enter"
+_INTERACTIVE = sys.stdin is not None and sys.stdin.isatty() and not os.environ.get("UDS_CLI_BATCH")
+
+
+def _pause(message: str = "\nPress Enter to continue...") -> None:
+    """Wait for a key before returning to the menu, unless running unattended.
+
+    On POSIX terminals the key is read in cbreak mode, so any single key
+    continues without waiting for a full line; elsewhere it falls back to input().
+    """
+    if not _INTERACTIVE or _BATCH:
+        return
+    if not HAS_TERMIOS:
+        input(message)
+        return
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    fd = sys.stdin.fileno()
+    try:
+        old = termios.tcgetattr(fd)
+    except termios.error:
+        input()
+        return
+    try:
+        tty.setcbreak(fd)
+        os.read(fd, 1)
+        # Drop the rest of multi-byte keys (arrows, F-keys) so they don't
+        # leak into the next prompt
+        termios.tcflush(fd, termios.TCIFLUSH)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+    sys.stdout.write("\n")
+
+
+def _read_confirmation(prompt: str) -> str:
+    """Show `prompt` and return the typed line verbatim, minus the newline.
+
+    Used for typed safety confirmations, which are compared exactly and
+    need none of click.prompt's conversion or re-prompt handling.
+
+    Raises:
+        click.Abort: If stdin reaches EOF
+    """
+    sys.stdout.write(f"{prompt}: ")
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise click.Abort()
+    return line.rstrip("\n")
+
+
+@contextmanager
+def interactive_screen(title: Optional[str] = None):
+    """Print a screen banner, run the body, then pause once on every exit path."""
+    if title:
+        click.echo(f"\n{_H60}\n{title}\n{_H60}")
+    try:
+        yield
+    finally:
+        _pause()
+
+
+def _emit(lines) -> None:
+    """Write a block of lines to stdout with one write and one flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+# Strips the counters from a progress message, leaving the phase it describes
+_NO_DIGITS = str.maketrans("", "", "0123456789")
+
+
+class _RateLimitedProgress:
+    """progress_callback that prints at most one line per min_interval within a phase.
+
+    A message whose text (ignoring its counters) differs from the last one
+    starts a new phase and is always printed, as is 100%. Repeated updates
+    of the same phase ("Transferring data... 3/512") are throttled and
+    repeated percentages dropped.
+
+    Args:
+        prefix: Text printed before the "[ pct%]" tag
+        min_interval: Minimum seconds between printed updates
+    """
+
+    def __init__(self, prefix: str = "", min_interval: float = 0.05):
+        self._prefix = prefix
+        self._min_interval = min_interval
+        self._last = float("-inf")
+        self._last_pct = -1
+        self._phase: Optional[str] = None
+
+    def __call__(self, msg: str, pct: int) -> None:
+        now = time.monotonic()
+        phase = msg.translate(_NO_DIGITS)
+        if (pct != 100 and phase == self._phase
+                and (pct == self._last_pct or now - self._last < self._min_interval)):
+            return
+        click.echo(f"{self._prefix}[{pct:3d}%] {msg}")
+        self._last = now
+        self._last_pct = pct
+        self._phase = phase
+
+
+def _emit_kv(title: str, data: Dict[str, Any], known_labels: Sequence[Tuple[str, str, str]],
+             width: int = 22, extra_title: str = "Additional Data:") -> None:
+    """Echo a label/value table in one write.
+
+    Args:
+        title: Heading printed above the table
+        data: Values keyed by field name
+        known_labels: (key, label, unit suffix) rows shown first, in order, when present
+        width: Column the values are aligned to
+        extra_title: Heading for any fields not in known_labels
+    """
+    known = {key for key, _, _ in known_labels}
+    lines = [f"\n{title}", "-" * 60]
+    lines += [f"{label:<{width}}{data[key]}{suffix}" for key, label, suffix in known_labels if key in data]
+    other = [f"  {key}: {value}" for key, value in data.items() if key not in known]
+    if other:
+        lines += [f"\n{extra_title}", *other]
+    click.echo("\n".join(lines))
+
+
+def _ts() -> str:
+    """Local-time YYYYMMDD_HHMMSS stamp for output filenames."""
+    t = time.localtime()
+    return f"{t.tm_year:04d}{t.tm_mon:02d}{t.tm_mday:02d}_{t.tm_hour:02d}{t.tm_min:02d}{t.tm_sec:02d}"
+
+
+def _parse_hex(text: str) -> int:
+    """Parse a hex offset/size as typed by the user, with or without a 0x prefix.
+
+    Raises:
+        ValueError: If text is not valid hex
+    """
+    return int(text, 16)
+
+
 def map_options_menu():
     """Tuning Presets submenu - Configure tuning options before flash (canonical)."""
     current_preset_name = "stock"
     current_preset = tuning_parameters.get_preset(current_preset_name)
     
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== Tuning Presets & Options ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== Tuning Presets & Options ===\n{_H60}")
         click.echo(f"\nCurrent preset: {current_preset_name}")
         click.echo("\n1. Load Preset Configuration")
         click.echo("2. View Preset Details")
@@ -338,16 +515,14 @@ def view_connection_settings():
             desc = details.get('description', '')
             click.echo(f"  - {port.device}: {desc} ({vid}:{pid})")
 
-    input("\nPress Enter to continue...")
+    _pause()
     return
 
 
 def diagnostics_bmw_menu():
     """Diagnostics (BMW DME/Modules) submenu."""
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== Diagnostics (BMW DME/Modules) ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== Diagnostics (BMW DME/Modules) ===\n{_H60}")
         click.echo("\n1. Scan All Modules for DTCs")
         click.echo("2. Read DTCs from Selected Module")
         click.echo("3. Clear All Module DTCs")
@@ -382,9 +557,7 @@ def diagnostics_obd_menu():
     - Advanced diagnostics (pending DTCs, freeze frame, reset status, etc.)
     """
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== Diagnostics (OBD-II) ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== Diagnostics (OBD-II) ===\n{_H60}")
         click.echo("\n1. Read Stored DTCs (Mode 03)")
         click.echo("2. Read Pending DTCs (Mode 07)")
         click.echo("3. Filter DTCs by Status")
@@ -446,9 +619,7 @@ def diagnostics_obd_menu():
 
 def backup_full_ecu():
     """Backup complete ECU flash memory."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Backup Full ECU ===" )
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Backup Full ECU ===\n{_H60}")
     click.echo("\nThis will create a complete backup of ECU flash memory.")
     click.echo("The backup will be saved in backups/VIN/ directory.")
     click.echo("\nWARNING: This operation takes 2-5 minutes. Do not disconnect during backup!")
@@ -456,7 +627,7 @@ def backup_full_ecu():
     proceed = click.confirm("\nProceed with full ECU backup?", default=False)
     if not proceed:
         click.echo("Backup cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     try:
@@ -472,7 +643,7 @@ def backup_full_ecu():
         flasher = DirectCANFlasher()
         if not flasher.connect():
             click.echo("\nERROR: Could not connect to CAN interface. Check cable and drivers.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
 
         try:
@@ -503,9 +674,7 @@ def backup_full_ecu():
             checksum = backup_manager.calculate_checksum(data)
             size = len(data)
 
-            click.echo("\n" + "="*60)
-            click.echo(" BACKUP COMPLETED SUCCESSFULLY")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\n BACKUP COMPLETED SUCCESSFULLY\n{_H60}")
             click.echo(f"\nBackup File: {output_path}")
             click.echo(f"File Size:   {size:,} bytes ({size/1024/1024:.2f} MB)")
             click.echo(f"VIN:         {vin}")
@@ -520,20 +689,18 @@ def backup_full_ecu():
         click.echo(f"\nBackup error: {e}")
         logger.exception("Backup failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def backup_calibration_area():
     """Backup calibration area (map data) only via direct CAN."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Backup Calibration Area ===" )
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Backup Calibration Area ===\n{_H60}")
     click.echo("\nThis will backup the calibration area (tuning map data) using K+DCAN.")
 
     proceed = click.confirm("\nProceed with calibration backup?", default=False)
     if not proceed:
         click.echo("Backup cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
 
     try:
@@ -548,7 +715,7 @@ def backup_calibration_area():
         flasher = DirectCANFlasher()
         if not flasher.connect():
             click.echo("ERROR: Could not connect to CAN interface. Check cable and drivers.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
 
         try:
@@ -575,9 +742,7 @@ def backup_calibration_area():
             size = len(data)
             checksum = backup_manager.calculate_checksum(data)
 
-            click.echo("\n" + "="*60)
-            click.echo("CALIBRATION BACKUP COMPLETED")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\nCALIBRATION BACKUP COMPLETED\n{_H60}")
             click.echo(f"\nBackup File: {output_path}")
             click.echo(f"File Size:   {size:,} bytes ({size/1024/1024:.2f} MB)")
             click.echo(f"VIN:         {vin}")
@@ -591,7 +756,7 @@ def backup_calibration_area():
         click.echo(f"\nError: {e}")
         logger.exception("Calibration backup failed")
 
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def create_test_file_full_dump():
@@ -601,9 +766,7 @@ def create_test_file_full_dump():
     for MSD80 ECU development. It reads the ENTIRE 1MB flash memory
     and saves it to the test_maps/ directory.
     """
-    click.echo("\n" + "="*60)
-    click.echo("=== Create Test File (Full 1MB Flash Dump) ===" )
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Create Test File (Full 1MB Flash Dump) ===\n{_H60}")
     click.echo("\nThis will create a COMPLETE 1MB flash dump for testing.")
     click.echo("\nPurpose:")
     click.echo("   - Development and testing of flash operations")
@@ -620,7 +783,7 @@ def create_test_file_full_dump():
     proceed = click.confirm("\n Proceed with test file creation?", default=False)
     if not proceed:
         click.echo("\nOperation cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     try:
@@ -629,22 +792,17 @@ def create_test_file_full_dump():
         if not conn_mgr.is_connected():
             click.echo("\nERROR: No active connection to ECU!")
             click.echo("Please connect via Hardware & Connection menu first.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         # Create test_maps directory
-        from pathlib import Path
-        from datetime import datetime
-        
         test_maps_dir = Path(__file__).parent.parent / "test_maps"
         test_maps_dir.mkdir(exist_ok=True)
         
         # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _ts()
         
-        click.echo("\n" + "="*60)
-        click.echo(" READING ECU INFORMATION...")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n READING ECU INFORMATION...\n{_H60}")
         
         # Read VIN using UDS handler
         click.echo("\nReading VIN from ECU...")
@@ -668,9 +826,7 @@ def create_test_file_full_dump():
         output_filename = f"stock_full_dump_{timestamp}_{vin}_{sw_version}.bin"
         output_path = test_maps_dir / output_filename
         
-        click.echo("\n" + "="*60)
-        click.echo("📥 READING FULL FLASH MEMORY...")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n📥 READING FULL FLASH MEMORY...\n{_H60}")
         click.echo(f"\nOutput file: {output_filename}")
         click.echo(f"Expected size: 1,048,576 bytes (1 MB)")
         click.echo("\n  DO NOT:")
@@ -687,11 +843,10 @@ def create_test_file_full_dump():
                 click.echo(f"        {message}")
         
         # Read full flash via direct CAN
-        from . import direct_can_flasher
         fl = direct_can_flasher.DirectCANFlasher('pcan', 'PCAN_USBBUS1')
         if not fl.connect():
             click.echo(" Could not connect to CAN bus")
-            input("\nPress Enter to continue...")
+            _pause()
             return
 
         import time
@@ -712,9 +867,7 @@ def create_test_file_full_dump():
                 checksum_val = ""
             expected_size = 1048576  # 1MB for MSD80
             
-            click.echo("\n" + "="*60)
-            click.echo(" TEST FILE CREATED SUCCESSFULLY")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\n TEST FILE CREATED SUCCESSFULLY\n{_H60}")
             click.echo(f"\n📂 File: {output_path}")
             click.echo(f"📏 Size: {file_size:,} bytes ({file_size/1024/1024:.2f} MB)")
             if checksum_val:
@@ -744,9 +897,7 @@ def create_test_file_full_dump():
                 click.echo(f"   Got: {file_size:,} bytes")
                 click.echo("   Verify ECU type and direct CAN configuration.")
             
-            click.echo("\n" + "="*60)
-            click.echo(" NEXT STEPS:")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\n NEXT STEPS:\n{_H60}")
             click.echo("1. Verify file size is exactly 1,048,576 bytes")
             click.echo("2. Run CRC zone scanner: python scripts/scan_for_crcs.py")
             click.echo("3. Use for map validator testing")
@@ -754,9 +905,7 @@ def create_test_file_full_dump():
             click.echo("5. DO NOT modify - create copies for testing")
             
         else:
-            click.echo("\n" + "="*60)
-            click.echo(" TEST FILE CREATION FAILED")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\n TEST FILE CREATION FAILED\n{_H60}")
             click.echo("\nError: No data returned and no file created")
             click.echo("\nPossible causes:")
             click.echo("- Connection lost during read")
@@ -765,20 +914,16 @@ def create_test_file_full_dump():
             click.echo("- Insufficient battery voltage")
             
     except Exception as e:
-        click.echo("\n" + "="*60)
-        click.echo(" EXCEPTION OCCURRED")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n EXCEPTION OCCURRED\n{_H60}")
         click.echo(f"\nError: {e}")
         logger.exception("Test file creation failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def export_map_from_backup():
     """Export map data from existing backup file."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Export Map from Backup ===" )
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Export Map from Backup ===\n{_H60}")
     
     try:
         # List available backups
@@ -787,7 +932,7 @@ def export_map_from_backup():
         if not backups:
             click.echo("\nNo backups found in backups/ directory.")
             click.echo("Please create a backup first using 'Backup Full ECU'.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         # Display backups
@@ -802,7 +947,7 @@ def export_map_from_backup():
         
         if choice < 1 or choice > len(backups):
             click.echo("Export cancelled.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         selected_backup = cast(Dict[str, Any], backups[choice - 1])
@@ -810,7 +955,7 @@ def export_map_from_backup():
         backup_path: Path = Path(filepath)
         
         # Generate output filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = _ts()
         vin: str = cast(str, selected_backup.get('vin', 'UNKNOWN'))
         output_filename = f"exported_map_{timestamp}_{vin}.bin"
 
@@ -856,14 +1001,12 @@ def export_map_from_backup():
         click.echo(f"\n Error: {e}")
         logger.exception("Map export failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def list_all_backups():
     """List all existing backups with metadata."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Existing Backups ===" )
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Existing Backups ===\n{_H60}")
     
     try:
         backups = backup_manager.list_backups()
@@ -886,14 +1029,12 @@ def list_all_backups():
         click.echo(f"\n Error listing backups: {e}")
         logger.exception("Error listing backups")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def verify_backup_file():
     """Verify integrity of a backup file."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Verify Backup Integrity ===" )
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Verify Backup Integrity ===\n{_H60}")
     
     try:
         # List available backups
@@ -901,7 +1042,7 @@ def verify_backup_file():
         
         if not backups:
             click.echo("\nNo backups found to verify.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         # Display backups
@@ -916,7 +1057,7 @@ def verify_backup_file():
         
         if choice < 1 or choice > len(backups):
             click.echo("Verification cancelled.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         selected_backup = cast(Dict[str, Any], backups[choice - 1])
@@ -967,14 +1108,14 @@ def verify_backup_file():
         click.echo(f"\n Verification error: {e}")
         logger.exception("Verification failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def restore_from_backup_implementation():
     """Restore ECU from backup file (Task 5.1 - WRITE OPERATION)."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Restore ECU from Backup ===" )
-    click.echo("="*60)
+    from . import dme_handler
+    from . import map_flasher
+    click.echo(f"\n{_H60}\n=== Restore ECU from Backup ===\n{_H60}")
     click.echo("\n  CRITICAL WARNING - WRITE OPERATION")
     click.echo("\nThis will OVERWRITE your ECU memory with a previous backup.")
     click.echo("Use this if:")
@@ -991,7 +1132,7 @@ def restore_from_backup_implementation():
         if not backups:
             click.echo("\n○ No backups found")
             click.echo("\nCreate backup before attempting restore.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         # Display backups
@@ -1014,7 +1155,7 @@ def restore_from_backup_implementation():
         
         if choice == 0 or choice < 1 or choice > len(backups):
             click.echo("\n Restore cancelled")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         selected_backup: Dict[str, Any] = cast(Dict[str, Any], backups[choice - 1])
@@ -1026,7 +1167,7 @@ def restore_from_backup_implementation():
         if not ver.get('valid', False):
             click.echo("\n Selected backup is INVALID")
             click.echo("Cannot restore from corrupted backup.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         # Get current ECU VIN
@@ -1035,7 +1176,7 @@ def restore_from_backup_implementation():
         
         if not ecu_id.get('success', False):
             click.echo(" Cannot read ECU identification")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         current_vin = ecu_id.get('VIN', '')
@@ -1046,7 +1187,7 @@ def restore_from_backup_implementation():
             click.echo(f"Backup VIN: {backup_vin}")
             click.echo(f"Current ECU VIN: {current_vin}")
             click.echo("\nCANNOT restore backup from different vehicle.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         click.echo(f" VIN match confirmed: {current_vin}")
@@ -1059,15 +1200,13 @@ def restore_from_backup_implementation():
             click.echo(f" Battery voltage insufficient: {battery_check.get('voltage', 0):.1f}V")
             click.echo(f"  Minimum required: {battery_check.get('min_required', 12.5)}V")
             click.echo("\nCharge battery before restore.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         click.echo(f" Battery voltage: {battery_check.get('voltage', 0):.1f}V")
         
         # Confirmation workflow (same as flash)
-        click.echo("\n" + "="*60)
-        click.echo("CONFIRMATION STEP 1 of 3")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\nCONFIRMATION STEP 1 of 3\n{_H60}")
         click.echo("\nYou are about to RESTORE ECU from backup.")
         click.echo("This will OVERWRITE current ECU memory.")
         click.echo("\nType YES (all caps) to acknowledge risks:")
@@ -1076,12 +1215,10 @@ def restore_from_backup_implementation():
         
         if confirm1 != "YES":
             click.echo("\n Restore cancelled (confirmation 1 failed)")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
-        click.echo("\n" + "="*60)
-        click.echo("CONFIRMATION STEP 2 of 3")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\nCONFIRMATION STEP 2 of 3\n{_H60}")
         click.echo(f"\nBackup: {backup_path.name}")
         click.echo(f"Date: {str(selected_backup.get('date', 'unknown'))} {str(selected_backup.get('time', 'unknown'))}")
         click.echo("\nType RESTORE (all caps) to confirm intent:")
@@ -1090,12 +1227,10 @@ def restore_from_backup_implementation():
         
         if confirm2 != "RESTORE":
             click.echo("\n Restore cancelled (confirmation 2 failed)")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
-        click.echo("\n" + "="*60)
-        click.echo("CONFIRMATION STEP 3 of 3")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\nCONFIRMATION STEP 3 of 3\n{_H60}")
         click.echo(f"\nYour VIN: {current_vin}")
         click.echo("\nType the LAST 7 DIGITS of your VIN to confirm:")
         
@@ -1104,13 +1239,11 @@ def restore_from_backup_implementation():
         
         if confirm3 != vin_last_7:
             click.echo(f"\n Restore cancelled (VIN confirmation failed)")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         # Execute restore
-        click.echo("\n" + "="*60)
-        click.echo("Starting Restore Operation...")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\nStarting Restore Operation...\n{_H60}")
         click.echo("\n  DO NOT:")
         click.echo("- Disconnect cable")
         click.echo("- Turn off ignition")
@@ -1128,9 +1261,7 @@ def restore_from_backup_implementation():
             )
             
             if result.get('success', False):
-                click.echo("\n" + "="*60)
-                click.echo(" RESTORE COMPLETED SUCCESSFULLY")
-                click.echo("="*60)
+                click.echo(f"\n{_H60}\n RESTORE COMPLETED SUCCESSFULLY\n{_H60}")
                 
                 duration = result.get('duration_seconds', 0)
                 verification = result.get('verification', {})
@@ -1149,16 +1280,12 @@ def restore_from_backup_implementation():
                 click.echo("4. Test vehicle operation")
                 
             else:
-                click.echo("\n" + "="*60)
-                click.echo(" RESTORE FAILED")
-                click.echo("="*60)
+                click.echo(f"\n{_H60}\n RESTORE FAILED\n{_H60}")
                 click.echo(f"\nError: {result.get('error', 'Unknown error')}")
                 click.echo("\nVehicle may be in unstable state.")
             
         except Exception as e:
-            click.echo("\n" + "="*60)
-            click.echo(" RESTORE FAILED WITH EXCEPTION")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\n RESTORE FAILED WITH EXCEPTION\n{_H60}")
             click.echo(f"\nError: {e}")
             logger.exception("Restore operation failed")
     
@@ -1166,7 +1293,7 @@ def restore_from_backup_implementation():
         click.echo(f"\n Error: {e}")
         logger.exception("Error in restore operation")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 
@@ -1175,9 +1302,7 @@ def flash_operations_menu():
     selected_map = None
     
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== Flash Operations ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== Flash Operations ===\n{_H60}")
         click.echo("\n  DANGER ZONE - Incorrect flashing can damage your ECU!")
         click.echo(f"\nSelected Map: {selected_map.name if selected_map else 'None'}")
         click.echo("\n1. Browse/Select Map File")
@@ -1198,25 +1323,25 @@ def flash_operations_menu():
                 view_selected_map_info(selected_map)
             else:
                 click.echo("\n No map selected. Use option 1 to select a map.")
-                input("\nPress Enter to continue...")
+                _pause()
         elif choice == 3:
             if selected_map:
                 validate_selected_map(selected_map)
             else:
                 click.echo("\n No map selected. Use option 1 to select a map.")
-                input("\nPress Enter to continue...")
+                _pause()
         elif choice == 4:
             if selected_map:
                 run_preflash_safety_check(selected_map)
             else:
                 click.echo("\n No map selected. Use option 1 to select a map.")
-                input("\nPress Enter to continue...")
+                _pause()
         elif choice == 5:
             if selected_map:
                 flash_ecu_with_map(selected_map)
             else:
                 click.echo("\n No map selected. Use option 1 to select a map.")
-                input("\nPress Enter to continue...")
+                _pause()
         else:
             click.echo("Invalid selection.")
 
@@ -1232,9 +1357,7 @@ def backup_recovery_menu():
     This menu is kept minimal to satisfy CLI structure tests.
     """
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== Backup & Recovery ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== Backup & Recovery ===\n{_H60}")
         click.echo("\n1. Backup Full ECU")
         click.echo("2. Backup Calibration Area Only")
         click.echo("3. Create Test File (Full 1MB Flash Dump)")
@@ -1274,9 +1397,7 @@ def browse_and_select_map():
     Returns:
         Path to selected map file, or None if cancelled
     """
-    click.echo("\n" + "="*60)
-    click.echo("=== Browse/Select Map File ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Browse/Select Map File ===\n{_H60}")
     
     try:
         mgr = map_manager.MapManager()
@@ -1292,7 +1413,7 @@ def browse_and_select_map():
             click.echo("\nExpected structure:")
             click.echo("  maps/<VIN>/backup_<timestamp>.bin")
             click.echo("  maps/<VIN>/tuned/<name>.bin")
-            input("\nPress Enter to continue...")
+            _pause()
             return None
 
         # Display numbered list
@@ -1317,14 +1438,14 @@ def browse_and_select_map():
             map_path = Path(custom_path)
             if not map_path.exists():
                 click.echo(f"\n File not found: {map_path}")
-                input("\nPress Enter to continue...")
+                _pause()
                 return None
         elif 1 <= choice <= len(maps):
             map_info = cast(Dict[str, Any], maps[choice - 1])
             map_path = Path(str(map_info.get('path', '')))
         else:
             click.echo("\n Invalid selection")
-            input("\nPress Enter to continue...")
+            _pause()
             return None
         
         # Quick validation
@@ -1333,7 +1454,7 @@ def browse_and_select_map():
         
         if not map_path.exists():
             click.echo(" File does not exist")
-            input("\nPress Enter to continue...")
+            _pause()
             return None
         
         size = map_path.stat().st_size
@@ -1342,21 +1463,19 @@ def browse_and_select_map():
         click.echo(" File readable")
         
         click.echo(f"\n Map file selected: {map_path.name}")
-        input("\nPress Enter to continue...")
+        _pause()
         return map_path
         
     except Exception as e:
         click.echo(f"\n Error: {e}")
         logger.exception("Error browsing maps")
-        input("\nPress Enter to continue...")
+        _pause()
         return None
 
 
 def view_selected_map_info(map_file: Path):
     """Display detailed information about selected map."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Map File Information ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Map File Information ===\n{_H60}")
     
     try:
         click.echo(f"\nMap File: {map_file.name}")
@@ -1384,14 +1503,12 @@ def view_selected_map_info(map_file: Path):
         click.echo(f"\n Error: {e}")
         logger.exception("Error reading map info")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def validate_selected_map(map_file: Path):
     """Validate the selected map file."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Validate Map File ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Validate Map File ===\n{_H60}")
     
     click.echo(f"\nValidating: {map_file.name}\n")
     
@@ -1434,23 +1551,20 @@ def validate_selected_map(map_file: Path):
         click.echo(f"\n Error: {e}")
         logger.exception("Error validating map")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def run_preflash_safety_check(map_file: Path):
     """Run comprehensive pre-flash safety checks."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Pre-Flash Safety Checks ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Pre-Flash Safety Checks ===\n{_H60}")
     
     try:
         # Get VIN from ECU
         click.echo("\nReading ECU identification...")
-        from . import direct_can_flasher
         fl = direct_can_flasher.DirectCANFlasher('pcan','PCAN_USBBUS1')
         if not fl.connect():
             click.echo(" Cannot connect to ECU via CAN")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         vin = fl.read_vin() or "UNKNOWN"
         click.echo(f" ECU VIN: {vin}")
@@ -1508,14 +1622,12 @@ def run_preflash_safety_check(map_file: Path):
         click.echo(f"\n Error: {e}")
         logger.exception("Error running safety checks")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def flash_ecu_with_map(map_file: Path):
     """Flash ECU with selected map (3-step confirmation workflow)."""
-    click.echo("\n" + "="*60)
-    click.echo("  CRITICAL WARNING - READ CAREFULLY ")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n  CRITICAL WARNING - READ CAREFULLY \n{_H60}")
     
     click.echo("\nYou are about to FLASH your ECU with a modified map.")
     click.echo("\nRISKS:")
@@ -1532,16 +1644,15 @@ def flash_ecu_with_map(map_file: Path):
     
     # Get VIN
     try:
-        from . import direct_can_flasher
         fl = direct_can_flasher.DirectCANFlasher('pcan','PCAN_USBBUS1')
         if not fl.connect():
             click.echo("\n Cannot connect to ECU via CAN")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         vin = fl.read_vin() or "UNKNOWN"
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Run safety checks
@@ -1549,33 +1660,29 @@ def flash_ecu_with_map(map_file: Path):
     # Basic safety: battery and CRC validation of provided file
     if not fl.check_battery_voltage() or fl.battery_voltage < 12.5:
         click.echo(f"\n Battery voltage too low: {fl.battery_voltage:.1f}V")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     file_bytes = map_file.read_bytes()
     if not fl.validate_calibration_crcs(file_bytes):
         click.echo("\n CRC validation failed for provided calibration file")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     click.echo(" All safety checks passed")
     
     # Step 1: Type "YES"
-    click.echo("\n" + "="*60)
-    click.echo("CONFIRMATION STEP 1 of 3")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\nCONFIRMATION STEP 1 of 3\n{_H60}")
     click.echo("\nType YES (all caps) to acknowledge risks:")
     
     confirm1 = click.prompt("", type=str, default="")
     
     if confirm1 != "YES":
         click.echo("\n Flash cancelled (confirmation 1 failed)")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Step 2: Type "FLASH"
-    click.echo("\n" + "="*60)
-    click.echo("CONFIRMATION STEP 2 of 3")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\nCONFIRMATION STEP 2 of 3\n{_H60}")
     click.echo("\n  FINAL WARNING:")
     click.echo("This will PERMANENTLY MODIFY your ECU memory.")
     click.echo("There is NO UNDO except restoring from backup.")
@@ -1585,30 +1692,30 @@ def flash_ecu_with_map(map_file: Path):
     
     if confirm2 != "FLASH":
         click.echo("\n Flash cancelled (confirmation 2 failed)")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Step 3: Type last 7 digits of VIN
-    click.echo("\n" + "="*60)
-    click.echo("CONFIRMATION STEP 3 of 3")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\nCONFIRMATION STEP 3 of 3\n{_H60}")
     click.echo(f"\nYour VIN: {vin}")
     click.echo(f"Selected Map: {map_file.name}")
     click.echo("\nType the LAST 7 DIGITS of your VIN to confirm correct vehicle:")
     
-    vin_last_7 = vin[-7:] if len(vin) >= 7 else vin
+    vin_last_7 = vin[-7:]
     confirm3 = click.prompt("", type=str, default="")
     
     if confirm3 != vin_last_7:
         click.echo(f"\n Flash cancelled (VIN confirmation failed)")
         click.echo(f"Expected: {vin_last_7}, Got: {confirm3}")
-        input("\nPress Enter to continue...")
+        _pause()
+        return
+    
+    if not _join_backup_writes():
+        _pause()
         return
     
     # All confirmations passed - proceed with flash
-    click.echo("\n" + "="*60)
-    click.echo("Starting Flash Operation...")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\nStarting Flash Operation...\n{_H60}")
     click.echo("\n  DO NOT:")
     click.echo("- Disconnect cable")
     click.echo("- Turn off ignition")
@@ -1628,15 +1735,13 @@ def flash_ecu_with_map(map_file: Path):
         
         # Normalize enum
         try:
-            from .direct_can_flasher import WriteResult as _WR
+            _WR = direct_can_flasher.WriteResult
             success = (result == _WR.SUCCESS)
         except Exception:
             success = bool(result)
 
         if success:
-            click.echo("\n" + "="*60)
-            click.echo(" FLASH COMPLETED SUCCESSFULLY")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\n FLASH COMPLETED SUCCESSFULLY\n{_H60}")
             
             click.echo("\nECU will be soft reset to apply changes.")
             fl.soft_reset()
@@ -1648,22 +1753,18 @@ def flash_ecu_with_map(map_file: Path):
             click.echo("4. Test vehicle operation carefully")
             
         else:
-            click.echo("\n" + "="*60)
-            click.echo(" FLASH FAILED")
-            click.echo("="*60)
+            click.echo(f"\n{_H60}\n FLASH FAILED\n{_H60}")
             click.echo("\nVehicle may be in unstable state.")
             click.echo("Restore from backup immediately.")
         
     except Exception as e:
-        click.echo("\n" + "="*60)
-        click.echo(" FLASH FAILED WITH EXCEPTION")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n FLASH FAILED WITH EXCEPTION\n{_H60}")
         click.echo(f"\nError: {e}")
         click.echo("\nVehicle may be in unstable state.")
         click.echo("Restore from backup immediately.")
         logger.exception("Flash operation failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 # ============================================================================
@@ -1672,9 +1773,7 @@ def flash_ecu_with_map(map_file: Path):
 
 def browse_maps():
     """Browse all available map files."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Browse Available Maps ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Browse Available Maps ===\n{_H60}")
     
     try:
         mgr = map_manager.MapManager()
@@ -1685,7 +1784,7 @@ def browse_maps():
             click.echo("\nExpected structure:")
             click.echo("  maps/<VIN>/backup_<timestamp>.bin")
             click.echo("  maps/<VIN>/tuned/<name>.bin")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         # Group by VIN inferred from path
@@ -1730,21 +1829,19 @@ def browse_maps():
         click.echo(f"\n Error: {e}")
         logger.exception("Error browsing maps")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def validate_map():
     """Validate a map file."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Validate Map File ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Validate Map File ===\n{_H60}")
     
     map_path_in = click.prompt("\nEnter map file path", type=click.Path(exists=False))
     map_path = Path(map_path_in)
     
     if not map_path.exists():
         click.echo(f"\n File not found: {map_path}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     click.echo(f"\nValidating: {map_path}")
@@ -1788,26 +1885,24 @@ def validate_map():
         click.echo(f"\n Error: {e}")
         logger.exception("Error validating map")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def compare_maps():
     """Compare two map files."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Compare Two Maps ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Compare Two Maps ===\n{_H60}")
     
     map1_path = click.prompt("\nEnter first map file path", type=click.Path(exists=False))
     map2_path = click.prompt("Enter second map file path", type=click.Path(exists=False))
     
     if not Path(map1_path).exists():
         click.echo(f"\n File not found: {map1_path}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     if not Path(map2_path).exists():
         click.echo(f"\n File not found: {map2_path}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     click.echo(f"\nComparing maps...")
@@ -1823,7 +1918,7 @@ def compare_maps():
         
         if diff.get('error'):
             click.echo(f" {diff['error']}")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         total = cast(int, diff.get('total_bytes', 0))
@@ -1847,20 +1942,18 @@ def compare_maps():
         click.echo(f"\n Error: {e}")
         logger.exception("Error comparing maps")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def view_map_metadata():
     """View metadata for a map file."""
-    click.echo("\n" + "="*60)
-    click.echo("=== View Map Metadata ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== View Map Metadata ===\n{_H60}")
     
     map_path = click.prompt("\nEnter map file path", type=click.Path(exists=False))
     
     if not Path(map_path).exists():
         click.echo(f"\n File not found: {map_path}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     click.echo(f"\nReading metadata: {map_path}")
@@ -1898,16 +1991,14 @@ def view_map_metadata():
         click.echo(f"\n Error: {e}")
         logger.exception("Error reading metadata")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def settings_menu():
     """Settings & Configuration submenu (Task 7.0)."""
     while True:
         click.clear()
-        click.echo("\n" + "="*60)
-        click.echo("=== Settings & Configuration ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== Settings & Configuration ===\n{_H60}")
         
         # Get current settings
         settings_mgr = settings_manager.get_settings_manager()
@@ -1961,7 +2052,7 @@ def settings_menu():
             if new_dir:
                 settings_mgr.set_maps_directory(new_dir)
                 click.echo(" Maps directory updated")
-                input("\nPress Enter to continue...")
+                _pause()
         
         elif choice == '2':
             # Change default port
@@ -1971,7 +2062,7 @@ def settings_menu():
             new_port = input("\nEnter COM port (e.g., COM3) or press Enter for auto-detect: ").strip()
             settings_mgr.set_default_port(new_port)
             click.echo(" Default port updated")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '3':
             # Change connection timeout
@@ -1983,7 +2074,7 @@ def settings_menu():
                     click.echo(" Connection timeout updated")
             except ValueError:
                 click.echo(" Invalid timeout value")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '4':
             # Change flash timeout
@@ -1995,7 +2086,7 @@ def settings_menu():
                     click.echo(" Flash timeout updated")
             except ValueError:
                 click.echo(" Invalid timeout value")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '5':
             # Toggle auto-backup
@@ -2003,7 +2094,7 @@ def settings_menu():
             settings_mgr.set_setting('SAFETY', 'auto_backup_before_flash', str(not current))
             status = "enabled" if not current else "disabled"
             click.echo(f"\n Auto-backup before flash {status}")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '6':
             # Toggle VIN confirmation
@@ -2011,13 +2102,13 @@ def settings_menu():
             settings_mgr.set_setting('SAFETY', 'require_vin_confirmation', str(not current))
             status = "enabled" if not current else "disabled"
             click.echo(f"\n VIN confirmation {status}")
-            input("\nPress Enter to continue...")
+            _pause()
 
         elif choice == '7':
             # Reset all settings to defaults
             settings_mgr.reset_to_defaults()
             click.echo("\n Settings reset to defaults")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '8':
             # Configure automatic flash-counter reset behavior
@@ -2027,7 +2118,7 @@ def settings_menu():
             new_val = input("\nEnter new value (true/false/ask) or press Enter to cancel: ").strip().lower()
             if not new_val:
                 click.echo("\nCancelled - no changes made")
-                input("\nPress Enter to continue...")
+                _pause()
             else:
                 # Normalize synonyms
                 if new_val in ('1', 'yes'):
@@ -2038,25 +2129,23 @@ def settings_menu():
                     norm = new_val
                 else:
                     click.echo("\nInvalid value - expected 'true', 'false', or 'ask'. No changes made.")
-                    input("\nPress Enter to continue...")
+                    _pause()
                     continue
 
                 settings_mgr.set_setting('FLASH', 'auto_reset_flash_counter', norm)
                 click.echo(f"\n FLASH.auto_reset_flash_counter set to: {norm}")
-                input("\nPress Enter to continue...")
+                _pause()
         
         else:
             click.echo("\n Invalid choice")
-            input("\nPress Enter to continue...")
+            _pause()
 
 
 def view_logs_menu():
     """View Logs submenu (Task 7.0)."""
     while True:
         click.clear()
-        click.echo("\n" + "="*60)
-        click.echo("=== View Logs ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== View Logs ===\n{_H60}")
         
         # Get log statistics
         op_logger = operation_logger.get_operation_logger()
@@ -2105,7 +2194,7 @@ def view_logs_menu():
                     click.echo()
             else:
                 click.echo("No operations logged yet.")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '2':
             # View all operations
@@ -2120,7 +2209,7 @@ def view_logs_menu():
                     click.echo(f"{status_symbol} [{log['timestamp']}] {log['operation']}")
             else:
                 click.echo("No operations logged yet.")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '3':
             # View error logs only
@@ -2138,7 +2227,7 @@ def view_logs_menu():
                     click.echo()
             else:
                 click.echo("No errors logged.")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '4':
             # Export logs
@@ -2150,8 +2239,7 @@ def view_logs_menu():
             if export_choice in ['1', '2']:
                 output_path_str = input("Enter output filename (or press Enter for default): ").strip()
                 if not output_path_str:
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    timestamp = _ts()
                     output_path_str = f"logs/export_{timestamp}.{'json' if export_choice == '1' else 'txt'}"
                 
                 try:
@@ -2175,7 +2263,7 @@ def view_logs_menu():
                     click.echo(f"\n Export error: {e}")
             else:
                 click.echo("\n Invalid choice")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '5':
             # Clear old logs
@@ -2185,7 +2273,7 @@ def view_logs_menu():
                 click.echo(f"\n Removed {removed} old log entries (operations + errors)")
             else:
                 click.echo("\nCancelled")
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '6':
             # Search by operation type
@@ -2211,20 +2299,18 @@ def view_logs_menu():
                         click.echo()
                 else:
                     click.echo(f"\nNo operations found matching '{operation_type}'")
-            input("\nPress Enter to continue...")
+            _pause()
         
         else:
             click.echo("\n Invalid choice")
-            input("\nPress Enter to continue...")
+            _pause()
 
 
 def help_about_menu():
     """Help & About submenu (Task 7.0)."""
     while True:
         click.clear()
-        click.echo("\n" + "="*60)
-        click.echo("=== Help & About ===")
-        click.echo("="*60)
+        click.echo(f"\n{_H60}\n=== Help & About ===\n{_H60}")
         
         # Get version info
         help_sys = help_system.HelpSystem()
@@ -2257,7 +2343,7 @@ def help_about_menu():
             click.echo("\n" + "="*60)
             guide = help_sys.get_quick_start_guide()
             click.echo(guide)
-            input("\n\nPress Enter to continue...")
+            _pause("\n\nPress Enter to continue...")
         
         elif choice == '2':
             # Browse help topics
@@ -2286,20 +2372,20 @@ def help_about_menu():
                         
                         click.echo("\n" + "="*60)
                         click.echo(topic_content)
-                        input("\n\nPress Enter to continue...")
+                        _pause("\n\nPress Enter to continue...")
                     else:
                         click.echo("\n Invalid topic number")
-                        input("\nPress Enter to continue...")
+                        _pause()
                 except ValueError:
                     click.echo("\n Invalid input")
-                    input("\nPress Enter to continue...")
+                    _pause()
         
         elif choice == '3':
             # Troubleshooting guide
             click.echo("\n" + "="*60)
             guide = help_sys.get_troubleshooting_guide()
             click.echo(guide)
-            input("\n\nPress Enter to continue...")
+            _pause("\n\nPress Enter to continue...")
         
         elif choice == '4':
             # View implemented features
@@ -2313,52 +2399,118 @@ def help_about_menu():
                 click.echo(f"{status_symbol} {feature['task']}: {feature['feature']}")
                 click.echo(f"   Status: {feature['status']}\n")
             
-            input("\nPress Enter to continue...")
+            _pause()
         
         elif choice == '5':
             # Safety guidelines
             click.echo("\n" + "="*60)
             safety_content = help_sys.get_help('safety')
             click.echo(safety_content)
-            input("\n\nPress Enter to continue...")
+            _pause("\n\nPress Enter to continue...")
         
         else:
             click.echo("\n Invalid choice")
-            input("\nPress Enter to continue...")
+            _pause()
 
 
 # ============================================================================
 # OBD-II Diagnostic Functions (Task 3.0)
 # ============================================================================
 
+# Padded display names for readiness monitors, keyed by obd_reader monitor key
+_MONITOR_DISPLAY_NAMES = {k: k.replace('_', ' ').title().ljust(30)
+                          for k in obd_reader.READINESS_MONITOR_KEYS}
+
+# Menu banners for the OBD-II screens
+_HEADER_CLEAR_DTC = f"\n{_H60}\n  WARNING: Clear OBD-II DTCs\n{_H60}"
+_HEADER_READINESS = f"\n{_H70}\n=== Query Readiness Monitors ===\n{_H70}"
+_HEADER_READINESS_STATUS = f"\n{_H70}\nREADINESS MONITOR STATUS\n{_H70}"
+_HEADER_READINESS_SUCCESS = f"\n{_H70}\n SUCCESS! Document this result:\n{_H70}"
+_HEADER_PENDING_DTC = f"\n{_H60}\n=== Pending DTCs (Mode 07) ===\n{_H60}"
+_HEADER_FILTER_DTC = f"\n{_H60}\n=== Filter DTCs by Status ===\n{_H60}"
+_HEADER_VEHICLE_INFO = f"\n{_H60}\n=== Extended Vehicle Information ===\n{_H60}"
+_HEADER_ENGINE_TYPE = f"\n{_H60}\n=== Engine Type Detection ===\n{_H60}"
+_HEADER_ECU_RESET = f"\n{_H60}\n=== ECU Reset Status ===\n{_H60}"
+_HEADER_MIL_HISTORY = f"\n{_H60}\n=== MIL (Check Engine Light) History ===\n{_H60}"
+_HEADER_COMPONENT_TESTS = f"\n{_H60}\n=== Component Test Results (Mode 06) ===\n{_H60}"
+_HEADER_SUPPORTED_PIDS = f"\n{_H60}\n=== Supported PIDs Query ===\n{_H60}"
+
+# Filter menu choice -> DTC status (index 0 unused; choices are 1-5)
+_STATUS_CHOICES = ('all', 'all', 'pending', 'confirmed', 'active', 'stored')
+
+# Static part of the readiness verification report (query_readiness_monitors_menu)
+_READINESS_REPORT_HEADER = """# Readiness Monitor Verification Success
+
+**Date:** {timestamp}
+**Status:**  CONFIRMED WORKING
+
+## Test Results
+
+- **Readiness Byte:** 0x{readiness_hex}
+- **All Monitors Ready:** {all_ready}
+- **MIL Status:** {mil}
+- **DTC Count:** {dtc_count}
+
+## Individual Monitor Status
+
+"""
+
+
+# Full tracebacks for OBD menu errors only when OBD_DEBUG=1
+_DEBUG = os.environ.get("OBD_DEBUG") == "1"
+
+
+def _log_menu_error(message: str, exc: Exception) -> None:
+    """Log a menu error; the traceback walk is reserved for debug mode."""
+    if _DEBUG:
+        logger.exception(message)
+    else:
+        logger.error(f"{message}: {exc}")
+
+
+def _format_dtc_list(dtcs: List[Dict[str, Any]]) -> str:
+    """Format DTCs as a numbered 'N. CODE - description' block."""
+    return "\n".join(f"{i}. {d['code']} - {d['description']}" for i, d in enumerate(dtcs, 1))
+
+
+def _get_obd_connection() -> Tuple[Optional[Any], Optional[str]]:
+    """
+    Resolve the active COM port and return a session-managed OBD connection.
+    
+    Returns:
+        (connection, error_message) - error_message is None on success,
+        connection is None when no port has been selected.
+    
+    Raises:
+        OBDConnectionError: If the session manager cannot connect
+    """
+    current_port = connection_manager.get_manager().get_active_port()
+    if not current_port:
+        return None, "\n No COM port selected. Please select a port from 'Hardware & Connection' menu first."
+    
+    click.echo(f"Connecting to {current_port}...")
+    return obd_session_manager.get_session().get_connection(current_port), None
+
+
 def read_obd_dtcs():
     """Read OBD-II DTCs from engine."""
     click.echo("\nReading OBD-II DTCs from engine...")
     
     try:
-        # Get active port from connection manager
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port from 'Hardware & Connection' menu first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        # Get or create OBD connection via session manager
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         # Read DTCs
         dtcs = obd_reader.read_obd_dtcs(obd_connection)
         
-        if len(dtcs) == 0:
+        if not dtcs:
             click.echo("\n No DTCs found")
         else:
             click.echo(f"\nDiagnostic Trouble Codes ({len(dtcs)} found):")
-            for i, dtc in enumerate(dtcs, 1):
-                click.echo(f"{i}. {dtc['code']} - {dtc['description']}")
+            click.echo(_format_dtc_list(dtcs))
     
     except obd_reader.OBDConnectionError as e:
         click.echo(f"\n Connection error: {e}")
@@ -2373,38 +2525,28 @@ def read_obd_dtcs():
     
     except Exception as e:
         click.echo(f"\n Unexpected error: {e}")
-        logger.exception("Error reading OBD DTCs")
+        _log_menu_error("Error reading OBD DTCs", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def clear_obd_dtcs():
     """Clear OBD-II DTCs from engine."""
-    click.echo("\n" + "="*60)
-    click.echo("  WARNING: Clear OBD-II DTCs")
-    click.echo("="*60)
+    click.echo(_HEADER_CLEAR_DTC)
     click.echo("\nThis will clear all engine fault codes.")
     
     if not click.confirm("\nType 'YES' to confirm", default=False):
         click.echo("\nOperation cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     try:
-        # Get active port from connection manager
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port from 'Hardware & Connection' menu first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        # Get or create OBD connection via session manager
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"\nConnecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         # Clear DTCs
         click.echo("\nClearing OBD-II DTCs...")
         success = obd_reader.clear_obd_dtcs(obd_connection)
@@ -2423,9 +2565,9 @@ def clear_obd_dtcs():
     
     except Exception as e:
         click.echo(f"\n Unexpected error: {e}")
-        logger.exception("Error clearing OBD DTCs")
+        _log_menu_error("Error clearing OBD DTCs", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def read_freeze_frame():
@@ -2433,23 +2575,15 @@ def read_freeze_frame():
     click.echo("\nReading freeze frame data...")
     
     try:
-        # Get active port from connection manager
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port from 'Hardware & Connection' menu first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        # Get or create OBD connection via session manager
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         freeze = obd_reader.read_freeze_frame(obd_connection)
         
-        if len(freeze) == 0:
+        if not freeze:
             click.echo("\n No freeze frame data available")
         else:
             click.echo("\nFreeze Frame Data:")
@@ -2458,16 +2592,14 @@ def read_freeze_frame():
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error reading freeze frame")
+        _log_menu_error("Error reading freeze frame", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def query_readiness_monitors_menu():
     """Query OBD-II readiness monitor status."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Query Readiness Monitors ===")
-    click.echo("="*70)
+    click.echo(_HEADER_READINESS)
     
     click.echo("\n Check OBD-II Monitor Readiness Status")
     click.echo("\nThis queries Mode $01 PID $01 to check which emission")
@@ -2475,39 +2607,32 @@ def query_readiness_monitors_menu():
     click.echo("\n📌 Use this AFTER flashing a readiness patch to verify success!")
     
     try:
-        # Get active port from connection manager
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port from 'Hardware & Connection' menu first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        # Get or create OBD connection via session manager
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"\n🔌 Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         click.echo(" Querying readiness monitors (Mode $01 PID $01)...")
         result = obd_reader.query_readiness_monitors(obd_connection)
         
         if not result['success']:
             click.echo(f"\n Query failed: {result.get('error', 'Unknown error')}")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
+        readiness_hex = f"{result['readiness_byte']:02X}"
+        raw_hex = result['raw_response'].hex().upper() if result['raw_response'] else 'N/A'
+        
         # Display results
-        click.echo("\n" + "="*70)
-        click.echo("READINESS MONITOR STATUS")
-        click.echo("="*70)
+        click.echo(_HEADER_READINESS_STATUS)
         
         # Overall status
         if result['all_ready']:
             click.echo("\n ALL MONITORS READY (Readiness byte: 0x00)")
             click.echo("   Patch is WORKING")
         else:
-            click.echo(f"\n  Some monitors NOT ready (Readiness byte: 0x{result['readiness_byte']:02X})")
+            click.echo(f"\n  Some monitors NOT ready (Readiness byte: 0x{readiness_hex})")
             click.echo("   Patch may not be working at this offset.")
         
         # MIL status
@@ -2518,62 +2643,56 @@ def query_readiness_monitors_menu():
         
         # Individual monitors
         click.echo("\nIndividual Monitor Status:")
-        click.echo("─" * 70)
+        click.echo(_SEP)
+        monitor_lines = []
         for monitor, ready in result['monitors'].items():
             status_icon = "" if ready else ""
             status_text = "Ready" if ready else "Not Ready"
-            click.echo(f"  {status_icon} {monitor.replace('_', ' ').title():<30} {status_text}")
+            monitor_lines.append(f"  {status_icon} {_MONITOR_DISPLAY_NAMES[monitor]} {status_text}")
+        _emit(monitor_lines)
         
         # Raw response
-        raw_hex = result['raw_response'].hex().upper() if result['raw_response'] else 'N/A'
         click.echo(f"\nRaw Response: {raw_hex}")
-        click.echo(f"Readiness Byte: 0x{result['readiness_byte']:02X} (byte 5)")
+        click.echo(f"Readiness Byte: 0x{readiness_hex} (byte 5)")
         
         # Documentation prompt
         if result['all_ready']:
-            click.echo("\n" + "="*70)
-            click.echo(" SUCCESS! Document this result:")
-            click.echo("="*70)
+            click.echo(_HEADER_READINESS_SUCCESS)
             click.echo("\n1. Note the readiness patch offset that was flashed")
             click.echo("2. Record this verification in READINESS_DISCOVERY_RESULTS.md")
             click.echo("3. Share findings with community")
             
             if click.confirm("\n Would you like to save this result?", default=True):
                 # Auto-generate result report
-                from datetime import datetime
                 timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 
-                report = f"""# Readiness Monitor Verification Success
-
-**Date:** {timestamp}
-**Status:**  CONFIRMED WORKING
-
-## Test Results
-
-- **Readiness Byte:** 0x{result['readiness_byte']:02X}
-- **All Monitors Ready:** {result['all_ready']}
-- **MIL Status:** {'ON' if result.get('mil_status') else 'OFF'}
-- **DTC Count:** {result.get('dtc_count', 0)}
-
-## Individual Monitor Status
-
-"""
+                buf = io.StringIO()
+                buf.write(_READINESS_REPORT_HEADER.format(
+                    timestamp=timestamp,
+                    readiness_hex=readiness_hex,
+                    all_ready=result['all_ready'],
+                    mil='ON' if result.get('mil_status') else 'OFF',
+                    dtc_count=result.get('dtc_count', 0),
+                ))
                 for monitor, ready in result['monitors'].items():
-                    report += f"- {monitor}: {' Ready' if ready else ' Not Ready'}\n"
-                
-                report += f"\n## Raw Response\n\n```\n{raw_hex}\n```\n"
+                    buf.write(f"- {monitor}: {' Ready' if ready else ' Not Ready'}\n")
+                buf.write(f"\n## Raw Response\n\n```\n{raw_hex}\n```\n")
+                report = buf.getvalue()
                 
                 # Save to file
-                from pathlib import Path
                 output_file = Path("readiness_verification_result.md")
-                output_file.write_text(report)
+                fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                try:
+                    os.write(fd, report.encode("utf-8"))
+                finally:
+                    os.close(fd)
                 click.echo(f"\n Report saved to: {output_file}")
         
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error querying readiness monitors")
+        _log_menu_error("Error querying readiness monitors", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def read_vehicle_info():
@@ -2581,20 +2700,12 @@ def read_vehicle_info():
     click.echo("\nReading vehicle information...")
     
     try:
-        # Get active port from connection manager
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port from 'Hardware & Connection' menu first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        # Get or create OBD connection via session manager
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         info = obd_reader.get_vehicle_info(obd_connection)
         
         click.echo("\nVehicle Information:")
@@ -2604,9 +2715,9 @@ def read_vehicle_info():
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error reading vehicle info")
+        _log_menu_error("Error reading vehicle info", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 # ============================================================================
@@ -2615,118 +2726,100 @@ def read_vehicle_info():
 
 def read_pending_dtcs_menu():
     """Read pending (temporary) DTCs - Mode 07."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Pending DTCs (Mode 07) ===")
-    click.echo("="*60)
+    click.echo(_HEADER_PENDING_DTC)
     click.echo("\nPending DTCs are codes detected but not yet confirmed.")
     click.echo("This is an early warning system for emerging problems.\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         pending = obd_reader.read_pending_dtcs(obd_connection)
         
-        if len(pending) == 0:
+        if not pending:
             click.echo("\n No pending DTCs found")
         else:
             click.echo(f"\nPending DTCs ({len(pending)} found):")
-            for i, dtc in enumerate(pending, 1):
-                click.echo(f"{i}. {dtc['code']} - {dtc['description']}")
+            click.echo(_format_dtc_list(pending))
     
     except obd_reader.OBDReadError as e:
         click.echo(f"\n Read error: {e}")
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error reading pending DTCs")
+        _log_menu_error("Error reading pending DTCs", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def filter_dtcs_by_status_menu():
     """Filter DTCs by status without clearing them."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Filter DTCs by Status ===")
-    click.echo("="*60)
+    click.echo(_HEADER_FILTER_DTC)
     click.echo("\nRead all DTCs and filter by status.\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
-        # Read all DTCs first
+        # Read stored (Mode 03) and pending (Mode 07) DTCs in one pass
         click.echo("Reading all DTCs...")
-        all_dtcs = obd_reader.read_obd_dtcs(obd_connection)
+        all_dtcs = obd_reader.read_obd_dtcs_batch(obd_connection)
         
-        if len(all_dtcs) == 0:
+        if not all_dtcs:
             click.echo("\n No DTCs found")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
-        # Show filter options
-        click.echo("\nFilter by status:")
-        click.echo("1. All DTCs")
-        click.echo("2. Pending DTCs")
-        click.echo("3. Confirmed DTCs")
-        click.echo("4. Active DTCs")
-        click.echo("5. Stored DTCs")
-        
-        choice = click.prompt("Select filter", type=int, default=1)
-        
-        status_map = {1: 'all', 2: 'pending', 3: 'confirmed', 4: 'active', 5: 'stored'}
-        status = status_map.get(choice, 'all')
-        
-        filtered = obd_reader.filter_dtcs_by_status(all_dtcs, status)
+        # Group once so repeated filter selections don't re-read or re-scan
+        by_status = obd_reader.index_dtcs_by_status(all_dtcs)
+        default_choice = 1
         
-        click.echo(f"\nFiltered DTCs ({len(filtered)} found):")
-        for i, dtc in enumerate(filtered, 1):
-            click.echo(f"{i}. {dtc['code']} - {dtc['description']}")
+        while True:
+            # Show filter options
+            click.echo("\nFilter by status:")
+            click.echo("1. All DTCs")
+            click.echo("2. Pending DTCs")
+            click.echo("3. Confirmed DTCs")
+            click.echo("4. Active DTCs")
+            click.echo("5. Stored DTCs")
+            click.echo("0. Done")
+            
+            choice = click.prompt("Select filter", type=int, default=default_choice)
+            if choice == 0:
+                break
+            default_choice = 0
+            
+            status = _STATUS_CHOICES[choice] if 1 <= choice <= 5 else 'all'
+            
+            filtered = by_status[status]
+            
+            click.echo(f"\nFiltered DTCs ({len(filtered)} found):")
+            click.echo(_format_dtc_list(filtered))
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error filtering DTCs")
+        _log_menu_error("Error filtering DTCs", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def expand_vehicle_info_menu():
     """Read extended vehicle information."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Extended Vehicle Information ===")
-    click.echo("="*60)
+    click.echo(_HEADER_VEHICLE_INFO)
     click.echo("\nReading extended calibration and hardware details...\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         info = obd_reader.expand_vehicle_info(obd_connection)
         
         click.echo("\nExtended Vehicle Information:")
@@ -2736,62 +2829,46 @@ def expand_vehicle_info_menu():
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error reading extended vehicle info")
+        _log_menu_error("Error reading extended vehicle info", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def detect_engine_type_menu():
     """Detect engine type and classification."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Engine Type Detection ===")
-    click.echo("="*60)
+    click.echo(_HEADER_ENGINE_TYPE)
     click.echo("\nDetecting engine type from ECU...\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         engine_type = obd_reader.get_engine_type(obd_connection)
         
         click.echo(f"\nEngine Type: {engine_type}")
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error detecting engine type")
+        _log_menu_error("Error detecting engine type", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def view_ecu_reset_status_menu():
     """View ECU reset/power-cycle status."""
-    click.echo("\n" + "="*60)
-    click.echo("=== ECU Reset Status ===")
-    click.echo("="*60)
+    click.echo(_HEADER_ECU_RESET)
     click.echo("\nChecking if ECU was recently reset...\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         status = obd_reader.get_ecu_reset_status(obd_connection)
         
         click.echo("\nECU Reset Status:")
@@ -2806,31 +2883,23 @@ def view_ecu_reset_status_menu():
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error reading ECU reset status")
+        _log_menu_error("Error reading ECU reset status", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def view_mil_history_menu():
     """View Check Engine Light (MIL) history."""
-    click.echo("\n" + "="*60)
-    click.echo("=== MIL (Check Engine Light) History ===")
-    click.echo("="*60)
+    click.echo(_HEADER_MIL_HISTORY)
     click.echo("\nReading MIL status and history...\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         history = obd_reader.read_mil_history(obd_connection)
         
         click.echo("\nMIL Status and History:")
@@ -2845,37 +2914,29 @@ def view_mil_history_menu():
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error reading MIL history")
+        _log_menu_error("Error reading MIL history", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def view_component_tests_menu():
     """View component test results."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Component Test Results (Mode 06) ===")
-    click.echo("="*60)
+    click.echo(_HEADER_COMPONENT_TESTS)
     click.echo("\nReading on-board component test data...\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         results = obd_reader.read_component_test_results(obd_connection)
         
         if not results.get('success', False):
             click.echo("\nComponent tests not available on this ECU.")
             click.echo("Note: Advanced component testing available via UDS (Mode 0x19)")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         click.echo("\nComponent Test Results:")
@@ -2886,114 +2947,106 @@ def view_component_tests_menu():
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error reading component test results")
+        _log_menu_error("Error reading component test results", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def query_supported_pids_menu():
     """Query which PIDs are supported by the ECU."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Supported PIDs Query ===")
-    click.echo("="*60)
+    click.echo(_HEADER_SUPPORTED_PIDS)
     click.echo("\nDiscovering which PIDs this ECU supports...\n")
     
     try:
-        conn_mgr = connection_manager.get_manager()
-        current_port = conn_mgr.get_active_port()
-        
-        if not current_port:
-            click.echo("\n No COM port selected. Please select a port first.")
-            input("\nPress Enter to continue...")
+        obd_connection, error = _get_obd_connection()
+        if error:
+            click.echo(error)
+            _pause()
             return
         
-        obd_session = obd_session_manager.get_session()
-        click.echo(f"Connecting to {current_port}...")
-        obd_connection = obd_session.get_connection(current_port)
-        
         click.echo("Querying supported PIDs (Mode 01 PID 00)...")
         supported = obd_reader.read_supported_pids(obd_connection)
         
-        if len(supported) == 0:
+        if not supported:
             click.echo("\n No supported PIDs found")
         else:
             click.echo(f"\nSupported PIDs ({len(supported)} found):")
-            # Display in columns
-            for i, pid in enumerate(supported):
-                if (i + 1) % 8 == 0:
-                    click.echo(f"{pid}")
-                else:
-                    click.echo(f"{pid}", nl=False)
-                    if (i + 1) % 8 != 0:
-                        click.echo(" ", nl=False)
-            click.echo()
+            # Display in columns of 8
+            _emit(" ".join(supported[i:i + 8]) for i in range(0, len(supported), 8))
     
     except Exception as e:
         click.echo(f"\n Error: {e}")
-        logger.exception("Error querying supported PIDs")
+        _log_menu_error("Error querying supported PIDs", e)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 # ============================================================================
 # BMW Multi-Module Diagnostic Functions (Task 3.0)
 # ============================================================================
 
+# Row templates for the module screens (bound once, called per row)
+_MODULE_CHOICE_ROW = "{0}. {1:12} - {2}".format
+_MODULE_DTC_COUNT_ROW = "{0}. {1:12} ({2}) - {3} codes".format
+_DTC_ROW = "  {0:8} | {1:10} | {2}".format
+_CLEAR_RESULT_ROW = "{0:12}: {1}".format
+
+# DME fault list icons, keyed by DTC.status
+_STATUS_ICON = {"active": "🔴"}
+_DEFAULT_ICON = "🟡"
+
 def scan_all_modules():
     """Scan all modules for DTCs (Task 1.1.7)."""
-    click.echo("\nScanning all BMW modules (Tester Present + DTCs)...")
-    click.echo("This may take 1-2 minutes...\n")
-    
-    try:
-        # 1) Quick responsiveness ping (UDS 0x3E)
-        mgr = connection_manager.get_manager()
-        ping_results = mgr.scan_all_modules(protocol="CAN")
-        # Adapt to dataclass-based results
-        responding = [pr.module.abbreviation for pr in ping_results if pr.responding]
-        not_responding = [pr.module.abbreviation for pr in ping_results if not pr.responding]
-        click.echo(f"Responding (Tester Present): {len(responding)}/{len(ping_results)} modules")
-        if responding:
-            click.echo("   " + ", ".join(sorted(responding)))
-        if not_responding:
-            click.echo("   No response: " + ", ".join(sorted(not_responding)))
-
-        # 2) Read DTCs from all modules
-        # Read DTCs from all modules
-        all_dtcs = obd_reader.read_all_module_dtcs(protocol="CAN")
-        
-        if not all_dtcs:
-            click.echo("\n No DTCs found in any module!")
-            input("\nPress Enter to continue...")
-            return
-        
-        # Display results
-        total_dtcs = sum(len(dtcs) for dtcs in all_dtcs.values())
-        click.echo(f"\nFound DTCs in {len(all_dtcs)} module(s), {total_dtcs} total codes\n")
+    with interactive_screen():
+        click.echo("\nScanning all BMW modules (Tester Present + DTCs)...")
+        click.echo("This may take 1-2 minutes...\n")
         
-        for module_abbr, dtcs in sorted(all_dtcs.items()):
-            module = bmw_modules.get_module_by_abbreviation(module_abbr)
-            module_name = module.name if module else module_abbr
-            click.echo(f"  {module_abbr} ({module_name}) - {len(dtcs)} codes")
+        try:
+            # Tester Present ping (UDS 0x3E) and DTC read in one pass per module
+            mgr = connection_manager.get_manager()
+            ping_results = mgr.scan_and_read_dtcs(protocol="CAN")
+            all_dtcs = {pr.module.abbreviation: pr.dtcs for pr in ping_results if pr.dtcs}
+            # Results follow get_can_modules(), which is already sorted by abbreviation
+            responding = [pr.module.abbreviation for pr in ping_results if pr.responding]
+            not_responding = [pr.module.abbreviation for pr in ping_results if not pr.responding]
+            click.echo(f"Responding (Tester Present): {len(responding)}/{len(ping_results)} modules")
+            if responding:
+                click.echo("   " + ", ".join(responding))
+            if not_responding:
+                click.echo("   No response: " + ", ".join(not_responding))
+
+            if not all_dtcs:
+                click.echo("\n No DTCs found in any module!")
+                return
+            
+            # Display results
+            total_dtcs = sum(len(dtcs) for dtcs in all_dtcs.values())
+            click.echo(f"\nFound DTCs in {len(all_dtcs)} module(s), {total_dtcs} total codes\n")
+            
+            summary = []
+            for module_abbr, dtcs in all_dtcs.items():
+                module = bmw_modules.get_module_by_abbreviation(module_abbr)
+                module_name = module.name if module else module_abbr
+                summary.append(f"  {module_abbr} ({module_name}) - {len(dtcs)} codes")
+            click.echo("\n".join(summary))
+            
+            # Show detailed list
+            if click.confirm("\nView detailed DTC list?", default=True):
+                _emit(("", obd_reader.format_dtc_report(all_dtcs)))
         
-        # Show detailed list
-        if click.confirm("\nView detailed DTC list?", default=True):
-            report = obd_reader.format_dtc_report(all_dtcs)
-            click.echo("\n" + report)
-    
-    except Exception as e:
-        click.echo(f"\n Scan error: {e}")
-        logger.exception("Error scanning modules")
-    
-    input("\nPress Enter to continue...")
+        except Exception as e:
+            click.echo(f"\n Scan error: {e}")
+            logger.exception("Error scanning modules")
 
 
 def read_module_dtcs_interactive():
     """Read DTCs from a selected module (Task 1.1.7)."""
-    can_modules: List[bmw_modules.BMWModule] = bmw_modules.get_can_modules()
+    from . import dtc_database
+    can_modules: Tuple[bmw_modules.BMWModule, ...] = bmw_modules.get_can_modules()
     
     click.echo("\nAvailable CAN Modules:")
-    for i, module in enumerate(can_modules, 1):
-        click.echo(f"{i}. {module.abbreviation:12} - {module.name}")
+    click.echo("\n".join(_MODULE_CHOICE_ROW(i, module.abbreviation, module.name)
+                          for i, module in enumerate(can_modules, 1)))
     
     choice = click.prompt(f"\nSelect module (1-{len(can_modules)}) or 0 to cancel", 
                           type=int, default=0)
@@ -3003,509 +3056,454 @@ def read_module_dtcs_interactive():
     
     module = cast(bmw_modules.BMWModule, can_modules[choice - 1])
     
-    click.echo(f"\nReading DTCs from {module.abbreviation} ({module.name})...")
-    
-    try:
-        dtcs = obd_reader.read_dtcs_from_module(module)
+    with interactive_screen():
+        click.echo(f"\nReading DTCs from {module.abbreviation} ({module.name})...")
         
-        if len(dtcs) == 0:
-            click.echo(f"\n No DTCs found in {module.abbreviation}")
-        else:
-            click.echo(f"\nFault Codes ({len(dtcs)} found):")
-            for dtc in dtcs:
-                severity = dtc.get('severity', 'Unknown')
-                click.echo(f"  {dtc['code']:8} | {severity:10} | {dtc['description']}")
-                
-                # Show common causes if available
-                dtc_info = dtc_database.lookup_dtc(dtc['code'])
-                if dtc_info and len(dtc_info.common_causes) > 0:
-                    click.echo(f"           | Common: {dtc_info.common_causes[0]}")
-    
-    except Exception as e:
-        click.echo(f"\n Error: {e}")
-        logger.exception(f"Error reading DTCs from {module.abbreviation}")
-    
-    input("\nPress Enter to continue...")
+        try:
+            dtcs = obd_reader.read_dtcs_from_module(module)
+            
+            if not dtcs:
+                click.echo(f"\n No DTCs found in {module.abbreviation}")
+            else:
+                lines = [f"\nFault Codes ({len(dtcs)} found):"]
+                infos = dtc_database.lookup_dtcs([dtc.code for dtc in dtcs])
+                for dtc in dtcs:
+                    lines.append(_DTC_ROW(dtc.code, dtc.severity, dtc.description))
+                    
+                    # Show common causes if available
+                    dtc_info = infos.get(dtc.code)
+                    if dtc_info and dtc_info.common_causes:
+                        lines.append(f"           | Common: {dtc_info.common_causes[0]}")
+                click.echo("\n".join(lines))
+        
+        except Exception as e:
+            click.echo(f"\n Error: {e}")
+            logger.exception(f"Error reading DTCs from {module.abbreviation}")
 
 
 def clear_all_modules_dtcs():
     """Clear DTCs from all modules (Task 1.1.7)."""
-    click.echo("\n" + "="*60)
-    click.echo("  DANGER: Clear All Module DTCs")
-    click.echo("="*60)
-    click.echo("\nThis will clear fault codes from ALL CAN modules!")
-    click.echo("This action cannot be undone.")
-    
-    confirm1 = click.prompt("\nType 'YES' to confirm", default="no")
-    if confirm1 != "YES":
-        click.echo("\nOperation cancelled.")
-        input("\nPress Enter to continue...")
-        return
-    
-    confirm2 = click.prompt("\nAre you absolutely sure? Type 'CLEAR ALL'", default="no")
-    if confirm2 != "CLEAR ALL":
-        click.echo("\nOperation cancelled.")
-        input("\nPress Enter to continue...")
-        return
-    
-    click.echo("\nClearing DTCs from all modules...")
-    
-    try:
-        can_modules: List[bmw_modules.BMWModule] = bmw_modules.get_can_modules()
-        results: Dict[str, bool] = {}
-        
-        for module in can_modules:
-            click.echo(f"  Clearing {module.abbreviation}...")
-            try:
-                success = obd_reader.clear_dtcs_from_module(module)
-                results[module.abbreviation] = success
-            except Exception as e:
-                logger.error(f"Failed to clear {module.abbreviation}: {e}")
-                results[module.abbreviation] = False
-        
-        click.echo("\nResults:")
-        for module_abbr, success in results.items():
-            status = " Cleared" if success else " Failed"
-            click.echo(f"{module_abbr:12}: {status}")
-        
-        cleared_count = sum(1 for success in results.values() if success)
-        click.echo(f"\n Cleared DTCs from {cleared_count}/{len(can_modules)} modules")
-    
-    except Exception as e:
-        click.echo(f"\n Error: {e}")
-        logger.exception("Error clearing all module DTCs")
-    
-    input("\nPress Enter to continue...")
-
-
-def clear_module_dtcs_interactive():
-    """Clear DTCs from a selected module (Task 1.1.7)."""
-    click.echo("\nScanning modules for DTCs...")
-    
-    try:
-        all_dtcs = obd_reader.read_all_module_dtcs(protocol="CAN")
-        
-        if len(all_dtcs) == 0:
-            click.echo("\n No modules have active DTCs")
-            input("\nPress Enter to continue...")
-            return
-        
-        click.echo("\nModules with active DTCs:")
-        module_abbrs = list(all_dtcs.keys())
-        
-        for i, module_abbr in enumerate(module_abbrs, 1):
-            module = bmw_modules.get_module_by_abbreviation(module_abbr)
-            module_name = module.name if module else module_abbr
-            dtc_count = len(all_dtcs[module_abbr])
-            click.echo(f"{i}. {module_abbr:12} ({module_name}) - {dtc_count} codes")
-        
-        choice = click.prompt(f"\nSelect module (1-{len(module_abbrs)}) or 0 to cancel", 
-                              type=int, default=0)
+    with interactive_screen("  DANGER: Clear All Module DTCs"):
+        click.echo("\nThis will clear fault codes from ALL CAN modules!")
+        click.echo("This action cannot be undone.")
         
-        if choice == 0 or choice > len(module_abbrs):
-            return
-        
-        module_abbr: str = cast(str, module_abbrs[choice - 1])
-        module = bmw_modules.get_module_by_abbreviation(module_abbr)
-        dtcs = all_dtcs[module_abbr]
-        
-        click.echo(f"\n  WARNING: Clear DTCs from {module_abbr}")
-        click.echo(f"\nDTCs to be cleared:")
-        for dtc in dtcs:
-            click.echo(f"  - {dtc['code']}: {dtc['description']}")
-        
-        confirm = click.prompt("\nType 'YES' to confirm", default="no")
-        if confirm != "YES":
+        confirm1 = click.prompt("\nType 'YES' to confirm", default="no")
+        if confirm1 != "YES":
             click.echo("\nOperation cancelled.")
-            input("\nPress Enter to continue...")
             return
         
-        click.echo(f"\nClearing DTCs from {module_abbr}...")
-        if module is None:
-            click.echo(" Module not found")
-            input("\nPress Enter to continue...")
+        confirm2 = click.prompt("\nAre you absolutely sure? Type 'CLEAR ALL'", default="no")
+        if confirm2 != "CLEAR ALL":
+            click.echo("\nOperation cancelled.")
             return
-        success = obd_reader.clear_dtcs_from_module(module)
         
-        if success:
-            click.echo(f"\n Successfully cleared {len(dtcs)} codes from {module_abbr}")
-        else:
-            click.echo(f"\n Failed to clear DTCs from {module_abbr}")
-    
-    except Exception as e:
-        click.echo(f"\n Error: {e}")
-        logger.exception("Error clearing module DTCs")
-    
-    input("\nPress Enter to continue...")
-
-
-def dme_functions_menu():
-    """DME Specific Functions submenu."""
-    while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== DME Specific Functions ===")
-        click.echo("="*60)
-        click.echo("\n1. Read ECU Identification")
-        click.echo("2. Read DME-Specific Errors")
-        click.echo("3. Clear DME-Specific Errors")
-        click.echo("4. Back to BMW Diagnostics Menu")
+        click.echo("\nReading DTCs from all modules...")
         
-        choice = click.prompt("\nSelect option", type=int, default=4)
+        try:
+            can_modules: Tuple[bmw_modules.BMWModule, ...] = bmw_modules.get_can_modules()
+            # Only modules that store codes, or could not be read, get a ClearDTC request
+            dtc_state = obd_reader.probe_dtcs_from_modules(can_modules)
+            unreadable = {abbr for abbr, dtcs in dtc_state.items() if dtcs is None}
+            to_clear = [m for m in can_modules if m.abbreviation in unreadable or dtc_state.get(m.abbreviation)]
+            
+            results: Dict[str, bool] = {}
+            if to_clear:
+                click.echo("  Clearing: " + ", ".join(m.abbreviation for m in to_clear))
+                results = obd_reader.clear_dtcs_from_modules(to_clear)
+            
+            click.echo("\nResults:")
+            click.echo("\n".join(
+                _CLEAR_RESULT_ROW(m.abbreviation,
+                                  ((" Cleared" if results[m.abbreviation] else " Failed")
+                                   + (" (DTC read failed)" if m.abbreviation in unreadable else ""))
+                                  if m.abbreviation in results else " (no codes)")
+                for m in can_modules
+            ))
+            
+            cleared_count = sum(1 for success in results.values() if success)
+            if unreadable:
+                click.echo(f"\n Could not read DTCs from: {', '.join(sorted(unreadable))} (clear attempted anyway)")
+            click.echo(f"\n Cleared DTCs from {cleared_count}/{len(to_clear)} modules attempted")
         
-        if choice == 4:
-            break
-        elif choice == 1:
-            read_ecu_identification()
-        elif choice == 2:
-            read_dme_errors()
-        elif choice == 3:
-            clear_dme_errors()
-        else:
-            click.echo("Invalid selection.")
+        except Exception as e:
+            click.echo(f"\n Error: {e}")
+            logger.exception("Error clearing all module DTCs")
 
 
-def read_ecu_identification():
-    """Read ECU identification using dme_handler (Task 4.1)."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Read ECU Identification ===")
-    click.echo("="*60)
-    click.echo("\nQuerying DME via UDS/CAN...")
-    
-    try:
-        ident = dme_handler.read_ecu_identification()
+def clear_module_dtcs_interactive():
+    """Clear DTCs from a selected module (Task 1.1.7)."""
+    with interactive_screen():
+        click.echo("\nScanning modules for DTCs...")
         
-        if not ident:
-            click.echo("\n No identification data returned")
-        else:
-            click.echo("\nDME Identification:")
-            click.echo("-" * 60)
+        try:
+            all_dtcs = obd_reader.read_all_module_dtcs(protocol="CAN")
             
-            # Display common fields with nice formatting
-            if 'VIN' in ident:
-                click.echo(f"VIN:              {ident['VIN']}")
-            if 'HW_REF' in ident:
-                click.echo(f"Hardware Ref:     {ident['HW_REF']}")
-            if 'SW_REF' in ident:
-                click.echo(f"Software Ref:     {ident['SW_REF']}")
-            if 'SUPPLIER' in ident:
-                click.echo(f"Supplier:         {ident['SUPPLIER']}")
-            if 'DIAG_INDEX' in ident:
-                click.echo(f"Diag Index:       {ident['DIAG_INDEX']}")
-            if 'BUILD_DATE' in ident:
-                click.echo(f"Build Date:       {ident['BUILD_DATE']}")
+            if not all_dtcs:
+                click.echo("\n No modules have active DTCs")
+                return
             
-            # Display any additional fields
-            known_fields = {'VIN', 'HW_REF', 'SW_REF', 'SUPPLIER', 'DIAG_INDEX', 'BUILD_DATE'}
-            other_fields = {k: v for k, v in ident.items() if k not in known_fields}
-            if other_fields:
-                click.echo("\nAdditional Fields:")
-                for key, value in other_fields.items():
-                    click.echo(f"  {key}: {value}")
+            click.echo("\nModules with active DTCs:")
+            module_abbrs = list(all_dtcs.keys())
             
-            click.echo("\n Identification read successfully")
-    
-    except dme_handler.DMEError as e:
-        click.echo(f"\n DME Error: {e}")
-        logger.error(f"DME error reading ECU identification: {e}")
-    except Exception as e:
-        click.echo(f"\n Unexpected Error: {e}")
-        logger.exception("Unexpected error reading ECU identification")
-    
-    input("\nPress Enter to continue...")
-
-
-def read_injector_codes():
-    """Read injector correction codes using dme_handler (Task 4.1)."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Read Injector Codes ===")
-    click.echo("="*60)
-    click.echo("\nQuerying DME for injector correction values via UDS/CAN...")
-    
-    try:
-        injector_data = dme_handler.read_injector_codes()
-        
-        if not injector_data:
-            click.echo("\n No injector data returned")
-        else:
-            click.echo("\nInjector Correction Codes (IKS):")
-            click.echo("-" * 60)
+            rows = []
+            for i, module_abbr in enumerate(module_abbrs, 1):
+                module = bmw_modules.get_module_by_abbreviation(module_abbr)
+                module_name = module.name if module else module_abbr
+                rows.append(_MODULE_DTC_COUNT_ROW(i, module_abbr, module_name, len(all_dtcs[module_abbr])))
+            click.echo("\n".join(rows))
             
-            # Display injector values for cylinders 1-6
-            for i in range(1, 7):
-                key = f'injector_{i}'
-                if key in injector_data:
-                    click.echo(f"Cylinder {i}:  {injector_data[key]}")
+            choice = click.prompt(f"\nSelect module (1-{len(module_abbrs)}) or 0 to cancel", 
+                                  type=int, default=0)
             
-            # Display unit if available
-            if 'unit' in injector_data:
-                click.echo(f"\nUnit: {injector_data['unit']}")
+            if choice == 0 or choice > len(module_abbrs):
+                return
             
-            # Display any additional fields
-            known_fields = {f'injector_{i}' for i in range(1, 7)} | {'unit'}
-            other_fields = {k: v for k, v in injector_data.items() if k not in known_fields}
-            if other_fields:
-                click.echo("\nAdditional Data:")
-                for key, value in other_fields.items():
-                    click.echo(f"  {key}: {value}")
+            module_abbr: str = cast(str, module_abbrs[choice - 1])
+            module = bmw_modules.get_module_by_abbreviation(module_abbr)
+            dtcs = all_dtcs[module_abbr]
             
-            click.echo("\n Injector codes read successfully")
-    
-    except dme_handler.DMEError as e:
-        click.echo(f"\n DME Error: {e}")
-        logger.error(f"DME error reading injector codes: {e}")
-    except Exception as e:
-        click.echo(f"\n Unexpected Error: {e}")
-        logger.exception("Unexpected error reading injector codes")
-    
-    input("\nPress Enter to continue...")
+            click.echo(f"\n  WARNING: Clear DTCs from {module_abbr}")
+            click.echo(f"\nDTCs to be cleared:")
+            for dtc in dtcs:
+                click.echo(f"  - {dtc.code}: {dtc.description}")
+            
+            confirm = click.prompt("\nType 'YES' to confirm", default="no")
+            if confirm != "YES":
+                click.echo("\nOperation cancelled.")
+                return
+            
+            click.echo(f"\nClearing DTCs from {module_abbr}...")
+            if module is None:
+                click.echo(" Module not found")
+                return
+            success = obd_reader.clear_dtcs_from_module(module)
+            
+            if success:
+                click.echo(f"\n Successfully cleared {len(dtcs)} codes from {module_abbr}")
+            else:
+                click.echo(f"\n Failed to clear DTCs from {module_abbr}")
+        
+        except Exception as e:
+            click.echo(f"\n Error: {e}")
+            logger.exception("Error clearing module DTCs")
 
 
-def read_vanos_data():
-    """Read VANOS system data using dme_handler (Task 4.1)."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Read VANOS Data ===")
-    click.echo("="*60)
-    click.echo("\nQuerying DME for VANOS system data via UDS/CAN...")
-    
-    try:
-        vanos_data = dme_handler.read_vanos_data()
-        
-        if not vanos_data:
-            click.echo("\n No VANOS data returned")
-        else:
-            click.echo("\nVANOS System Data:")
-            click.echo("-" * 60)
-            
-            # Display common VANOS fields
-            if 'intake_position' in vanos_data:
-                click.echo(f"Intake Position:      {vanos_data['intake_position']}°")
-            if 'exhaust_position' in vanos_data:
-                click.echo(f"Exhaust Position:     {vanos_data['exhaust_position']}°")
-            if 'intake_target' in vanos_data:
-                click.echo(f"Intake Target:        {vanos_data['intake_target']}°")
-            if 'exhaust_target' in vanos_data:
-                click.echo(f"Exhaust Target:       {vanos_data['exhaust_target']}°")
-            if 'intake_adaptation' in vanos_data:
-                click.echo(f"Intake Adaptation:    {vanos_data['intake_adaptation']}")
-            if 'exhaust_adaptation' in vanos_data:
-                click.echo(f"Exhaust Adaptation:   {vanos_data['exhaust_adaptation']}")
-            if 'status' in vanos_data:
-                click.echo(f"\nStatus:               {vanos_data['status']}")
+def dme_functions_menu():
+    """DME Specific Functions submenu."""
+    from . import dme_handler
+    # One CAN connection to the DME for the whole submenu, closed on exit
+    with dme_handler.open_session() as flasher:
+        while True:
+            click.echo(f"\n{_H60}\n=== DME Specific Functions ===\n{_H60}")
+            click.echo("\n1. Read ECU Identification")
+            click.echo("2. Read DME-Specific Errors")
+            click.echo("3. Clear DME-Specific Errors")
+            click.echo("4. Read All DME Data (Ident, Injectors, VANOS, Boost)")
+            click.echo("5. Back to BMW Diagnostics Menu")
             
-            # Display any additional fields
-            known_fields = {'intake_position', 'exhaust_position', 'intake_target', 
-                          'exhaust_target', 'intake_adaptation', 'exhaust_adaptation', 'status'}
-            other_fields = {k: v for k, v in vanos_data.items() if k not in known_fields}
-            if other_fields:
-                click.echo("\nAdditional Data:")
-                for key, value in other_fields.items():
-                    click.echo(f"  {key}: {value}")
+            choice = click.prompt("\nSelect option", type=int, default=5)
             
-            click.echo("\n VANOS data read successfully")
-    
-    except dme_handler.DMEError as e:
-        click.echo(f"\n DME Error: {e}")
-        logger.error(f"DME error reading VANOS data: {e}")
-    except Exception as e:
-        click.echo(f"\n Unexpected Error: {e}")
-        logger.exception("Unexpected error reading VANOS data")
-    
-    input("\nPress Enter to continue...")
+            if choice == 5:
+                break
+            elif choice == 1:
+                read_ecu_identification(flasher=flasher)
+            elif choice == 2:
+                read_dme_errors(flasher=flasher)
+            elif choice == 3:
+                clear_dme_errors(flasher=flasher)
+            elif choice == 4:
+                read_all_dme_data(flasher=flasher)
+            else:
+                click.echo("Invalid selection.")
 
 
-def read_boost_data():
-    """Read boost/wastegate data using dme_handler (Task 4.1)."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Read Boost/Wastegate Data ===")
-    click.echo("="*60)
-    click.echo("\nQuerying DME for turbocharger data via UDS/CAN...")
-    
-    try:
-        boost_data = dme_handler.read_boost_data()
+# (key, label, unit suffix) rows for the DME data screens
+_IDENT_LABELS = (
+    ('VIN', 'VIN:', ''),
+    ('HW_REF', 'Hardware Ref:', ''),
+    ('SW_REF', 'Software Ref:', ''),
+    ('SUPPLIER', 'Supplier:', ''),
+    ('DIAG_INDEX', 'Diag Index:', ''),
+    ('BUILD_DATE', 'Build Date:', ''),
+)
+_INJECTOR_LABELS = tuple((f'injector_{i}', f'Cylinder {i}:', '') for i in range(1, 7)) + (
+    ('unit', 'Unit:', ''),
+)
+_VANOS_LABELS = (
+    ('intake_position', 'Intake Position:', '°'),
+    ('exhaust_position', 'Exhaust Position:', '°'),
+    ('intake_target', 'Intake Target:', '°'),
+    ('exhaust_target', 'Exhaust Target:', '°'),
+    ('intake_adaptation', 'Intake Adaptation:', ''),
+    ('exhaust_adaptation', 'Exhaust Adaptation:', ''),
+    ('status', 'Status:', ''),
+)
+_BOOST_LABELS = (
+    ('boost_actual', 'Actual Boost:', ' bar'),
+    ('boost_target', 'Target Boost:', ' bar'),
+    ('wastegate_left', 'Left Wastegate:', '%'),
+    ('wastegate_right', 'Right Wastegate:', '%'),
+    ('overboost_counter', 'Overboost Events:', ''),
+    ('underboost_counter', 'Underboost Events:', ''),
+    ('status', 'Status:', ''),
+)
+
+
+def read_ecu_identification(ident: Optional[Any] = None, flasher=None):
+    """Read ECU identification using dme_handler (Task 4.1).
+
+    Args:
+        ident: Result prefetched by dme_handler.read_dme_snapshot(); the DME is
+            queried when omitted
+        flasher: Open dme_handler.open_session() connection to query over
+    """
+    from . import dme_handler
+    with interactive_screen("=== Read ECU Identification ==="):
+        click.echo("\nQuerying DME via UDS/CAN...")
         
-        if not boost_data:
-            click.echo("\n No boost data returned")
-        else:
-            click.echo("\nTurbocharger/Boost Control Data:")
-            click.echo("-" * 60)
-            
-            # Display common boost fields
-            if 'boost_actual' in boost_data:
-                click.echo(f"Actual Boost:         {boost_data['boost_actual']} bar")
-            if 'boost_target' in boost_data:
-                click.echo(f"Target Boost:         {boost_data['boost_target']} bar")
-            if 'wastegate_left' in boost_data:
-                click.echo(f"Left Wastegate:       {boost_data['wastegate_left']}%")
-            if 'wastegate_right' in boost_data:
-                click.echo(f"Right Wastegate:      {boost_data['wastegate_right']}%")
-            if 'overboost_counter' in boost_data:
-                click.echo(f"Overboost Events:     {boost_data['overboost_counter']}")
-            if 'underboost_counter' in boost_data:
-                click.echo(f"Underboost Events:    {boost_data['underboost_counter']}")
-            if 'status' in boost_data:
-                click.echo(f"\nStatus:               {boost_data['status']}")
+        try:
+            if ident is None:
+                ident = dme_handler.read_ecu_identification(flasher=flasher)
+            elif isinstance(ident, Exception):
+                raise ident
             
-            # Display any additional fields
-            known_fields = {'boost_actual', 'boost_target', 'wastegate_left', 
-                          'wastegate_right', 'overboost_counter', 'underboost_counter', 'status'}
-            other_fields = {k: v for k, v in boost_data.items() if k not in known_fields}
-            if other_fields:
-                click.echo("\nAdditional Data:")
-                for key, value in other_fields.items():
-                    click.echo(f"  {key}: {value}")
+            if not ident:
+                click.echo("\n No identification data returned")
+            else:
+                _emit_kv("DME Identification:", ident, _IDENT_LABELS,
+                         width=18, extra_title="Additional Fields:")
+                
+                click.echo("\n Identification read successfully")
+        
+        except dme_handler.DMEError as e:
+            click.echo(f"\n DME Error: {e}")
+            logger.error(f"DME error reading ECU identification: {e}")
+        except Exception as e:
+            click.echo(f"\n Unexpected Error: {e}")
+            logger.exception("Unexpected error reading ECU identification")
+
+
+def read_injector_codes(injector_data: Optional[Any] = None, flasher=None):
+    """Read injector correction codes using dme_handler (Task 4.1).
+
+    Args:
+        injector_data: Result prefetched by dme_handler.read_dme_snapshot(); the DME is
+            queried when omitted
+        flasher: Open dme_handler.open_session() connection to query over
+    """
+    from . import dme_handler
+    with interactive_screen("=== Read Injector Codes ==="):
+        click.echo("\nQuerying DME for injector correction values via UDS/CAN...")
+        
+        try:
+            if injector_data is None:
+                injector_data = dme_handler.read_injector_codes(flasher=flasher)
+            elif isinstance(injector_data, Exception):
+                raise injector_data
             
-            click.echo("\n Boost data read successfully")
-    
-    except dme_handler.DMEError as e:
-        click.echo(f"\n DME Error: {e}")
-        logger.error(f"DME error reading boost data: {e}")
-    except Exception as e:
-        click.echo(f"\n Unexpected Error: {e}")
-        logger.exception("Unexpected error reading boost data")
-    
-    input("\nPress Enter to continue...")
+            if not injector_data:
+                click.echo("\n No injector data returned")
+            else:
+                _emit_kv("Injector Correction Codes (IKS):", injector_data, _INJECTOR_LABELS, width=14)
+                
+                click.echo("\n Injector codes read successfully")
+        
+        except dme_handler.DMEError as e:
+            click.echo(f"\n DME Error: {e}")
+            logger.error(f"DME error reading injector codes: {e}")
+        except Exception as e:
+            click.echo(f"\n Unexpected Error: {e}")
+            logger.exception("Unexpected error reading injector codes")
 
 
-def read_dme_errors():
-    """Read DME-specific errors using dme_handler (Task 4.1)."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Read DME Fault Codes ===")
-    click.echo("="*60)
-    click.echo("\nQuerying DME fault memory via UDS/CAN...")
-    
-    try:
-        dtcs = dme_handler.read_dme_errors()
+def read_vanos_data(vanos_data: Optional[Any] = None, flasher=None):
+    """Read VANOS system data using dme_handler (Task 4.1).
+
+    Args:
+        vanos_data: Result prefetched by dme_handler.read_dme_snapshot(); the DME is
+            queried when omitted
+        flasher: Open dme_handler.open_session() connection to query over
+    """
+    from . import dme_handler
+    with interactive_screen("=== Read VANOS Data ==="):
+        click.echo("\nQuerying DME for VANOS system data via UDS/CAN...")
         
-        if len(dtcs) == 0:
-            click.echo("\n No DME fault codes found")
-            click.echo("\nFault memory is clear.")
-        else:
-            click.echo(f"\nFound {len(dtcs)} DME Fault Code(s):")
-            click.echo("-" * 60)
+        try:
+            if vanos_data is None:
+                vanos_data = dme_handler.read_vanos_data(flasher=flasher)
+            elif isinstance(vanos_data, Exception):
+                raise vanos_data
             
-            for i, dtc in enumerate(dtcs, 1):
-                status_icon = "🔴" if dtc.get('status') == 'active' else "🟡"
-                click.echo(f"\n{i}. {status_icon} {dtc.get('code', 'Unknown')}")
-                click.echo(f"   Description: {dtc.get('description', 'No description')}")
-                click.echo(f"   Status: {dtc.get('status', 'Unknown').upper()}")
-                if 'frequency' in dtc:
-                    click.echo(f"   Frequency: {dtc['frequency']}")
+            if not vanos_data:
+                click.echo("\n No VANOS data returned")
+            else:
+                _emit_kv("VANOS System Data:", vanos_data, _VANOS_LABELS)
+                
+                click.echo("\n VANOS data read successfully")
+        
+        except dme_handler.DMEError as e:
+            click.echo(f"\n DME Error: {e}")
+            logger.error(f"DME error reading VANOS data: {e}")
+        except Exception as e:
+            click.echo(f"\n Unexpected Error: {e}")
+            logger.exception("Unexpected error reading VANOS data")
+
+
+def read_boost_data(boost_data: Optional[Any] = None, flasher=None):
+    """Read boost/wastegate data using dme_handler (Task 4.1).
+
+    Args:
+        boost_data: Result prefetched by dme_handler.read_dme_snapshot(); the DME is
+            queried when omitted
+        flasher: Open dme_handler.open_session() connection to query over
+    """
+    from . import dme_handler
+    with interactive_screen("=== Read Boost/Wastegate Data ==="):
+        click.echo("\nQuerying DME for turbocharger data via UDS/CAN...")
+        
+        try:
+            if boost_data is None:
+                boost_data = dme_handler.read_boost_data(flasher=flasher)
+            elif isinstance(boost_data, Exception):
+                raise boost_data
             
-            click.echo("\n" + "="*60)
-            click.echo("\n  IMPORTANT: Document these codes before clearing!")
-    
-    except dme_handler.DMEError as e:
-        click.echo(f"\n DME Error: {e}")
-        logger.error(f"DME error reading fault codes: {e}")
-    except Exception as e:
-        click.echo(f"\n Unexpected Error: {e}")
-        logger.exception("Unexpected error reading DME errors")
-    
-    input("\nPress Enter to continue...")
+            if not boost_data:
+                click.echo("\n No boost data returned")
+            else:
+                _emit_kv("Turbocharger/Boost Control Data:", boost_data, _BOOST_LABELS)
+                
+                click.echo("\n Boost data read successfully")
+        
+        except dme_handler.DMEError as e:
+            click.echo(f"\n DME Error: {e}")
+            logger.error(f"DME error reading boost data: {e}")
+        except Exception as e:
+            click.echo(f"\n Unexpected Error: {e}")
+            logger.exception("Unexpected error reading boost data")
 
 
-def clear_dme_errors():
-    """Clear DME-specific errors using dme_handler (Task 4.1)."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Clear DME Fault Codes ===")
-    click.echo("="*60)
-    click.echo("\n  WARNING: This will erase ALL DME fault codes!")
-    click.echo("\nThis includes:")
-    click.echo("  - Active fault codes")
-    click.echo("  - Stored/historical codes")
-    click.echo("  - Freeze frame data")
-    click.echo("\nRecommendation: Read and document codes before clearing.")
-    
-    # First confirmation
-    confirm_text = click.prompt("\nType 'YES' to confirm clearing DME fault memory", type=str, default="NO")
-    
-    if confirm_text.upper() != 'YES':
-        click.echo("\n Operation cancelled.")
-        input("\nPress Enter to continue...")
-        return
-    
-    # Second confirmation
-    click.echo("\n  FINAL CONFIRMATION")
-    if not click.confirm("Are you absolutely sure?", default=False):
-        click.echo("\n Operation cancelled.")
-        input("\nPress Enter to continue...")
-        return
-    
-    click.echo("\nClearing DME fault memory via UDS/CAN...")
-    
+def read_all_dme_data(flasher=None):
+    """Read identification, injector, VANOS and boost data in one batch, then show each screen.
+
+    Args:
+        flasher: Open dme_handler.open_session() connection to read over
+    """
+    from . import dme_handler
+    click.echo("\nReading DME identification, injector, VANOS and boost data...")
     try:
-        success = dme_handler.clear_dme_errors()
-        
-        if success:
-            click.echo("\n DME fault memory cleared successfully")
-            click.echo("\nAll fault codes have been erased.")
-        else:
-            click.echo("\n Clear operation completed with warnings")
-            click.echo("\nSome fault codes may still remain in memory.")
-            click.echo("This can happen if codes are currently active.")
-    
-    except dme_handler.DMEError as e:
-        click.echo(f"\n DME Error: {e}")
-        logger.error(f"DME error clearing fault codes: {e}")
+        snapshot = dme_handler.read_dme_snapshot(flasher)
     except Exception as e:
         click.echo(f"\n Unexpected Error: {e}")
-        logger.exception("Unexpected error clearing DME errors")
-    
-    input("\nPress Enter to continue...")
+        logger.exception("Unexpected error reading DME data")
+        _pause()
+        return
+    read_ecu_identification(snapshot['ident'])
+    read_injector_codes(snapshot['injectors'])
+    read_vanos_data(snapshot['vanos'])
+    read_boost_data(snapshot['boost'])
 
 
-def read_dtcs():
-    """Read Diagnostic Trouble Codes (DTCs) via DME handler (UDS)."""
-    click.echo("Reading DTCs (DME)...")
-    try:
-        dtcs = dme_handler.read_dme_errors()
-        if not dtcs:
-            click.echo(" No DTCs found (ECU clean)")
-            return
-        click.echo(f"\nFound {len(dtcs)} DTC(s):\n")
-        for dtc in dtcs:
-            code = dtc.get('code', 'UNKNOWN')
-            description = dtc.get('description', 'No description')
-            status = dtc.get('status', 'N/A')
-            click.echo(f"  {code}: {description}")
-            click.echo(f"    Status: {status}")
-    except Exception as e:
-        click.echo(f" Error reading DTCs: {e}")
-        logger.exception("DTC read failed")
+def read_dme_errors(flasher=None):
+    """Read DME-specific errors using dme_handler (Task 4.1).
+
+    Args:
+        flasher: Open dme_handler.open_session() connection to query over
+    """
+    from . import dme_handler
+    with interactive_screen("=== Read DME Fault Codes ==="):
+        click.echo("\nQuerying DME fault memory via UDS/CAN...")
+        
+        try:
+            dtcs = dme_handler.read_dme_errors(flasher=flasher)
+            
+            if not dtcs:
+                click.echo("\n No DME fault codes found")
+                click.echo("\nFault memory is clear.")
+            else:
+                report = io.StringIO()
+                write = report.write
+                write(f"\nFound {len(dtcs)} DME Fault Code(s):\n")
+                write("-" * 60 + "\n")
+                
+                for i, dtc in enumerate(dtcs, 1):
+                    status_icon = _STATUS_ICON.get(dtc.status, _DEFAULT_ICON)
+                    write(f"\n{i}. {status_icon} {dtc.code}\n")
+                    write(f"   Description: {dtc.description}\n")
+                    write(f"   Status: {(dtc.status or 'Unknown').upper()}\n")
+                    if dtc.frequency is not None:
+                        write(f"   Frequency: {dtc.frequency}\n")
+                
+                write(f"\n{_H60}\n")
+                write("\n  IMPORTANT: Document these codes before clearing!")
+                click.echo(report.getvalue())
+        
+        except dme_handler.DMEError as e:
+            click.echo(f"\n DME Error: {e}")
+            logger.error(f"DME error reading fault codes: {e}")
+        except Exception as e:
+            click.echo(f"\n Unexpected Error: {e}")
+            logger.exception("Unexpected error reading DME errors")
 
 
-def clear_dtcs():
-    """Clear Diagnostic Trouble Codes (DTCs) via DME handler (UDS)."""
-    click.echo("Clearing DTCs (DME)...")
-    if not click.confirm("Are you sure you want to clear all DTCs?", default=False):
-        click.echo("Cancelled")
-        return
-    try:
-        ok = dme_handler.clear_dme_errors()
-        if ok:
-            click.echo(" DTCs cleared successfully")
-        else:
-            click.echo(" Failed to clear DTCs")
-    except Exception as e:
-        click.echo(f" Error clearing DTCs: {e}")
-        logger.exception("DTC clear failed")
+def clear_dme_errors(flasher=None):
+    """Clear DME-specific errors using dme_handler (Task 4.1).
+
+    Args:
+        flasher: Open dme_handler.open_session() connection to clear over
+    """
+    from . import dme_handler
+    with interactive_screen("=== Clear DME Fault Codes ==="):
+        click.echo("\n  WARNING: This will erase ALL DME fault codes!")
+        click.echo("\nThis includes:")
+        click.echo("  - Active fault codes")
+        click.echo("  - Stored/historical codes")
+        click.echo("  - Freeze frame data")
+        click.echo("\nRecommendation: Read and document codes before clearing.")
+        
+        # First confirmation
+        confirm_text = click.prompt("\nType 'YES' to confirm clearing DME fault memory", type=str, default="NO")
+        
+        if confirm_text.upper() != 'YES':
+            click.echo("\n Operation cancelled.")
+            return
+        
+        # Second confirmation
+        click.echo("\n  FINAL CONFIRMATION")
+        if not click.confirm("Are you absolutely sure?", default=False):
+            click.echo("\n Operation cancelled.")
+            return
+        
+        click.echo("\nClearing DME fault memory via UDS/CAN...")
+        
+        try:
+            success = dme_handler.clear_dme_errors(flasher=flasher)
+            
+            if success:
+                click.echo("\n DME fault memory cleared successfully")
+                click.echo("\nAll fault codes have been erased.")
+            else:
+                click.echo("\n Clear operation completed with warnings")
+                click.echo("\nSome fault codes may still remain in memory.")
+                click.echo("This can happen if codes are currently active.")
+        
+        except dme_handler.DMEError as e:
+            click.echo(f"\n DME Error: {e}")
+            logger.error(f"DME error clearing fault codes: {e}")
+        except Exception as e:
+            click.echo(f"\n Unexpected Error: {e}")
+            logger.exception("Unexpected error clearing DME errors")
 
 
 def flash_map_interactive():
     """Interactive prompt for flashing a calibration file."""
-    from pathlib import Path
     
     map_file = click.prompt("Enter the path to the calibration .bin file", type=click.Path(exists=True))
     map_path = Path(map_file)
     
-    if not map_path.exists():
-        click.echo(" File not found")
-        return
-    
     # Show file info
     file_size = map_path.stat().st_size
     click.echo(f"\nFile: {map_path.name}")
-    click.echo(f"Size: {file_size:,} bytes ({file_size/(1024*1024):.2f} MB)")
+    click.echo(f"Size: {file_size:,} bytes ({file_size / _MB:.2f} MB)")
     
     # Determine flash method
     click.echo("\nFlash method:")
@@ -3528,58 +3526,139 @@ def flash_map_interactive():
 # UDS Operations Menu
 # ============================================================================
 
+# Menu text for the UDS screens, built once and written with a single echo
+_UDS_BANNER = (
+    f"\n{_H60}\n=== UDS Operations (Advanced) ===\n{_H60}\n"
+    "\nADVANCED: Direct ECU communication using UDS protocol\n\n"
+    "1. Enter Programming Session\n"
+    "2. Read VIN from ECU\n"
+    "3. Security Access (Seed/Key)\n"
+    "4. Read Calibration Region\n"
+    "5. Flash Calibration Region\n"
+    "6. Reset ECU\n"
+    "7. Verify Calibration CRCs\n"
+    "8. View UDS Protocol Info\n"
+    "0. Back to Main Menu\n"
+)
+
+_UDS_PROGRAMMING_BANNER = (
+    f"\n{_H60}\n=== Enter Programming Session ===\n{_H60}\n"
+    "\nAttempting to enter programming diagnostic session...\n"
+    "Using direct CAN/UDS\n\n"
+)
+
+_UDS_VIN_BANNER = (
+    f"\n{_H60}\n=== Read VIN from ECU ===\n{_H60}\n"
+    "\nReading VIN via UDS (Service 0x22, DID 0xF190)...\n\n"
+)
+
+_UDS_VIN_USES = (
+    "\nThis VIN is used for:\n"
+    "  - License validation\n"
+    "  - Map compatibility checking\n"
+    "  - Backup organization\n"
+)
+
+_UDS_SECURITY_INFO = (
+    f"\n{_H60}\n=== Security Access (Seed/Key) ===\n{_H60}\n"
+    "\nBMW ECU Security Access Process:\n"
+    "1. Request seed from ECU (UDS 0x27 0x01)\n"
+    "2. Calculate key using proprietary algorithm\n"
+    "3. Send key to ECU (UDS 0x27 0x02)\n"
+    "4. ECU unlocks if key is correct\n\n"
+    "Algorithms implemented: v1 (MSS54/MSD80), v2 (MSD80 swap), v3 (BM variant)\n"
+    "Keys are calculated locally\n"
+)
+
+_UDS_READ_CAL_BANNER = (
+    f"\n{_H60}\n=== Read Calibration Region ===\n{_H60}\n"
+    "\nCalibration region contains:\n"
+    "  - Fuel maps\n"
+    "  - Ignition timing maps\n"
+    "  - Boost control maps\n"
+    "  - Limiters (RPM, speed, torque)\n"
+    "  - Feature codewords\n\n"
+    "Default CAL region:\n"
+    "  Start: 0x00100000\n"
+    "  Size:  512 KB (~0x80000 bytes)\n\n"
+)
+
+_UDS_FLASH_BANNER = (
+    f"\n{_H60}\n=== Flash Calibration Region ===\n{_H60}\n"
+    "\n  DANGER: Incorrect calibration can damage ECU!\n"
+    "\nThis will flash ONLY the calibration region (CAL)\n"
+    "Does NOT touch bootloader or firmware\n\n"
+)
+
+_UDS_RESET_BANNER = (
+    f"\n{_H60}\n=== Reset ECU ===\n{_H60}\n"
+    "\nReset Types:\n"
+    "1. Hard Reset (0x01) - Full ECU restart\n"
+    "2. Key Off/On (0x02) - Simulate key cycle\n"
+    "3. Soft Reset (0x03) - Reload calibration\n"
+)
+
+_UDS_VERIFY_INFO = (
+    "\nCRC verification checks that calibration data:\n"
+    "  - Was not corrupted during flash\n"
+    "  - Matches expected checksums\n"
+    "  - Is compatible with ECU firmware\n\n"
+)
+
+_UDS_PROTOCOL_INFO = (
+    f"\n{_H60}\n=== UDS Protocol Information ===\n{_H60}\n"
+    "\nUnified Diagnostic Services (ISO 14229)\n"
+    "\nKey Services:\n"
+    "  0x10 - Diagnostic Session Control\n"
+    "  0x11 - ECU Reset\n"
+    "  0x22 - Read Data By Identifier\n"
+    "  0x27 - Security Access (Seed/Key)\n"
+    "  0x2E - Write Data By Identifier\n"
+    "  0x31 - Routine Control\n"
+    "  0x34 - Request Download\n"
+    "  0x36 - Transfer Data\n"
+    "  0x37 - Request Transfer Exit\n\n"
+    "Implementation:\n"
+    "  - Uses UDS over CAN (ISO-TP)\n"
+    "  - Transport: {transport}\n"
+    "  - PT_CAN2 bus (Powertrain CAN)\n"
+    "  - Partial flash (CAL region only)\n"
+    "  - Standard CRC32 checksums\n"
+    "  - BMW-specific seed/key algorithm\n\n"
+    "Reference: mevd17_uds_base\n"
+)
+
+
 def uds_operations_menu():
     """UDS Operations submenu - Advanced ECU communication using UDS protocol."""
+    # One handler for the whole submenu so a session or unlock from one
+    # option is still in place for the next
+    handler = uds_handler.UDSHandler(logger)
+    try:
+        _uds_operations_loop(handler)
+    finally:
+        handler.close()
+
+
+def _uds_operations_loop(handler: uds_handler.UDSHandler):
+    """Menu loop for uds_operations_menu."""
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== UDS Operations (Advanced) ===")
-        click.echo("="*60)
-        click.echo("\nADVANCED: Direct ECU communication using UDS protocol\n")
-        
-        click.echo("1. Enter Programming Session")
-        click.echo("2. Read VIN from ECU")
-        click.echo("3. Security Access (Seed/Key)")
-        click.echo("4. Read Calibration Region")
-        click.echo("5. Flash Calibration Region")
-        click.echo("6. Reset ECU")
-        click.echo("7. Verify Calibration CRCs")
-        click.echo("8. View UDS Protocol Info")
-        click.echo("0. Back to Main Menu")
+        click.echo(_UDS_BANNER, nl=False)
         
         choice = click.prompt("\nSelect option", type=int, default=0)
         
         if choice == 0:
             break
-        elif choice == 1:
-            uds_enter_programming_session()
-        elif choice == 2:
-            uds_read_vin()
-        elif choice == 3:
-            uds_security_access()
-        elif choice == 4:
-            uds_read_calibration()
-        elif choice == 5:
-            uds_flash_calibration()
-        elif choice == 6:
-            uds_reset_ecu()
-        elif choice == 7:
-            uds_verify_crcs()
-        elif choice == 8:
-            uds_protocol_info()
+        action = _UDS_MENU.get(choice)
+        if action:
+            action(handler)
         else:
             click.echo("Invalid selection.")
 
 
-def uds_enter_programming_session():
+def uds_enter_programming_session(handler: uds_handler.UDSHandler):
     """Enter UDS programming session."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Enter Programming Session ===")
-    click.echo("="*60)
-    
-    handler = uds_handler.UDSHandler(logger)
-    
-    click.echo("\nAttempting to enter programming diagnostic session...")
-    click.echo("Using direct CAN/UDS\n")
+    click.echo(_UDS_PROGRAMMING_BANNER, nl=False)
     
     if handler.enter_programming_session():
         click.echo("\n Programming session established")
@@ -3588,73 +3667,75 @@ def uds_enter_programming_session():
         click.echo("\n Failed to enter programming session")
         click.echo("Check ECU connection and try again")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
-def uds_read_vin():
+def uds_read_vin(handler: uds_handler.UDSHandler):
     """Read VIN using UDS protocol."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Read VIN from ECU ===")
-    click.echo("="*60)
-    
-    handler = uds_handler.UDSHandler(logger)
-    
-    click.echo("\nReading VIN via UDS (Service 0x22, DID 0xF190)...\n")
+    click.echo(_UDS_VIN_BANNER, nl=False)
     
     vin = handler.read_vin()
     
     if vin:
         click.echo(f"\n VIN: {vin}")
-        click.echo("\nThis VIN is used for:")
-        click.echo("  - License validation")
-        click.echo("  - Map compatibility checking")
-        click.echo("  - Backup organization")
+        click.echo(_UDS_VIN_USES, nl=False)
     else:
         click.echo("\n Failed to read VIN")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def uds_security_access():
     """Security access (seed/key) implementation."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Security Access (Seed/Key) ===")
-    click.echo("="*60)
-    
-    click.echo("\nBMW ECU Security Access Process:")
-    click.echo("1. Request seed from ECU (UDS 0x27 0x01)")
-    click.echo("2. Calculate key using proprietary algorithm")
-    click.echo("3. Send key to ECU (UDS 0x27 0x02)")
-    click.echo("4. ECU unlocks if key is correct\n")
+    click.echo(_UDS_SECURITY_INFO, nl=False)
     
-    click.echo("Algorithms implemented: v1 (MSS54/MSD80), v2 (MSD80 swap), v3 (BM variant)")
-    click.echo("Keys are calculated locally")
-    
-    input("\nPress Enter to continue...")
+    _pause()
+
+
+# Background file writes (calibration backups) so the menu returns immediately
+_io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="backup-io")
+_pending_writes: set = set()
+
+
+def _write_backup(path: Path, data: bytes) -> None:
+    """Write data to path straight from a memoryview (no Python-level chunking) and fsync it."""
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
-def uds_read_calibration():
+def _backup_written(future: Future) -> None:
+    """Drop a finished write from _pending_writes and log any failure."""
+    _pending_writes.discard(future)
+    if future.exception() is not None:
+        logger.error(f"Background backup write failed: {future.exception()}")
+
+
+def _join_backup_writes() -> bool:
+    """Wait for queued backup writes; print any failure and return False so the caller does not flash."""
+    ok = True
+    for future in list(_pending_writes):
+        try:
+            future.result()
+        except OSError as e:
+            click.echo(f"\n Backup write failed: {e}; refusing to flash")
+            ok = False
+    return ok
+
+
+def uds_read_calibration(handler: uds_handler.UDSHandler):
     """Read calibration region from ECU."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Read Calibration Region ===")
-    click.echo("="*60)
-    
-    click.echo("\nCalibration region contains:")
-    click.echo("  - Fuel maps")
-    click.echo("  - Ignition timing maps")
-    click.echo("  - Boost control maps")
-    click.echo("  - Limiters (RPM, speed, torque)")
-    click.echo("  - Feature codewords\n")
-    
-    click.echo("Default CAL region:")
-    click.echo("  Start: 0x00100000")
-    click.echo("  Size:  512 KB (~0x80000 bytes)\n")
+    click.echo(_UDS_READ_CAL_BANNER, nl=False)
     
     if not click.confirm("Read calibration from ECU?", default=False):
         return
     
-    handler = uds_handler.UDSHandler(logger)
-    
     click.echo("\nReading calibration via UDS...")
     data = handler.read_calibration_region()
     
@@ -3663,63 +3744,89 @@ def uds_read_calibration():
         
         # Ask to save
         if click.confirm("Save to file?", default=True):
-            output_dir = Path(__file__).parent.parent / "backups"
-            output_dir.mkdir(exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = output_dir / f"cal_read_{timestamp}.bin"
+            BACKUP_DIR.mkdir(exist_ok=True)
+            timestamp = _ts()
+            output_file = BACKUP_DIR / f"cal_read_{timestamp}.bin"
             
-            with open(output_file, 'wb') as f:
-                f.write(data)
+            # Written and fsynced on the I/O pool; waited for before returning
+            # to the menu so a failed write is reported here
+            future = _io_pool.submit(_write_backup, output_file, data)
+            _pending_writes.add(future)
+            future.add_done_callback(_backup_written)
             
-            click.echo(f" Saved to: {output_file}")
+            click.echo(f" Saving to: {output_file}")
+            try:
+                future.result()
+            except OSError as e:
+                click.echo(f"\n Backup write failed: {e}")
+            else:
+                click.echo(" Saved")
     else:
         click.echo("\n Failed to read calibration")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
-def uds_flash_calibration():
+def uds_flash_calibration(handler: uds_handler.UDSHandler):
     """Flash calibration region to ECU."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Flash Calibration Region ===")
-    click.echo("="*60)
-    click.echo("\n  DANGER: Incorrect calibration can damage ECU!")
-    
-    click.echo("\nThis will flash ONLY the calibration region (CAL)")
-    click.echo("Does NOT touch bootloader or firmware\n")
+    click.echo(_UDS_FLASH_BANNER, nl=False)
     
     # Select file
     map_file = click.prompt("Enter calibration file path", type=click.Path(exists=True))
     map_path = Path(map_file)
     
-    if not map_path.exists():
-        click.echo("\n File not found")
-        input("\nPress Enter to continue...")
-        return
-    
-    # Read file
-    with open(map_path, 'rb') as f:
-        data = f.read()
-    
+    size = map_path.stat().st_size
     click.echo(f"\nFile: {map_path.name}")
-    click.echo(f"Size: {len(data)} bytes ({len(data)/1024:.1f} KB)")
+    click.echo(f"Size: {size} bytes ({size/1024:.1f} KB)")
+    
+    if not size:
+        click.echo("\n File is empty")
+        _pause()
+        return
     
     # Confirm
     if not click.confirm("\n  Flash this calibration to ECU?", default=False):
         click.echo("\n Cancelled")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Final confirm
     if not click.confirm("  FINAL CONFIRMATION - This will modify your ECU!", default=False):
         click.echo("\n Cancelled")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
-    handler = uds_handler.UDSHandler(logger)
+    def progress_callback(message: str, percent: int):
+        click.echo(f"[{percent:3d}%] {message}")
+    
+    if not _join_backup_writes():
+        _pause()
+        return
     
     click.echo("\nFlashing calibration via UDS...")
-    success = handler.flash_calibration_region(data, verify=True)
+    # Read into an anonymous mapping: page-aligned (ready for O_DIRECT-style
+    # submission), off the Python heap, and sliced by the flasher without copies
+    mm = mmap.mmap(-1, size)
+    with open(map_path, 'rb') as f:
+        read = f.readinto(mm)
+    if read != len(mm):
+        # The file changed since it was sized; never flash a zero-filled tail
+        mm.close()
+        click.echo(f"\n Read {read} of {size} bytes - file changed while loading, not flashing")
+        _pause()
+        return
+    data = memoryview(mm)
+    try:
+        success = handler.flash_calibration_region(data, verify=True,
+                                                   progress_callback=progress_callback)
+    finally:
+        data.release()
+        try:
+            mm.close()
+        except BufferError:
+            # A propagating traceback still holds block views; the mapping
+            # is released once those frames are collected
+            pass
     
     if success:
         click.echo("\n Calibration flash successful!")
@@ -3728,29 +3835,24 @@ def uds_flash_calibration():
     else:
         click.echo("\n Flash failed - ECU not modified")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
-def uds_reset_ecu():
+# UDS ECU reset sub-functions offered by uds_reset_ecu
+_VALID_RESETS = frozenset({1, 2, 3})
+
+
+def uds_reset_ecu(handler: uds_handler.UDSHandler):
     """Reset ECU using UDS."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Reset ECU ===")
-    click.echo("="*60)
-    
-    click.echo("\nReset Types:")
-    click.echo("1. Hard Reset (0x01) - Full ECU restart")
-    click.echo("2. Key Off/On (0x02) - Simulate key cycle")
-    click.echo("3. Soft Reset (0x03) - Reload calibration")
+    click.echo(_UDS_RESET_BANNER, nl=False)
     
     reset_type = click.prompt("\nSelect reset type", type=int, default=1)
     
-    if reset_type not in [1, 2, 3]:
+    if reset_type not in _VALID_RESETS:
         click.echo("\n Invalid reset type")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
-    handler = uds_handler.UDSHandler(logger)
-    
     click.echo(f"\nResetting ECU (type 0x0{reset_type})...")
     success = handler.reset_ecu(reset_type)
     
@@ -3759,120 +3861,145 @@ def uds_reset_ecu():
     else:
         click.echo("\n Reset failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
-def uds_verify_crcs():
-    """Verify calibration CRCs."""
-    click.echo("\n" + "="*60)
-    click.echo("=== Verify Calibration CRCs ===")
-    click.echo("="*60)
-    
-    click.echo("\n  CRC zone boundaries not yet defined")
-    click.echo("Requires decompilation of CRC functions:")
-    click.echo("  - 0x0186ccb1 (CRC_40304)")
-    click.echo("  - 0x0186ccbd (CRC_40404)\n")
-    
-    click.echo("CRC verification checks that calibration data:")
-    click.echo("  - Was not corrupted during flash")
-    click.echo("  - Matches expected checksums")
-    click.echo("  - Is compatible with ECU firmware")
-    
-    input("\nPress Enter to continue...")
+# The calibration read starts at the CAL base; crc_zones offsets are file
+# offsets in the flash image, which maps ECU address 0x800000 to offset 0
+_CAL_FILE_OFFSET = DirectCANFlasher.SECTOR_CALIBRATION_START - validated_maps.ECU_BASE
+
+
+def _cal_relative_zones(zones: List[Any]) -> Tuple[List[Any], List[Any]]:
+    """Split zones into (CAL-relative copies, zones that start before the CAL base)."""
+    from dataclasses import replace
+    shifted, outside = [], []
+    for zone in zones:
+        if zone.start_offset < _CAL_FILE_OFFSET:
+            outside.append(zone)
+        else:
+            shifted.append(replace(zone, start_offset=zone.start_offset - _CAL_FILE_OFFSET,
+                                   end_offset=zone.end_offset - _CAL_FILE_OFFSET,
+                                   crc_offset=zone.crc_offset - _CAL_FILE_OFFSET))
+    return shifted, outside
+
+
+def uds_verify_crcs(handler: uds_handler.UDSHandler):
+    """Read the calibration region and check each CRC zone against its stored CRC."""
+    from . import crc_zones
+    with interactive_screen("=== Verify Calibration CRCs ==="):
+        click.echo(_UDS_VERIFY_INFO, nl=False)
+        
+        ecu_type = click.prompt("ECU type", type=click.Choice(['MSD80', 'MSD81']), default='MSD80')
+        zones, outside = _cal_relative_zones(crc_zones.get_zones_for_ecu(ecu_type))
+        # Read far enough past the CAL base to cover every zone that starts there
+        size = max(z.end_offset for z in zones if z.crc_type == "CRC16")
+        
+        if not click.confirm(f"Read {size} bytes of calibration from ECU and check CRCs?", default=False):
+            return
+        
+        click.echo("\nReading calibration via UDS...")
+        data = handler.read_calibration_region(start_addr=DirectCANFlasher.SECTOR_CALIBRATION_START, size=size)
+        if not data:
+            click.echo("\n Failed to read calibration")
+            return
+        
+        lines = [f"\nRead {len(data)} bytes from 0x{DirectCANFlasher.SECTOR_CALIBRATION_START:06X} "
+                 f"({ecu_type} zone layout)", "-" * 60]
+        bad = 0
+        for zone in zones:
+            label = f"{zone.name:16} 0x{zone.start_offset + _CAL_FILE_OFFSET:06X}-0x{zone.end_offset + _CAL_FILE_OFFSET:06X}"
+            if zone.end_offset > len(data):
+                lines.append(f"{label}  not checked (outside the region read)")
+                continue
+            width = 2 if zone.crc_type == "CRC16" else 4
+            calculated = crc_zones.calculate_zone_crc(data, zone)
+            stored = int.from_bytes(data[zone.crc_offset:zone.crc_offset + width], 'little')
+            ok = calculated == stored
+            bad += not ok
+            lines.append(f"{label}  {zone.crc_type} calc 0x{calculated:0{width * 2}X} "
+                         f"stored 0x{stored:0{width * 2}X}  {'OK' if ok else 'MISMATCH'}")
+        lines += [f"{z.name:16} not checked (starts before the CAL base)" for z in outside]
+        click.echo("\n".join(lines))
+        
+        if bad:
+            click.echo(f"\n {bad} zone(s) do not match their stored CRC")
+        else:
+            click.echo("\n All checked zones match their stored CRC")
 
 
 def uds_protocol_info():
     """Display UDS protocol information."""
-    click.echo("\n" + "="*60)
-    click.echo("=== UDS Protocol Information ===")
-    click.echo("="*60)
+    transport = ("CAN-FD (--can-fd), classic CAN if the adapter can't open in FD" if DirectCANFlasher.CAN_FD
+                 else "classic CAN (start with --can-fd for CAN-FD)")
+    click.echo(_UDS_PROTOCOL_INFO.format(transport=transport), nl=False)
     
-    click.echo("\nUnified Diagnostic Services (ISO 14229)")
-    click.echo("\nKey Services:")
-    click.echo("  0x10 - Diagnostic Session Control")
-    click.echo("  0x11 - ECU Reset")
-    click.echo("  0x22 - Read Data By Identifier")
-    click.echo("  0x27 - Security Access (Seed/Key)")
-    click.echo("  0x2E - Write Data By Identifier")
-    click.echo("  0x31 - Routine Control")
-    click.echo("  0x34 - Request Download")
-    click.echo("  0x36 - Transfer Data")
-    click.echo("  0x37 - Request Transfer Exit\n")
-    
-    click.echo("Implementation:")
-    click.echo("  - Uses UDS over CAN (ISO-TP)")
-    click.echo("  - PT_CAN2 bus (Powertrain CAN)")
-    click.echo("  - Partial flash (CAL region only)")
-    click.echo("  - Standard CRC32 checksums")
-    click.echo("  - BMW-specific seed/key algorithm\n")
-    
-    click.echo("Reference: mevd17_uds_base")
-    
-    input("\nPress Enter to continue...")
+    _pause()
+
+
+# uds_operations_menu option -> screen
+_UDS_MENU: Dict[int, Callable[[uds_handler.UDSHandler], None]] = {
+    1: uds_enter_programming_session,
+    2: uds_read_vin,
+    3: lambda handler: uds_security_access(),
+    4: uds_read_calibration,
+    5: uds_flash_calibration,
+    6: uds_reset_ecu,
+    7: uds_verify_crcs,
+    8: lambda handler: uds_protocol_info(),
+}
 
 
 # ============================================================================
 # Map Options Menu (Tuning Configuration)
 # ============================================================================
 
+# Static parts of the map options screen, built once at import
+_MAP_OPTIONS_HEADER = (
+    f"\n{'=' * 60}\n=== Map Options & Tuning ===\n{'=' * 60}\n"
+    "\nConfigure options to apply BEFORE flashing\n\n"
+)
+_MAP_OPTIONS_MENU = "\n".join([
+    "",
+    "1. Configure Burbles/Pops & Crackles",
+    "2. Configure VMAX (Speed Limiter)",
+    "3. Configure DTC/CEL Disable",
+    "4. Configure Launch Control",
+    "5. Configure Rev Limiter",
+    "6. Configure Boost Limits",
+    "7. Load Preset Configuration",
+    "8. View All Settings",
+    "9. Validate Configuration",
+    "10. Apply to Map File",
+    "11. Tune & Flash (Apply → Flash to ECU) ",
+    "0. Back to Main Menu",
+])
+
+
 def map_options_menu():
     """Map Options submenu - Configure tuning options before flash."""
     current_options = map_options.MapOptions()
+    # Active Options block, rebuilt only after a choice that can edit the options
+    active: Optional[str] = None
     
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== Map Options & Tuning ===")
-        click.echo("="*60)
-        click.echo("\nConfigure options to apply BEFORE flashing\n")
-        
-        # Show enabled options
-        enabled = current_options.get_enabled_options()
-        if enabled:
-            click.echo("Active Options:")
-            for opt in enabled:
-                click.echo(f"   {opt}")
-        else:
-            click.echo("Active Options: None (stock)")
-        
-        click.echo("\n1. Configure Burbles/Pops & Crackles")
-        click.echo("2. Configure VMAX (Speed Limiter)")
-        click.echo("3. Configure DTC/CEL Disable")
-        click.echo("4. Configure Launch Control")
-        click.echo("5. Configure Rev Limiter")
-        click.echo("6. Configure Boost Limits")
-        click.echo("7. Load Preset Configuration")
-        click.echo("8. View All Settings")
-        click.echo("9. Validate Configuration")
-        click.echo("10. Apply to Map File")
-        click.echo("11. Tune & Flash (Apply → Flash to ECU) ")
-        click.echo("0. Back to Main Menu")
+        if active is None:
+            enabled = current_options.get_enabled_options()
+            if enabled:
+                active = "Active Options:\n" + "\n".join(f"   {opt}" for opt in enabled)
+            else:
+                active = "Active Options: None (stock)"
+        click.echo(_MAP_OPTIONS_HEADER + active + "\n" + _MAP_OPTIONS_MENU)
         
         choice = click.prompt("\nSelect option", type=int, default=0)
+        if 1 <= choice <= 7:
+            # Configure screens and presets edit current_options in place
+            active = None
         
         if choice == 0:
             break
-        elif choice == 1:
-            configure_burbles(current_options)
-        elif choice == 2:
-            configure_vmax(current_options)
-        elif choice == 3:
-            configure_dtc(current_options)
-        elif choice == 4:
-            configure_launch_control(current_options)
-        elif choice == 5:
-            configure_rev_limiter(current_options)
-        elif choice == 6:
-            configure_boost(current_options)
-        elif choice == 7:
-            load_preset_options(current_options)
-        elif choice == 8:
-            view_all_options(current_options)
-        elif choice == 9:
-            validate_options(current_options)
-        elif choice == 10:
-            apply_options_to_map(current_options)
-        elif choice == 11:
-            tune_and_flash(current_options)
+        action = _MAP_OPTIONS_MENU_ACTIONS.get(choice)
+        if action:
+            action(current_options)
         else:
             click.echo("Invalid selection.")
 
@@ -3898,7 +4025,7 @@ def configure_burbles(options: map_options.MapOptions):
             options.burbles.lambda_target = click.prompt("Lambda target", type=float, default=options.burbles.lambda_target)
     
     click.echo("\n Burbles configuration updated")
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def configure_vmax(options: map_options.MapOptions):
@@ -3912,7 +4039,7 @@ def configure_vmax(options: map_options.MapOptions):
         options.vmax.limit_kmh = click.prompt("Speed limit (km/h)", type=int, default=options.vmax.limit_kmh)
     
     click.echo("\n VMAX configuration updated")
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def configure_dtc(options: map_options.MapOptions):
@@ -3931,7 +4058,7 @@ def configure_dtc(options: map_options.MapOptions):
                                                    default=options.dtc.disable_knock_cel)
     
     click.echo("\n DTC configuration updated")
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def configure_launch_control(options: map_options.MapOptions):
@@ -3954,7 +4081,7 @@ def configure_launch_control(options: map_options.MapOptions):
                                                                 default=options.launch_control.rpm_threshold)
     
     click.echo("\n Launch control configuration updated")
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def configure_rev_limiter(options: map_options.MapOptions):
@@ -3974,7 +4101,7 @@ def configure_rev_limiter(options: map_options.MapOptions):
                                                       default=options.rev_limiter.soft_limit)
     
     click.echo("\n Rev limiter configuration updated")
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def configure_boost(options: map_options.MapOptions):
@@ -3995,7 +4122,7 @@ def configure_boost(options: map_options.MapOptions):
                                                    default=options.boost.max_boost_bar)
     
     click.echo("\n Boost configuration updated")
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def load_preset_options(options: map_options.MapOptions):
@@ -4026,63 +4153,87 @@ def load_preset_options(options: map_options.MapOptions):
     else:
         click.echo("\n Invalid selection")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def view_all_options(options: map_options.MapOptions):
     """View all current option settings."""
-    click.echo("\n=== All Map Options ===\n")
-    # Print explicitly from dataclass fields to avoid Unknown-typed dicts
-    click.echo("\nBURBLES:")
-    click.echo(f"  enabled: {options.burbles.enabled}")
-    click.echo(f"  mode: {options.burbles.mode.value}")
-    click.echo(f"  min_rpm: {options.burbles.min_rpm}")
-    click.echo(f"  max_rpm: {options.burbles.max_rpm}")
-    click.echo(f"  min_ect: {options.burbles.min_ect}")
-    click.echo(f"  lambda_target: {options.burbles.lambda_target}")
-
-    click.echo("\nVMAX:")
-    click.echo(f"  enabled: {options.vmax.enabled}")
-    click.echo(f"  limit_kmh: {options.vmax.limit_kmh}")
-
-    click.echo("\nDTC:")
-    click.echo(f"  disable_cat_codes: {options.dtc.disable_cat_codes}")
-    click.echo(f"  disable_o2_codes: {options.dtc.disable_o2_codes}")
-    click.echo(f"  disable_evap_codes: {options.dtc.disable_evap_codes}")
-    click.echo(f"  disable_knock_cel: {options.dtc.disable_knock_cel}")
-    click.echo(f"  custom_codes: {', '.join(options.dtc.custom_codes) if options.dtc.custom_codes else '[]'}")
-
-    click.echo("\nLAUNCH CONTROL:")
-    click.echo(f"  enabled: {options.launch_control.enabled}")
-    click.echo(f"  timing_retard: {options.launch_control.timing_retard}")
-    click.echo(f"  boost_target: {options.launch_control.boost_target}")
-    click.echo(f"  rpm_threshold: {options.launch_control.rpm_threshold}")
-
-    click.echo("\nREV LIMITER:")
-    click.echo(f"  enabled: {options.rev_limiter.enabled}")
-    click.echo(f"  soft_limit: {options.rev_limiter.soft_limit}")
-    click.echo(f"  hard_limit: {options.rev_limiter.hard_limit}")
-    click.echo(f"  per_gear_limits: {options.rev_limiter.per_gear_limits}")
-
-    click.echo("\nBOOST:")
-    click.echo(f"  enabled: {options.boost.enabled}")
-    click.echo(f"  max_boost_bar: {options.boost.max_boost_bar}")
-    click.echo(f"  per_gear_limits: {options.boost.per_gear_limits}")
-    click.echo(f"  overboost_duration: {options.boost.overboost_duration}")
-
-    click.echo("\nMETADATA:")
-    click.echo(f"  transmission: {options.transmission.value}")
-    click.echo(f"  octane: {options.octane}")
-    click.echo(f"  ethanol_content: {options.ethanol_content}")
-    
-    input("\nPress Enter to continue...")
+    # Print explicitly from dataclass fields to avoid Unknown-typed dicts;
+    # the whole screen is formatted once and written with a single echo
+    burbles, vmax, dtc = options.burbles, options.vmax, options.dtc
+    launch, rev, boost = options.launch_control, options.rev_limiter, options.boost
+    custom_codes = ', '.join(dtc.custom_codes) if dtc.custom_codes else '[]'
+    click.echo(f"""
+=== All Map Options ===
+
+
+BURBLES:
+  enabled: {burbles.enabled}
+  mode: {burbles.mode.value}
+  min_rpm: {burbles.min_rpm}
+  max_rpm: {burbles.max_rpm}
+  min_ect: {burbles.min_ect}
+  lambda_target: {burbles.lambda_target}
+
+VMAX:
+  enabled: {vmax.enabled}
+  limit_kmh: {vmax.limit_kmh}
+
+DTC:
+  disable_cat_codes: {dtc.disable_cat_codes}
+  disable_o2_codes: {dtc.disable_o2_codes}
+  disable_evap_codes: {dtc.disable_evap_codes}
+  disable_knock_cel: {dtc.disable_knock_cel}
+  custom_codes: {custom_codes}
+
+LAUNCH CONTROL:
+  enabled: {launch.enabled}
+  timing_retard: {launch.timing_retard}
+  boost_target: {launch.boost_target}
+  rpm_threshold: {launch.rpm_threshold}
+
+REV LIMITER:
+  enabled: {rev.enabled}
+  soft_limit: {rev.soft_limit}
+  hard_limit: {rev.hard_limit}
+  per_gear_limits: {rev.per_gear_limits}
+
+BOOST:
+  enabled: {boost.enabled}
+  max_boost_bar: {boost.max_boost_bar}
+  per_gear_limits: {boost.per_gear_limits}
+  overboost_duration: {boost.overboost_duration}
+
+METADATA:
+  transmission: {options.transmission.value}
+  octane: {options.octane}
+  ethanol_content: {options.ethanol_content}""")
+    
+    _pause()
+
+
+# validate() results keyed by the options' serialised settings; a configure_*
+# edit changes the key, so stale results are never returned
+_validation_memo: Dict[str, Tuple[bool, Tuple[str, ...]]] = {}
+
+
+def _validate_cached(options: map_options.MapOptions) -> Tuple[bool, List[str]]:
+    """Return options.validate(), reusing the result for an unchanged configuration."""
+    key = json.dumps(options.to_dict(), sort_keys=True)
+    cached = _validation_memo.get(key)
+    if cached is None:
+        is_valid, errors = options.validate()
+        if len(_validation_memo) >= 16:
+            _validation_memo.clear()
+        cached = _validation_memo[key] = (is_valid, tuple(errors))
+    return cached[0], list(cached[1])
 
 
 def validate_options(options: map_options.MapOptions):
     """Validate current options configuration."""
     click.echo("\n=== Validate Configuration ===\n")
     
-    is_valid, errors = options.validate()
+    is_valid, errors = _validate_cached(options)
     
     if is_valid:
         click.echo(" Configuration is valid")
@@ -4092,7 +4243,113 @@ def validate_options(options: map_options.MapOptions):
         for error in errors:
             click.echo(f"  - {error}")
     
-    input("\nPress Enter to continue...")
+    _pause()
+
+
+# .bin index per backups directory: kept in memory and on disk, reused while
+# every indexed directory and .bin keeps its mtime (and each .bin its size);
+# X535_REFRESH_CACHE forces a rescan
+_BACKUP_INDEX_FILE = Path.home() / ".cache" / "535xi" / "backup_index.json"
+_backup_index_memo: Dict[str, Dict[str, Any]] = {}
+
+
+def _scan_backups(backup_dir: Path) -> Dict[str, Any]:
+    """Walk backup_dir with os.scandir, recording directory mtimes and .bin sizes and mtimes."""
+    dirs: Dict[str, int] = {}
+    files: List[Tuple[str, int, int]] = []
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        path = os.path.join(backup_dir, rel)
+        dirs[rel] = os.stat(path).st_mtime_ns
+        with os.scandir(path) as it:
+            for entry in it:
+                # Symlinked directories are not followed, so a link loop can't recurse forever
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(os.path.join(rel, entry.name))
+                elif os.path.normcase(entry.name).endswith(".bin"):
+                    st = entry.stat()
+                    files.append((os.path.join(rel, entry.name), st.st_size, st.st_mtime_ns))
+    files.sort()
+    return {"dirs": dirs, "files": files}
+
+
+def _index_fresh(backup_dir: Path, index: Dict[str, Any]) -> bool:
+    """True if no indexed directory changed and no indexed .bin was rewritten."""
+    try:
+        if not all(os.stat(os.path.join(backup_dir, rel)).st_mtime_ns == mtime
+                   for rel, mtime in index["dirs"].items()):
+            return False
+        for rel, size, mtime in index["files"]:
+            st = os.stat(os.path.join(backup_dir, rel))
+            if st.st_size != size or st.st_mtime_ns != mtime:
+                return False
+        return True
+    except (OSError, ValueError):
+        # ValueError: an index written before file mtimes were recorded
+        return False
+
+
+def _backup_index(backup_dir: Path) -> List[Tuple[Path, int]]:
+    """Return (path, size) for every .bin under backup_dir, scanning only when it changed."""
+    key = str(backup_dir.resolve())
+    refresh = bool(os.environ.get("X535_REFRESH_CACHE"))
+    index = None if refresh else _backup_index_memo.get(key)
+    if index is None and not refresh:
+        try:
+            index = json.loads(_BACKUP_INDEX_FILE.read_text(encoding="utf-8")).get(key)
+        except (OSError, ValueError):
+            index = None
+    if index is None or not _index_fresh(backup_dir, index):
+        index = _scan_backups(backup_dir)
+        try:
+            try:
+                stored = json.loads(_BACKUP_INDEX_FILE.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                stored = {}
+            stored[key] = index
+            _BACKUP_INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+            _BACKUP_INDEX_FILE.write_text(json.dumps(stored), encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"Could not write backup index cache: {e}")
+    _backup_index_memo[key] = index
+    return [(backup_dir / rel, size) for rel, size, _ in index["files"]]
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_detect(path_str: str, mtime_ns: int, size: int) -> Dict:
+    """detect_software_from_bin keyed on the file's mtime and size as well as its path."""
+    from . import software_detector
+    return software_detector.detect_software_from_bin(path_str)
+
+
+def _detect_software(bin_path: Path) -> Dict:
+    """Detect the software in bin_path, reusing the result while the file is unchanged."""
+    try:
+        st = bin_path.stat()
+    except OSError:
+        from . import software_detector
+        return software_detector.detect_software_from_bin(str(bin_path))
+    return dict(_cached_detect(str(bin_path), st.st_mtime_ns, st.st_size))
+
+
+@contextmanager
+def _load_bin(path: Path):
+    """Map a .bin read-only so the OS pages it in lazily; unmapped when the block exits.
+
+    Callers that patch take a bytearray copy of the result. Empty files
+    cannot be mapped and come back as b"".
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            mm = None
+    if mm is None:
+        yield b""
+        return
+    with mm:
+        yield mm
 
 
 def apply_options_to_map(options: map_options.MapOptions):
@@ -4106,13 +4363,13 @@ def apply_options_to_map(options: map_options.MapOptions):
     click.echo("  1. An existing backup .bin file")
     click.echo("  2. Any other .bin file\n")
     
-    # Validate options first
-    is_valid, errors = options.validate()
+    # Validate options first (free if "Validate Configuration" already ran)
+    is_valid, errors = _validate_cached(options)
     if not is_valid:
         click.echo(" Configuration has errors:")
         for error in errors:
             click.echo(f"  - {error}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Select bin file
@@ -4127,153 +4384,138 @@ def apply_options_to_map(options: map_options.MapOptions):
         backup_dir = Path("backups")
         if not backup_dir.exists():
             click.echo(" No backups directory found")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
-        bin_files: List[Path] = list(backup_dir.rglob("*.bin"))
+        bin_files = _backup_index(backup_dir)
         if not bin_files:
             click.echo(" No .bin files found in backups/")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         click.echo("\nAvailable backup files:")
-        for i, f in enumerate(bin_files, 1):
-            size_mb = f.stat().st_size / (1024*1024)
-            click.echo(f"{i}. {f.relative_to(backup_dir)} ({size_mb:.2f} MB)")
+        for i, (f, size) in enumerate(bin_files, 1):
+            click.echo(f"{i}. {f.relative_to(backup_dir)} ({size / _MB:.2f} MB)")
         
         file_choice = click.prompt("Select file", type=int)
         if file_choice < 1 or file_choice > len(bin_files):
             click.echo(" Invalid selection")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
-        bin_path: Path = cast(Path, bin_files[file_choice - 1])
+        bin_path: Path = bin_files[file_choice - 1][0]
     else:
         # Custom path
         bin_file = click.prompt("Enter .bin file path", type=click.Path(exists=True))
         bin_path = Path(bin_file)
-        
-        if not bin_path.exists():
-            click.echo(" File not found")
-            input("\nPress Enter to continue...")
-            return
-    
-    # Read bin file
-    with open(bin_path, 'rb') as f:
-        bin_data = bytearray(f.read())
     
-    click.echo(f"\nSelected: {bin_path.name}")
-    click.echo(f"Size: {len(bin_data):,} bytes ({len(bin_data)/(1024*1024):.2f} MB)")
+    # Map the source read-only; the patchable copy is only made once the
+    # patch set is built
+    with _load_bin(bin_path) as source:
+        click.echo(f"\nSelected: {bin_path.name}")
+        click.echo(f"Size: {len(source):,} bytes ({len(source) / _MB:.2f} MB)")
     
-    # Detect software from bin using consolidated detection
-    detection = software_detector.detect_software_from_bin(str(bin_path))
+        # Detect software from bin using consolidated detection
+        detection = _detect_software(bin_path)
     
-    if not detection['is_valid']:
-        click.echo(f"  ERROR: {detection['error']}")
-        if not click.confirm("Continue anyway?", default=False):
-            return
-    else:
-        click.echo(f"  Detected: {detection['ecu_type']} (Software: {detection['software_version'] or 'Unknown'})")
+        if not detection['is_valid']:
+            click.echo(f"  ERROR: {detection['error']}")
+            if not click.confirm("Continue anyway?", default=False):
+                return
+        else:
+            click.echo(f"  Detected: {detection['ecu_type']} (Software: {detection['software_version'] or 'Unknown'})")
     
-    # Show what will be applied / decide workflow
-    enabled = options.get_enabled_options()
-    if enabled:
-        click.echo("\nWill apply:")
-        for opt in enabled:
-            click.echo(f"   {opt}")
-        if not click.confirm("\nApply these options?", default=False):
-            click.echo(" Cancelled")
-            input("\nPress Enter to continue...")
-            return
-
-        # Build tuning patch set from MapOptions
-        restoring = False
-        patcher = map_patcher.MapPatcher(ecu_type="MSD80")
-        click.echo("\nBuilding patches from configured options...")
-        try:
-            patch_set = patcher.create_patchset_from_map_options(
-                options,
-                name="Tuning Options",
-                description="Applied from Map Options menu",
-            )
-        except Exception as e:
-            click.echo(f"\n Failed to build patch set from options: {e}")
-            logger.exception("Failed to build patch set from MapOptions")
-            input("\nPress Enter to continue...")
-            return
-
-        if len(patch_set) == 0:
-            click.echo("\n No patches were generated from the current configuration.")
-            input("\nPress Enter to continue...")
-            return
-    else:
-        # No options enabled – offer restore-to-stock workflow
-        click.echo("\nNo tuning options are enabled.")
-        click.echo("You can restore previously changed settings to STOCK using a reference backup.")
-        if not click.confirm("Proceed with restore-to-stock using a stock reference .bin?", default=True):
-            click.echo(" Cancelled")
-            input("\nPress Enter to continue...")
-            return
-        # Select reference stock file
-        click.echo("\nSelect stock reference .bin:")
-        click.echo("  1. Browse backups/ directory")
-        click.echo("  2. Specify custom path")
-        ref_choice = click.prompt("Select", type=int, default=1)
-        if ref_choice == 1:
-            ref_dir = Path("backups")
-            if not ref_dir.exists():
-                click.echo(" No backups directory found")
-                input("\nPress Enter to continue...")
+        # Show what will be applied / decide workflow
+        enabled = options.get_enabled_options()
+        if enabled:
+            click.echo("\nWill apply:")
+            for opt in enabled:
+                click.echo(f"   {opt}")
+            if not click.confirm("\nApply these options?", default=False):
+                click.echo(" Cancelled")
+                _pause()
                 return
-            ref_bins: List[Path] = list(ref_dir.rglob("*.bin"))
-            if not ref_bins:
-                click.echo(" No .bin files found in backups/")
-                input("\nPress Enter to continue...")
+
+            # Build tuning patch set from MapOptions
+            restoring = False
+            patcher = map_patcher.MapPatcher(ecu_type="MSD80")
+            click.echo("\nBuilding patches from configured options...")
+            try:
+                patch_set = patcher.create_patchset_from_map_options(
+                    options,
+                    name="Tuning Options",
+                    description="Applied from Map Options menu",
+                )
+            except Exception as e:
+                click.echo(f"\n Failed to build patch set from options: {e}")
+                logger.exception("Failed to build patch set from MapOptions")
+                _pause()
                 return
-            click.echo("\nAvailable backup files for reference:")
-            for i, f in enumerate(ref_bins, 1):
-                size_mb = f.stat().st_size / (1024*1024)
-                click.echo(f"{i}. {f.relative_to(ref_dir)} ({size_mb:.2f} MB)")
-            ref_index = click.prompt("Select reference", type=int)
-            if ref_index < 1 or ref_index > len(ref_bins):
-                click.echo(" Invalid selection")
-                input("\nPress Enter to continue...")
+
+            if len(patch_set) == 0:
+                click.echo("\n No patches were generated from the current configuration.")
+                _pause()
                 return
-            ref_path: Path = cast(Path, ref_bins[ref_index - 1])
         else:
-            ref_input = click.prompt("Enter reference .bin path", type=click.Path(exists=True))
-            ref_path = Path(ref_input)
-            if not ref_path.exists():
-                click.echo(" File not found")
-                input("\nPress Enter to continue...")
-                return
-        # Read reference data
-        with open(ref_path, 'rb') as rf:
-            ref_data = rf.read()
-        if len(ref_data) != len(bin_data):
-            click.echo(f"  Reference size mismatch: source {len(bin_data):,} vs ref {len(ref_data):,}")
-            if not click.confirm("Continue anyway?", default=False):
+            # No options enabled – offer restore-to-stock workflow
+            click.echo("\nNo tuning options are enabled.")
+            click.echo("You can restore previously changed settings to STOCK using a reference backup.")
+            if not click.confirm("Proceed with restore-to-stock using a stock reference .bin?", default=True):
+                click.echo(" Cancelled")
+                _pause()
                 return
-        # Build restore patch set
-        patcher = map_patcher.MapPatcher(ecu_type="MSD80")
-        patch_set = patcher.create_restore_to_stock_patchset(ref_data)
-        click.echo(f"\nRestoring {len(patch_set)} calibration regions to stock values...")
-        restoring = True
+            # Select reference stock file
+            click.echo("\nSelect stock reference .bin:")
+            click.echo("  1. Browse backups/ directory")
+            click.echo("  2. Specify custom path")
+            ref_choice = click.prompt("Select", type=int, default=1)
+            if ref_choice == 1:
+                ref_dir = Path("backups")
+                if not ref_dir.exists():
+                    click.echo(" No backups directory found")
+                    _pause()
+                    return
+                ref_bins = _backup_index(ref_dir)
+                if not ref_bins:
+                    click.echo(" No .bin files found in backups/")
+                    _pause()
+                    return
+                click.echo("\nAvailable backup files for reference:")
+                for i, (f, size) in enumerate(ref_bins, 1):
+                    click.echo(f"{i}. {f.relative_to(ref_dir)} ({size / _MB:.2f} MB)")
+                ref_index = click.prompt("Select reference", type=int)
+                if ref_index < 1 or ref_index > len(ref_bins):
+                    click.echo(" Invalid selection")
+                    _pause()
+                    return
+                ref_path: Path = ref_bins[ref_index - 1][0]
+            else:
+                ref_input = click.prompt("Enter reference .bin path", type=click.Path(exists=True))
+                ref_path = Path(ref_input)
+            # Map the reference; restore patches copy their slices out of it
+            with _load_bin(ref_path) as ref_data:
+                if len(ref_data) != len(source):
+                    click.echo(f"  Reference size mismatch: source {len(source):,} vs ref {len(ref_data):,}")
+                    if not click.confirm("Continue anyway?", default=False):
+                        return
+                # Build restore patch set
+                patcher = map_patcher.MapPatcher(ecu_type="MSD80")
+                patch_set = patcher.create_restore_to_stock_patchset(ref_data)
+            click.echo(f"\nRestoring {len(patch_set)} calibration regions to stock values...")
+            restoring = True
 
-    # Apply patches
+        # Apply patches to a private copy of the source
+        bin_data = bytearray(source)
     click.echo(f"\nApplying {len(patch_set)} patches...")
     
-    def progress(msg: str, pct: int) -> None:
-        click.echo(f"[{pct:3d}%] {msg}")
-    
     try:
-        result = patcher.apply_patch_set(bin_data, patch_set, progress_callback=progress)
+        result = patcher.apply_patch_set(bin_data, patch_set, progress_callback=_RateLimitedProgress())
         
         if not result['success']:
             click.echo("\n Patch application failed:")
             for error in result['errors']:
                 click.echo(f"  - {error}")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         click.echo(f"\n Applied {len(result['applied_patches'])}/{result['total_patches']} patches")
@@ -4282,19 +4524,18 @@ def apply_options_to_map(options: map_options.MapOptions):
     except Exception as e:
         click.echo(f"\n Error: {e}")
         logger.exception("Patch application failed")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Save modified bin
     output_dir: Path = bin_path.parent / "modified"
     output_dir.mkdir(exist_ok=True)
     
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _ts()
     suffix = "restored" if restoring else "tuned"
     output_file: Path = output_dir / f"{bin_path.stem}_{suffix}_{timestamp}.bin"
     
-    with open(output_file, 'wb') as f:
-        f.write(bin_data)
+    _write_backup(output_file, bin_data)
     
     click.echo(f"\n Modified .bin saved to:")
     click.echo(f"  {output_file}")
@@ -4307,17 +4548,16 @@ def apply_options_to_map(options: map_options.MapOptions):
     click.echo("  Main Menu → 12. Direct CAN Flash → 2. Flash Calibration")
     click.echo("  (Select the modified .bin file when prompted)")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def tune_and_flash(preset):
     """
     Tune & Flash workflow: Apply a TuningPreset to a backup .bin, then flash to ECU.
     """
+    from . import map_flasher
     from . import map_patcher
-    click.echo("\n" + "="*70)
-    click.echo("=== Tune & Flash (Preset → Tuned .bin → ECU) ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Tune & Flash (Preset → Tuned .bin → ECU) ===\n{_H70}")
     click.echo("\n This workflow will:")
     click.echo("  1. Apply preset patches to a .bin file")
     click.echo("  2. Recalculate BMW CRCs")
@@ -4327,7 +4567,7 @@ def tune_and_flash(preset):
     click.echo("    Ensure stable 12V+ power and do NOT disconnect during flash.")
     if not click.confirm("\nProceed with Tune & Flash?", default=False):
         click.echo("Cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     # 1. Select source .bin file
     click.echo("\n" + "-"*50)
@@ -4340,47 +4580,38 @@ def tune_and_flash(preset):
         backup_dir = Path("backups")
         if not backup_dir.exists():
             click.echo(" No backups directory found")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
-        bin_files: List[Path] = list(backup_dir.rglob("*.bin"))
+        bin_files = _backup_index(backup_dir)
         if not bin_files:
             click.echo(" No .bin files found in backups/")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         click.echo("\nAvailable backup files:")
-        for i, f in enumerate(bin_files, 1):
-            try:
-                size_mb = f.stat().st_size / (1024*1024)
-            except Exception:
-                size_mb = 0.0
-            click.echo(f"{i}. {f.relative_to(backup_dir)} ({size_mb:.2f} MB)")
+        for i, (f, size) in enumerate(bin_files, 1):
+            click.echo(f"{i}. {f.relative_to(backup_dir)} ({size / _MB:.2f} MB)")
         
         file_choice = click.prompt("Select file", type=int)
         if file_choice < 1 or file_choice > len(bin_files):
             click.echo(" Invalid selection")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
-        bin_path: Path = cast(Path, bin_files[file_choice - 1])
+        bin_path: Path = bin_files[file_choice - 1][0]
     else:
         bin_file = click.prompt("Enter .bin file path", type=click.Path(exists=True))
         bin_path = Path(bin_file)
-        if not bin_path.exists():
-            click.echo(" File not found")
-            input("\nPress Enter to continue...")
-            return
     
-    # Read bin file
-    with open(bin_path, 'rb') as f:
-        bin_data = bytearray(f.read())
+    # apply_patches_to_file reads the file itself; only the size is needed here
+    bin_size = bin_path.stat().st_size
     
     click.echo(f"\nSelected: {bin_path.name}")
-    click.echo(f"Size: {len(bin_data):,} bytes ({len(bin_data)/(1024*1024):.2f} MB)")
+    click.echo(f"Size: {bin_size:,} bytes ({bin_size / _MB:.2f} MB)")
     
     # Detect software from bin using consolidated detection
-    detection = software_detector.detect_software_from_bin(str(bin_path))
+    detection = _detect_software(bin_path)
     
     if not detection['is_valid']:
         click.echo(f"  ERROR: {detection['error']}")
@@ -4403,25 +4634,22 @@ def tune_and_flash(preset):
     except Exception as e:
         click.echo(f"\n Failed to build patch set: {e}")
         logger.exception("Failed to build patch set from MapOptions")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     if len(patch_set) == 0 and not options.boost.enabled:
         click.echo("\n No patches were generated from the current configuration.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Apply patches (including boost via apply_patches_to_file which calls apply_boost_from_patchset)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _ts()
     output_dir: Path = bin_path.parent / "tuned"
     output_dir.mkdir(exist_ok=True)
     output_file: Path = output_dir / f"{bin_path.stem}_tuneflash_{timestamp}.bin"
     
     click.echo(f"\nApplying patches and recalculating CRCs...")
     
-    def progress(msg: str, pct: int) -> None:
-        click.echo(f"  [{pct:3d}%] {msg}")
-    
     try:
         result = map_patcher.apply_patches_to_file(
             bin_path,
@@ -4434,7 +4662,7 @@ def tune_and_flash(preset):
             click.echo("\n Patch application failed:")
             for error in result.get('errors', []):
                 click.echo(f"  - {error}")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         applied_count = len(result.get('applied_patches', []))
@@ -4456,7 +4684,7 @@ def tune_and_flash(preset):
     except Exception as e:
         click.echo(f"\n Error during patch application: {e}")
         logger.exception("Patch application failed in Tune & Flash")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # 4. Pre-flash safety checks
@@ -4471,7 +4699,7 @@ def tune_and_flash(preset):
         if not flasher.connect():
             click.echo("\n Cannot connect to ECU for pre-flash checks")
             click.echo("  Ensure K+DCAN cable is connected and ignition is ON")
-            input("\nPress Enter to continue...")
+            _pause()
             return
         
         vin = flasher.read_vin()
@@ -4480,7 +4708,7 @@ def tune_and_flash(preset):
             vin = click.prompt("Enter VIN manually (17 chars)", type=str)
             if len(vin) != 17:
                 click.echo(" Invalid VIN length")
-                input("\nPress Enter to continue...")
+                _pause()
                 return
         else:
             click.echo(f" VIN from ECU: {vin}")
@@ -4494,7 +4722,7 @@ def tune_and_flash(preset):
                 flasher.disconnect()
             except Exception:
                 pass
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Run comprehensive pre-flash checks
@@ -4551,36 +4779,38 @@ def tune_and_flash(preset):
         
         if not click.confirm("\n  Override and proceed anyway? (DANGEROUS)", default=False):
             click.echo("Flash cancelled.")
-            input("\nPress Enter to continue...")
+            _pause()
             return
     else:
         click.echo("\n All pre-flash safety checks PASSED")
     
     # 5. Flash confirmation (3-step)
-    click.echo("\n" + "="*70)
-    click.echo("  FLASH CONFIRMATION ")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n  FLASH CONFIRMATION \n{_H70}")
     click.echo(f"\nYou are about to flash: {output_file.name}")
     click.echo(f"To ECU with VIN: {vin}")
     click.echo("\nThis operation CANNOT be undone without a backup!")
     
-    confirm1 = click.prompt("\nType 'YES' to confirm", type=str)
+    confirm1 = _read_confirmation("\nType 'YES' to confirm")
     if confirm1 != 'YES':
         click.echo("Flash cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
-    confirm2 = click.prompt("Type 'FLASH' to proceed", type=str)
+    confirm2 = _read_confirmation("Type 'FLASH' to proceed")
     if confirm2 != 'FLASH':
         click.echo("Flash cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
-    vin_suffix = vin[-7:] if len(vin) >= 7 else vin
-    confirm3 = click.prompt(f"Type last 7 characters of VIN ({vin_suffix})", type=str)
+    vin_suffix = vin[-7:]
+    confirm3 = _read_confirmation(f"Type last 7 characters of VIN ({vin_suffix})")
     if confirm3 != vin_suffix:
         click.echo("VIN confirmation failed. Flash cancelled.")
-        input("\nPress Enter to continue...")
+        _pause()
+        return
+    
+    if not _join_backup_writes():
+        _pause()
         return
     
     # 6. Execute flash
@@ -4588,8 +4818,7 @@ def tune_and_flash(preset):
     click.echo(" FLASHING TO ECU...")
     click.echo("-"*50)
     
-    def flash_progress(msg: str, pct: int) -> None:
-        click.echo(f"  [{pct:3d}%] {msg}")
+    flash_progress = _RateLimitedProgress("  ", min_interval=0.1)
     
     try:
         flash_result = map_flasher.flash_map(
@@ -4600,9 +4829,7 @@ def tune_and_flash(preset):
         )
         
         if flash_result.get('success', False):
-            click.echo("\n" + "="*70)
-            click.echo(" FLASH SUCCESSFUL!")
-            click.echo("="*70)
+            click.echo(f"\n{_H70}\n FLASH SUCCESSFUL!\n{_H70}")
             click.echo(f"\nDuration: {flash_result.get('duration_seconds', 0):.1f} seconds")
             
             verification = flash_result.get('verification', {})
@@ -4618,9 +4845,7 @@ def tune_and_flash(preset):
             click.echo("  4. Start engine and monitor for issues")
             click.echo("  5. Test drive cautiously, monitor AFR and knock")
         else:
-            click.echo("\n" + "="*70)
-            click.echo(" FLASH FAILED")
-            click.echo("="*70)
+            click.echo(f"\n{_H70}\n FLASH FAILED\n{_H70}")
             click.echo(f"\nError: {flash_result.get('error', 'unknown')}")
             click.echo("\n  ECU may still have original calibration.")
             click.echo("    If ECU is unresponsive, restore from backup.")
@@ -4630,30 +4855,83 @@ def tune_and_flash(preset):
         logger.exception("Tune & Flash failed")
         click.echo("\n  CHECK ECU STATUS IMMEDIATELY")
     
-    input("\nPress Enter to continue...")
+    _pause()
+
+
+# map_options_menu option -> screen
+_MAP_OPTIONS_MENU_ACTIONS: Dict[int, Callable[[map_options.MapOptions], None]] = {
+    1: configure_burbles,
+    2: configure_vmax,
+    3: configure_dtc,
+    4: configure_launch_control,
+    5: configure_rev_limiter,
+    6: configure_boost,
+    7: load_preset_options,
+    8: view_all_options,
+    9: validate_options,
+    10: apply_options_to_map,
+    11: tune_and_flash,
+}
+
+
+# validated_maps tables are fixed at import; derive the per-category lists and
+# the menu counts once
+@functools.lru_cache(maxsize=None)
+def _cached_cat(cat: validated_maps.MapCategory) -> Tuple[Any, ...]:
+    """Validated maps in one category."""
+    return tuple(validated_maps.get_maps_by_category(cat))
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_counts() -> Tuple[int, int, int, int]:
+    """(validated, conditional, rejected, forbidden region) counts."""
+    return (len(validated_maps.VALIDATED_MAPS), len(validated_maps.CONDITIONAL_MAPS),
+            len(validated_maps.REJECTED_MAPS), len(validated_maps.FORBIDDEN_REGIONS))
+
+
+_VALIDATED_MAPS_BANNER = (
+    f"\n{_H60}\n=== Validated Maps (MSD80 I8A0S) ===\n{_H60}\n"
+    "\n Maps that passed strict 7-layer validation\n"
+    "🚫 Forbidden regions blocked to prevent ECU bricking\n\n"
+)
+
+_VALIDATED_MAPS_MENU = (
+    "\n1. List All Validated Maps\n"
+    "2. View Map Details\n"
+    "3. Show Rejected Maps (DO NOT USE)\n"
+    "4. Check If Offset Is Safe\n"
+    "5. View Validation Summary\n"
+    "6. Open XDF File Location\n"
+    "0. Back to Main Menu\n"
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _rejected_block() -> str:
+    """The whole show_rejected_maps screen, formatted once."""
+    lines = ["", _H60, " REJECTED MAPS - DO NOT USE ", _H60,
+             "\nThese maps FAILED validation and will BRICK your ECU if modified!\n"]
+    for offset, map_def in validated_maps.REJECTED_MAPS.items():
+        lines.append(f"Offset: 0x{offset:06X}\n  {map_def.description}\n\n  REJECTION REASONS:")
+        lines.extend(f"     {warning}" for warning in map_def.warnings)
+        lines.append("")
+    lines.append("The validation system will BLOCK any write attempts to these offsets.")
+    return "\n".join(lines)
 
 
 def validated_maps_menu():
     """Validated Maps menu - View and use safety-validated map definitions."""
     while True:
-        click.echo("\n" + "="*60)
-        click.echo("=== Validated Maps (MSD80 I8A0S) ===")
-        click.echo("="*60)
-        click.echo("\n Maps that passed strict 7-layer validation")
-        click.echo("🚫 Forbidden regions blocked to prevent ECU bricking\n")
-        
-        click.echo(f"Safe Maps: {len(validated_maps.VALIDATED_MAPS)}")
-        click.echo(f"Conditional Maps: {len(validated_maps.CONDITIONAL_MAPS)}")
-        click.echo(f"Rejected Maps: {len(validated_maps.REJECTED_MAPS)}")
-        click.echo(f"Forbidden Regions: {len(validated_maps.FORBIDDEN_REGIONS)}")
-        
-        click.echo("\n1. List All Validated Maps")
-        click.echo("2. View Map Details")
-        click.echo("3. Show Rejected Maps (DO NOT USE)")
-        click.echo("4. Check If Offset Is Safe")
-        click.echo("5. View Validation Summary")
-        click.echo("6. Open XDF File Location")
-        click.echo("0. Back to Main Menu")
+        safe, conditional, rejected, forbidden = _cached_counts()
+        click.echo(
+            f"{_VALIDATED_MAPS_BANNER}"
+            f"Safe Maps: {safe}\n"
+            f"Conditional Maps: {conditional}\n"
+            f"Rejected Maps: {rejected}\n"
+            f"Forbidden Regions: {forbidden}\n"
+            f"{_VALIDATED_MAPS_MENU}",
+            nl=False,
+        )
         
         choice = click.prompt("\nSelect option", type=int, default=0)
         
@@ -4669,102 +4947,91 @@ def validated_maps_menu():
             check_offset_safety()
         elif choice == 5:
             validated_maps.print_map_summary()
-            input("\nPress Enter to continue...")
+            _pause()
         elif choice == 6:
             open_xdf_location()
         else:
             click.echo("Invalid selection.")
 
 
+# MapDefinition dataclass fields read by the listing, fetched in one C-level call;
+# value_range/scaling are not dataclass fields and keep their getattr defaults
+_MAP_FIELDS = operator.attrgetter("offset", "rows", "cols", "size_bytes", "warnings")
+
+_VALIDATED_MAPS_LIST_HEADER = f"\n{_H60}\nVALIDATED MAPS - SAFE TO MODIFY\n{_H60}"
+
+
 def list_validated_maps():
     """List all validated maps by category."""
-    click.echo("\n" + "="*60)
-    click.echo("VALIDATED MAPS - SAFE TO MODIFY")
-    click.echo("="*60)
+    lines = [_VALIDATED_MAPS_LIST_HEADER]
     
     # Ignition maps
-    ignition_maps = validated_maps.get_maps_by_category(validated_maps.MapCategory.IGNITION)
+    ignition_maps = _cached_cat(validated_maps.MapCategory.IGNITION)
     if ignition_maps:
-        click.echo("\n IGNITION TIMING MAPS (6 total):")
+        lines.append("\n IGNITION TIMING MAPS (6 total):")
         for i, map_def in enumerate(ignition_maps, 1):
-            offset = getattr(map_def, 'offset', 0)
-            rows = getattr(map_def, 'rows', 0)
-            cols = getattr(map_def, 'cols', 0)
-            size_bytes = getattr(map_def, 'size_bytes', 0)
+            offset, rows, cols, size_bytes, warnings = _MAP_FIELDS(map_def)
             value_range = getattr(map_def, 'value_range', (0.0, 0.0))
             scaling = getattr(map_def, 'scaling', 'unknown')
-            warnings = getattr(map_def, 'warnings', [])
 
-            click.echo(f"\n{i}. Offset: 0x{offset:06X}")
-            click.echo(f"   Size: {rows}x{cols} ({size_bytes} bytes)")
-            click.echo(f"   Range: {value_range[0]:.1f}° to {value_range[1]:.1f}°")
-            click.echo(f"   Scaling: {scaling}")
-            if warnings:
-                for warning in warnings:
-                    click.echo(f"     {warning}")
+            lines.append(f"\n{i}. Offset: 0x{offset:06X}")
+            lines.append(f"   Size: {rows}x{cols} ({size_bytes} bytes)")
+            lines.append(f"   Range: {value_range[0]:.1f}° to {value_range[1]:.1f}°")
+            lines.append(f"   Scaling: {scaling}")
+            for warning in warnings:
+                lines.append(f"     {warning}")
     
     # WGDC maps
-    wgdc_maps = validated_maps.get_maps_by_category(validated_maps.MapCategory.WGDC)
+    wgdc_maps = _cached_cat(validated_maps.MapCategory.WGDC)
     if wgdc_maps:
-        click.echo("\n WASTEGATE DUTY CYCLE MAPS (3 total):")
+        lines.append("\n WASTEGATE DUTY CYCLE MAPS (3 total):")
         for i, map_def in enumerate(wgdc_maps, 1):
-            offset = getattr(map_def, 'offset', 0)
-            rows = getattr(map_def, 'rows', 0)
-            cols = getattr(map_def, 'cols', 0)
-            size_bytes = getattr(map_def, 'size_bytes', 0)
+            offset, rows, cols, size_bytes, warnings = _MAP_FIELDS(map_def)
             value_range = getattr(map_def, 'value_range', (0.0, 0.0))
             scaling = getattr(map_def, 'scaling', 'unknown')
-            warnings = getattr(map_def, 'warnings', [])
 
-            click.echo(f"\n{i}. Offset: 0x{offset:06X}")
-            click.echo(f"   Size: {rows}x{cols} ({size_bytes} bytes)")
-            click.echo(f"   Range: {value_range[0]:.1f}% to {value_range[1]:.1f}%")
-            click.echo(f"   Scaling: {scaling}")
-            if warnings:
-                for warning in warnings:
-                    click.echo(f"     {warning}")
+            lines.append(f"\n{i}. Offset: 0x{offset:06X}")
+            lines.append(f"   Size: {rows}x{cols} ({size_bytes} bytes)")
+            lines.append(f"   Range: {value_range[0]:.1f}% to {value_range[1]:.1f}%")
+            lines.append(f"   Scaling: {scaling}")
+            for warning in warnings:
+                lines.append(f"     {warning}")
     
     # Conditional maps
     if validated_maps.CONDITIONAL_MAPS:
-        click.echo("\nCONDITIONAL MAPS (Use With Caution):")
+        lines.append("\nCONDITIONAL MAPS (Use With Caution):")
         for offset, map_def in validated_maps.CONDITIONAL_MAPS.items():
             warnings = getattr(map_def, 'warnings', [])
-            click.echo(f"\n   Offset: 0x{offset:06X}")
+            lines.append(f"\n   Offset: 0x{offset:06X}")
             for warning in warnings:
-                click.echo(f"     {warning}")
+                lines.append(f"     {warning}")
     
-    input("\nPress Enter to continue...")
+    _emit(lines)
+    _pause()
 
 
 def view_map_details():
     """View detailed information about a specific map."""
-    click.echo("\n" + "="*60)
-    click.echo("VIEW MAP DETAILS")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\nVIEW MAP DETAILS\n{_H60}")
     
     offset_str = click.prompt("\nEnter offset (hex, e.g., 0x009940)", type=str)
     
     try:
-        # Parse hex input
-        if offset_str.startswith('0x') or offset_str.startswith('0X'):
-            offset = int(offset_str, 16)
-        else:
-            offset = int(offset_str, 16)
+        offset = _parse_hex(offset_str)
     except ValueError:
         click.echo(f" Invalid hex format: {offset_str}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Get map info
     map_def = validated_maps.get_map_info(offset)
 
-    click.echo(f"\n{'='*60}")
-    click.echo(f"MAP AT OFFSET 0x{offset:06X}")
-    click.echo(f"{'='*60}")
+    lines = [f"\n{'='*60}", f"MAP AT OFFSET 0x{offset:06X}", f"{'='*60}"]
 
     if not map_def:
-        click.echo("\nNo validated map found at that offset.")
-        input("\nPress Enter to continue...")
+        lines.append("\nNo validated map found at that offset.")
+        _emit(lines)
+        _pause()
         return
 
     # Safely extract attributes with defaults
@@ -4788,66 +5055,49 @@ def view_map_details():
     else:
         status_icon = "UNKNOWN"
 
-    click.echo(f"\nStatus: {status_icon}")
-    click.echo(f"Category: {category.value.replace('_', ' ').title()}")
+    lines.append(f"\nStatus: {status_icon}")
+    lines.append(f"Category: {category.value.replace('_', ' ').title()}")
 
     if size_bytes > 0:
-        click.echo(f"\nDimensions: {rows}x{cols} ({size_bytes} bytes)")
-        click.echo(f"Scaling: {scaling}")
-        click.echo(f"Value Range: {value_range[0]:.1f} to {value_range[1]:.1f}")
+        lines.append(f"\nDimensions: {rows}x{cols} ({size_bytes} bytes)")
+        lines.append(f"Scaling: {scaling}")
+        lines.append(f"Value Range: {value_range[0]:.1f} to {value_range[1]:.1f}")
 
-    click.echo(f"\nDescription:")
-    click.echo(f"  {description}")
+    lines.append("\nDescription:")
+    lines.append(f"  {description}")
 
     if warnings:
-        click.echo(f"\n  WARNINGS:")
+        lines.append("\n  WARNINGS:")
         for warning in warnings:
-            click.echo(f"  • {warning}")
+            lines.append(f"  • {warning}")
 
     # Safety check
     is_safe, reason = validated_maps.is_offset_safe(offset, size_bytes)
-    click.echo(f"\nSafety Check: {'SAFE' if is_safe else 'BLOCKED'}")
-    click.echo(f"  {reason}")
+    lines.append(f"\nSafety Check: {'SAFE' if is_safe else 'BLOCKED'}")
+    lines.append(f"  {reason}")
 
-    input("\nPress Enter to continue...")
+    _emit(lines)
+    _pause()
 
 
 def show_rejected_maps():
     """Show maps that were rejected during validation."""
-    click.echo("\n" + "="*60)
-    click.echo(" REJECTED MAPS - DO NOT USE ")
-    click.echo("="*60)
-    click.echo("\nThese maps FAILED validation and will BRICK your ECU if modified!\n")
-    
-    for offset, map_def in validated_maps.REJECTED_MAPS.items():
-        click.echo(f"Offset: 0x{offset:06X}")
-        click.echo(f"  {map_def.description}")
-        click.echo(f"\n  REJECTION REASONS:")
-        for warning in map_def.warnings:
-            click.echo(f"     {warning}")
-        click.echo()
-    
-    click.echo("The validation system will BLOCK any write attempts to these offsets.")
-    input("\nPress Enter to continue...")
+    click.echo(_rejected_block())
+    _pause()
 
 
 def check_offset_safety():
     """Check if a specific offset is safe to write."""
-    click.echo("\n" + "="*60)
-    click.echo("CHECK OFFSET SAFETY")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\nCHECK OFFSET SAFETY\n{_H60}")
     
     offset_str = click.prompt("\nEnter offset to check (hex, e.g., 0x009940)", type=str)
     size = click.prompt("Enter data size (bytes)", type=int, default=72)
     
     try:
-        if offset_str.startswith('0x') or offset_str.startswith('0X'):
-            offset = int(offset_str, 16)
-        else:
-            offset = int(offset_str, 16)
+        offset = _parse_hex(offset_str)
     except ValueError:
         click.echo(f" Invalid hex format: {offset_str}")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Perform safety check
@@ -4866,13 +5116,22 @@ def check_offset_safety():
         for warning in map_def.warnings:
             click.echo(f"   {warning}")
     
-    input("\nPress Enter to continue...")
+    _pause()
+
+
+def _open_detached(args: List[str]) -> None:
+    """Launch a desktop helper (explorer, notepad, xdg-open) without waiting for it."""
+    import subprocess
+    if os.name == 'nt':
+        subprocess.Popen(args, close_fds=True,
+                         creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP)
+    else:
+        subprocess.Popen(args, close_fds=True, start_new_session=True,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
 
 def open_xdf_location():
     """Open the directory containing the validated XDF file."""
-    import os
-    import subprocess
     
     xdf_path = Path(__file__).parent.parent / "maps" / "xdf_definitions" / "I8A0S_Validated_Safe_Maps.xdf"
     
@@ -4884,16 +5143,134 @@ def open_xdf_location():
         if click.confirm("\nOpen containing folder?", default=True):
             # Open file explorer to XDF location
             if os.name == 'nt':  # Windows
-                subprocess.run(['explorer', '/select,', str(xdf_path)])
+                _open_detached(['explorer', '/select,', str(xdf_path)])
             else:
-                subprocess.run(['xdg-open', str(xdf_path.parent)])
+                _open_detached(['xdg-open', str(xdf_path.parent)])
     else:
         click.echo(f"\n XDF file not found at:")
         click.echo(f"   {xdf_path}")
         click.echo("\nGenerate it by running:")
         click.echo("   python scripts/generate_validated_xdf.py")
     
-    input("\nPress Enter to continue...")
+    _pause()
+
+
+_DIRECT_CAN_BANNER = f"\n{_H70}\n=== Direct CAN Flash ( EXPERIMENTAL) ===\n{_H70}\n"
+
+_DIRECT_CAN_UNAVAILABLE = (
+    "\n  ERROR: python-can not installed!\n"
+    "\nInstall dependencies:\n"
+    "  pip install -r requirements.txt\n"
+    "\nOr manually:\n"
+    "  pip install python-can python-can[pcan]\n"
+    "\n0. Back to Main Menu\n"
+)
+
+_DIRECT_CAN_MENU_BODY = (
+    "\nDirect CAN/UDS ECU communication (K+DCAN-only)\n"
+    "Communicates directly with the ECU using ISO-TP/UDS\n"
+    "\nFeatures:\n"
+    "   ISO-TP transport layer (ISO 15765-2)\n"
+    "   UDS services (ISO 14229)\n"
+    "   Read/write calibration via CAN\n"
+    "   BMW CRC validation\n"
+    "   THREE seed/key algorithms (v1, v2, v3) - READY FOR TESTING!\n"
+    "\nRequires:\n"
+    "  - PCAN USB adapter (PEAK Systems)\n"
+    "  - Or compatible CAN interface\n"
+    "  - K+DCAN cable and stable power\n"
+    f"\n{'-' * 70}\n"
+    "CALIBRATION OPERATIONS (TUNING):\n"
+    "  1. Read Calibration from ECU (256KB calibration sector)\n"
+    "  2. Flash Calibration to ECU (256KB calibration only)\n"
+    "\nFULL BINARY OPERATIONS (ADVANCED):\n"
+    "  3. Flash Full Binary (2MB complete firmware)\n"
+    "  4. Read Arbitrary Memory Region\n"
+    "\nDIAGNOSTICS & PATCHES:\n"
+    "  5. Flash Readiness Patch (NVRAM) \n"
+    "  6. Check Battery Voltage\n"
+    "  7. Verify ECU Checksums (CRC)\n"
+    "\nSESSION & SECURITY:\n"
+    "  8. Enter Programming Session\n"
+    "  9. Test Security Access (Seed/Key)\n"
+    "  10. Test CAN Connection\n"
+    "\nUTILITIES:\n"
+    "  11. Reset ECU\n"
+    "  12. View CAN Configuration\n"
+    "  13. Seed/Key Algorithm Research\n"
+    "  14. View Documentation\n"
+    "\nPRESETS (K+DCAN FIRST):\n"
+    "  15. Stage Preset Flash (Backup → Patch → CRC → Flash)\n"
+    "\n0. Back to Main Menu\n"
+    f"{'-' * 70}\n"
+)
+
+
+# Connected flashers shared by the Direct CAN menu, keyed by (interface, channel).
+# Bus init costs a few hundred ms on PCAN; the menu closes them all on exit.
+_FLASHER_CACHE: Dict[Tuple[str, Any], DirectCANFlasher] = {}
+
+
+def _get_flasher(interface: str, channel: Any) -> Optional[DirectCANFlasher]:
+    """Return a connected flasher for the interface/channel, reusing an open one.
+
+    Returns:
+        Connected DirectCANFlasher, or None if the CAN bus could not be opened
+    """
+    key = (interface, channel)
+    flasher = _FLASHER_CACHE.get(key)
+    if flasher is not None and flasher.bus is not None:
+        # The idle bus has queued PT-CAN traffic and late replies to earlier
+        # requests; drop them so the next request can't take one as its answer
+        try:
+            while flasher.bus.recv(timeout=0) is not None:
+                pass
+            return flasher
+        except Exception as e:
+            logger.warning(f"Cached CAN bus failed ({e}); reconnecting")
+            _release_flasher(interface, channel)
+    flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+    if not flasher.connect():
+        _FLASHER_CACHE.pop(key, None)
+        return None
+    _FLASHER_CACHE[key] = flasher
+    return flasher
+
+
+def _release_flasher(interface: str, channel: Any) -> None:
+    """Disconnect and forget the cached flasher for the interface/channel."""
+    flasher = _FLASHER_CACHE.pop((interface, channel), None)
+    if flasher is not None:
+        try:
+            flasher.disconnect()
+        except Exception as e:
+            logger.warning(f"CAN disconnect failed: {e}")
+
+
+def _close_flashers() -> None:
+    """Disconnect every cached flasher."""
+    for interface, channel in list(_FLASHER_CACHE):
+        _release_flasher(interface, channel)
+
+
+@contextmanager
+def _cached_flasher(interface: str, channel: Any):
+    """Context-managed `_get_flasher` that leaves the bus open on normal exit.
+
+    Raises:
+        RuntimeError: If the CAN bus could not be opened
+
+    A flasher whose block raises is disconnected and dropped from the cache,
+    so the next operation starts from a fresh bus.
+    """
+    flasher = _get_flasher(interface, channel)
+    if flasher is None:
+        raise RuntimeError(f"Failed to connect to CAN bus: {interface} {channel}")
+    try:
+        yield flasher
+    except BaseException:
+        _release_flasher(interface, channel)
+        raise
 
 
 def direct_can_flash_menu():
@@ -4913,107 +5290,62 @@ def direct_can_flash_menu():
     except Exception:
         can_available = False
     
-    while True:
-        click.echo("\n" + "="*70)
-        click.echo("=== Direct CAN Flash ( EXPERIMENTAL) ===")
-        click.echo("="*70)
-        
-        if not can_available:
-            click.echo("\n  ERROR: python-can not installed!")
-            click.echo("\nInstall dependencies:")
-            click.echo("  pip install -r requirements.txt")
-            click.echo("\nOr manually:")
-            click.echo("  pip install python-can python-can[pcan]")
-            click.echo("\n0. Back to Main Menu")
+    try:
+        while True:
+            if not can_available:
+                click.echo(_DIRECT_CAN_BANNER + _DIRECT_CAN_UNAVAILABLE, nl=False)
             
-            choice = click.prompt("\nSelect option", type=int, default=0)
-            if choice == 0:
-                break
-            continue
+                choice = click.prompt("\nSelect option", type=int, default=0)
+                if choice == 0:
+                    break
+                continue
         
-        click.echo("\nDirect CAN/UDS ECU communication (K+DCAN-only)")
-        click.echo("Communicates directly with the ECU using ISO-TP/UDS")
-        click.echo("\nFeatures:")
-        click.echo("   ISO-TP transport layer (ISO 15765-2)")
-        click.echo("   UDS services (ISO 14229)")
-        click.echo("   Read/write calibration via CAN")
-        click.echo("   BMW CRC validation")
-        click.echo("   THREE seed/key algorithms (v1, v2, v3) - READY FOR TESTING!")
-        click.echo("\nRequires:")
-        click.echo("  - PCAN USB adapter (PEAK Systems)")
-        click.echo("  - Or compatible CAN interface")
-        click.echo("  - K+DCAN cable and stable power")
-        
-        click.echo("\n" + "-"*70)
-        click.echo("CALIBRATION OPERATIONS (TUNING):")
-        click.echo("  1. Read Calibration from ECU (256KB calibration sector)")
-        click.echo("  2. Flash Calibration to ECU (256KB calibration only)")
-        click.echo("\nFULL BINARY OPERATIONS (ADVANCED):")
-        click.echo("  3. Flash Full Binary (2MB complete firmware)")
-        click.echo("  4. Read Arbitrary Memory Region")
-        click.echo("\nDIAGNOSTICS & PATCHES:")
-        click.echo("  5. Flash Readiness Patch (NVRAM) ")
-        click.echo("  6. Check Battery Voltage")
-        click.echo("  7. Verify ECU Checksums (CRC)")
-        click.echo("\nSESSION & SECURITY:")
-        click.echo("  8. Enter Programming Session")
-        click.echo("  9. Test Security Access (Seed/Key)")
-        click.echo("  10. Test CAN Connection")
-        click.echo("\nUTILITIES:")
-        click.echo("  11. Reset ECU")
-        click.echo("  12. View CAN Configuration")
-        click.echo("  13. Seed/Key Algorithm Research")
-        click.echo("  14. View Documentation")
-        click.echo("\nPRESETS (K+DCAN FIRST):")
-        click.echo("  15. Stage Preset Flash (Backup → Patch → CRC → Flash)")
-        click.echo("\n0. Back to Main Menu")
-        click.echo("-"*70)
+            click.echo(_DIRECT_CAN_BANNER + _DIRECT_CAN_MENU_BODY, nl=False)
         
-        choice = click.prompt("\nSelect option", type=int, default=0)
+            choice = click.prompt("\nSelect option", type=int, default=0)
         
-        if choice == 0:
-            break
-        elif choice == 1:
-            direct_can_read_calibration()
-        elif choice == 2:
-            direct_can_flash_calibration()
-        elif choice == 3:
-            direct_can_flash_full_binary()
-        elif choice == 4:
-            direct_can_read_memory()
-        elif choice == 5:
-            direct_can_flash_readiness_patch()
-        elif choice == 6:
-            direct_can_check_battery()
-        elif choice == 7:
-            direct_can_verify_checksums()
-        elif choice == 8:
-            direct_can_enter_programming()
-        elif choice == 9:
-            direct_can_test_security()
-        elif choice == 10:
-            direct_can_test_connection()
-        elif choice == 11:
-            direct_can_reset_ecu()
-        elif choice == 12:
-            direct_can_view_config()
-        elif choice == 13:
-            direct_can_seedkey_research()
-        elif choice == 14:
-            direct_can_view_docs()
-        elif choice == 15:
-            direct_can_stage_preset_flash()
-        else:
-            click.echo("Invalid selection.")
+            if choice == 0:
+                break
+            elif choice == 1:
+                direct_can_read_calibration()
+            elif choice == 2:
+                direct_can_flash_calibration()
+            elif choice == 3:
+                direct_can_flash_full_binary()
+            elif choice == 4:
+                direct_can_read_memory()
+            elif choice == 5:
+                direct_can_flash_readiness_patch()
+            elif choice == 6:
+                direct_can_check_battery()
+            elif choice == 7:
+                direct_can_verify_checksums()
+            elif choice == 8:
+                direct_can_enter_programming()
+            elif choice == 9:
+                direct_can_test_security()
+            elif choice == 10:
+                direct_can_test_connection()
+            elif choice == 11:
+                direct_can_reset_ecu()
+            elif choice == 12:
+                direct_can_view_config()
+            elif choice == 13:
+                direct_can_seedkey_research()
+            elif choice == 14:
+                direct_can_view_docs()
+            elif choice == 15:
+                direct_can_stage_preset_flash()
+            else:
+                click.echo("Invalid selection.")
+    finally:
+        _close_flashers()
 
 
 def direct_can_test_connection():
     """Test direct CAN bus connection."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Test CAN Connection ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Test CAN Connection ===\n{_H70}")
     
     click.echo("\nAvailable interfaces:")
     click.echo("  1. PCAN (PEAK USB)")
@@ -5038,9 +5370,9 @@ def direct_can_test_connection():
     click.echo(f"\nConnecting to {interface} {channel}...")
     
     try:
-        flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+        flasher = _get_flasher(interface, channel)
         
-        if flasher.connect():
+        if flasher is not None:
             click.echo(" CAN bus connected successfully!")
             click.echo(f"\nConfiguration:")
             click.echo(f"  Interface: {interface}")
@@ -5048,8 +5380,6 @@ def direct_can_test_connection():
             click.echo(f"  Bitrate: {flasher.bitrate} bps")
             click.echo(f"  ECU TX ID: 0x{flasher.ECU_TX_ID:03X}")
             click.echo(f"  ECU RX ID: 0x{flasher.ECU_RX_ID:03X}")
-            
-            flasher.disconnect()
         else:
             click.echo(" Connection failed")
             click.echo("\nTroubleshooting:")
@@ -5062,17 +5392,13 @@ def direct_can_test_connection():
         click.echo("\nCheck python-can installation:")
         click.echo("  pip install python-can python-can[pcan]")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_read_calibration():
     """Read calibration using direct CAN."""
-    from . import direct_can_flasher
-    from pathlib import Path
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Read Calibration via Direct CAN ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Read Calibration via Direct CAN ===\n{_H70}")
     
     click.echo("\n  WARNING: This will directly communicate with ECU")
     click.echo("Ensure:")
@@ -5086,19 +5412,17 @@ def direct_can_read_calibration():
     interface = click.prompt("CAN interface", type=str, default='pcan')
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
     
-    output_file = Path("backups") / f"cal_read_direct_{datetime.now().strftime('%Y%m%d_%H%M%S')}.bin"
+    output_file = Path("backups") / f"cal_read_direct_{_ts()}.bin"
     output_file.parent.mkdir(exist_ok=True)
     
     click.echo(f"\nReading calibration to: {output_file}")
     
     try:
-        cal_data = direct_can_flasher.read_ecu_calibration(
-            interface=interface,
-            channel=channel,
-            output_file=output_file
-        )
+        with _cached_flasher(interface, channel) as fl:
+            cal_data = fl.read_calibration(progress_callback=_RateLimitedProgress(min_interval=0.1))
         
         if cal_data:
+            _write_backup(output_file, cal_data)
             click.echo(f"\n SUCCESS: Read {len(cal_data):,} bytes")
             click.echo(f"Saved to: {output_file}")
         else:
@@ -5112,17 +5436,13 @@ def direct_can_read_calibration():
         click.echo(f"\n ERROR: {e}")
         logger.exception("Direct CAN read failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_flash_calibration():
     """Flash calibration using direct CAN."""
-    from . import direct_can_flasher
-    from pathlib import Path
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Flash Calibration via Direct CAN ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Flash Calibration via Direct CAN ===\n{_H70}")
     
     click.echo("\n      DANGER ZONE     ")
     click.echo("\nThis will WRITE data directly to your ECU!")
@@ -5149,15 +5469,17 @@ def direct_can_flash_calibration():
     interface = click.prompt("CAN interface", type=str, default='pcan')
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
     
+    if not _join_backup_writes():
+        return
+    
     click.echo(f"\nFlashing: {cal_file}")
     click.echo(f"Size: {cal_file.stat().st_size:,} bytes")
     
     try:
-        success = direct_can_flasher.flash_ecu_calibration(
-            cal_file=cal_file,
-            interface=interface,
-            channel=channel
-        )
+        cal_data = cal_file.read_bytes()
+        with _cached_flasher(interface, channel) as fl:
+            result = fl.flash_calibration(cal_data, progress_callback=_RateLimitedProgress(min_interval=0.1))
+        success = result == direct_can_flasher.WriteResult.SUCCESS
         
         if success:
             click.echo("\n FLASH SUCCESSFUL!")
@@ -5174,7 +5496,7 @@ def direct_can_flash_calibration():
         logger.exception("Direct CAN flash failed")
         click.echo("\n  CHECK ECU STATUS IMMEDIATELY")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_stage_preset_flash():
@@ -5182,12 +5504,9 @@ def direct_can_stage_preset_flash():
     K+DCAN-first preset flash pipeline:
     Backup → Patch (Stage) → CRC fix → Validate → Flash.
     """
-    from . import direct_can_flasher
-    from pathlib import Path
+    from . import map_patcher
 
-    click.echo("\n" + "="*70)
-    click.echo("=== Stage Preset Flash (K+DCAN) ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Stage Preset Flash (K+DCAN) ===\n{_H70}")
 
     click.echo("\nThis flow will:")
     click.echo("  1) Read and save a calibration backup")
@@ -5210,7 +5529,7 @@ def direct_can_stage_preset_flash():
     preset_choice = click.prompt("Select preset", type=int, default=1)
 
     try:
-        with direct_can_flasher.DirectCANFlasher(interface, channel) as fl:
+        with _cached_flasher(interface, channel) as fl:
             # Read VIN (best-effort)
             vin = None
             try:
@@ -5227,24 +5546,25 @@ def direct_can_stage_preset_flash():
             backups_dir.mkdir(parents=True, exist_ok=True)
             maps_dir.mkdir(parents=True, exist_ok=True)
 
-            # Progress reporter
-            def progress(msg: str, pct: int):
-                click.echo(f"[{pct:3d}%] {msg}")
+            # Progress reporter (at most one line per 100 ms)
+            progress = _RateLimitedProgress(min_interval=0.1)
 
             # 1) Backup calibration
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = _ts()
             backup_path = backups_dir / f"cal_backup_{timestamp}.bin"
             click.echo(f"\n📥 Backing up calibration → {backup_path}")
             cal_data = fl.read_calibration(progress_callback=progress)
             if not cal_data:
                 click.echo("\n Calibration read failed; cannot continue")
                 return
-            backup_path.write_bytes(cal_data)
-            click.echo(f" Backup saved: {backup_path.name} ({len(cal_data):,} bytes)")
+            # Written and fsynced on the I/O pool while the preset is built and
+            # patched; joined before anything is flashed
+            backup_future = _io_pool.submit(_write_backup, backup_path, cal_data)
+            _pending_writes.add(backup_future)
+            backup_future.add_done_callback(_backup_written)
 
             # 2) Apply preset patches
             click.echo("\n Building preset and applying patches...")
-            patched = bytearray(cal_data)
             try:
                 patcher = map_patcher.MapPatcher(ecu_type="MSD80")
                 if preset_choice == 0:
@@ -5255,56 +5575,48 @@ def direct_can_stage_preset_flash():
                     ref_choice = click.prompt("Select", type=int, default=1)
 
                     if ref_choice == 1:
-                        ref_root = Path(__file__).parent.parent / "backups"
-                        ref_bins: List[Path] = list(ref_root.rglob("*.bin"))
+                        ref_bins = _backup_index(BACKUP_DIR) if BACKUP_DIR.is_dir() else []
                         if not ref_bins:
                             click.echo(" No .bin files found under backups/")
                             return
                         click.echo("\nAvailable reference backups:")
-                        for i, f in enumerate(ref_bins, 1):
-                            try:
-                                size_mb = f.stat().st_size / (1024*1024)
-                            except Exception:
-                                size_mb = 0.0
-                            click.echo(f"  {i}. {f.relative_to(ref_root)} ({size_mb:.2f} MB)")
+                        for i, (f, size) in enumerate(ref_bins, 1):
+                            click.echo(f"  {i}. {f.relative_to(BACKUP_DIR)} ({size / _MB:.2f} MB)")
                         ref_idx = click.prompt("Select reference", type=int)
                         if ref_idx < 1 or ref_idx > len(ref_bins):
                             click.echo(" Invalid selection")
                             return
-                        ref_path = cast(Path, ref_bins[ref_idx - 1])
+                        ref_path = ref_bins[ref_idx - 1][0]
                     else:
                         ref_input = click.prompt("Enter reference .bin path", type=click.Path(exists=True))
                         ref_path = Path(ref_input)
-                        if not ref_path.exists():
-                            click.echo(" File not found")
-                            return
-
-                    ref_data = ref_path.read_bytes()
-                    if len(ref_data) != len(patched):
-                        click.echo(f"  Reference size mismatch: backup {len(patched):,} vs ref {len(ref_data):,}")
-                        if not click.confirm("Continue anyway?", default=False):
-                            return
 
-                    # Feature selection (selected areas)
-                    click.echo("\nSelect areas to restore to stock (Y/n):")
-                    feat_vmax = click.confirm("  • Speed limiter (VMAX)", default=True)
-                    feat_rpm = click.confirm("  • RPM limiters", default=True)
-                    feat_burb = click.confirm("  • Burbles/Pops", default=True)
-                    feat_dtc = click.confirm("  • DTC behaviors (cat/O2)", default=True)
-                    feat_wgdc = click.confirm("  • WGDC/boost maps (validated)", default=True)
-                    features: List[str] = []
-                    if feat_vmax:
-                        features.append("vmax")
-                    if feat_rpm:
-                        features.append("rpm")
-                    if feat_burb:
-                        features.append("burbles")
-                    if feat_dtc:
-                        features.append("dtc")
-                    if feat_wgdc:
-                        features.append("wgdc")
-
-                    ps = patcher.create_restore_to_stock_patchset(stock_data=ref_data, features=features)
+                    with _load_bin(ref_path) as ref_data:
+                        if len(ref_data) != len(cal_data):
+                            click.echo(f"  Reference size mismatch: backup {len(cal_data):,} vs ref {len(ref_data):,}")
+                            if not click.confirm("Continue anyway?", default=False):
+                                return
+
+                        # Feature selection (selected areas)
+                        click.echo("\nSelect areas to restore to stock (Y/n):")
+                        feat_vmax = click.confirm("  • Speed limiter (VMAX)", default=True)
+                        feat_rpm = click.confirm("  • RPM limiters", default=True)
+                        feat_burb = click.confirm("  • Burbles/Pops", default=True)
+                        feat_dtc = click.confirm("  • DTC behaviors (cat/O2)", default=True)
+                        feat_wgdc = click.confirm("  • WGDC/boost maps (validated)", default=True)
+                        features: List[str] = []
+                        if feat_vmax:
+                            features.append("vmax")
+                        if feat_rpm:
+                            features.append("rpm")
+                        if feat_burb:
+                            features.append("burbles")
+                        if feat_dtc:
+                            features.append("dtc")
+                        if feat_wgdc:
+                            features.append("wgdc")
+
+                        ps = patcher.create_restore_to_stock_patchset(stock_data=ref_data, features=features)
                     preset_label = "stage0_restore"
                 elif preset_choice in (1, 2):
                     # Use new unified preset system
@@ -5320,7 +5632,9 @@ def direct_can_stage_preset_flash():
                     click.echo("\n Invalid preset selection")
                     return
 
-                # Apply patches without CRC updates here; we'll fix with flasher logic
+                # Apply patches without CRC updates here; we'll fix with flasher logic.
+                # This is the only copy of the image; later steps use it in place
+                patched = bytearray(cal_data)
                 patch_results = patcher.apply_patch_set(
                     patched,
                     ps,
@@ -5348,7 +5662,7 @@ def direct_can_stage_preset_flash():
 
             # 4) Validate CRCs
             click.echo("\n Validating CRCs...")
-            if not fl.validate_calibration_crcs(bytes(patched)):
+            if not fl.validate_calibration_crcs(patched):
                 click.echo(" CRC validation failed; refusing to flash")
                 return
             click.echo(" CRCs valid")
@@ -5356,9 +5670,17 @@ def direct_can_stage_preset_flash():
             # Save tuned file
             output_name = f"{preset_label}_{timestamp}_{vin}.bin"
             tuned_path = maps_dir / output_name
-            tuned_path.write_bytes(bytes(patched))
+            _write_backup(tuned_path, patched)
             click.echo(f"\n Tuned file saved: {tuned_path}")
 
+            # The backup must be on disk before the ECU is touched
+            try:
+                backup_future.result()
+            except OSError as e:
+                click.echo(f"\n Backup write failed: {e}; refusing to flash")
+                return
+            click.echo(f"\n Backup saved: {backup_path.name} ({len(cal_data):,} bytes)")
+
             # 5) Flash
             if not click.confirm("\nFlash this tuned calibration now?", default=True):
                 click.echo("\nAborted before flashing. Files saved above.")
@@ -5366,10 +5688,10 @@ def direct_can_stage_preset_flash():
 
             click.echo("\n Flashing via direct CAN/UDS...")
             try:
-                result = fl.flash_calibration(bytes(patched), progress_callback=progress)
+                result = fl.flash_calibration(patched, progress_callback=progress)
                 # Normalize enum to boolean if needed
                 try:
-                    from .direct_can_flasher import WriteResult as _WR
+                    _WR = direct_can_flasher.WriteResult
                     success = (result == _WR.SUCCESS)
                 except Exception:
                     success = bool(result)
@@ -5389,17 +5711,13 @@ def direct_can_stage_preset_flash():
         click.echo(f"\n Error initializing CAN flasher: {e}")
         logger.exception("Preset flash init failed")
 
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_flash_readiness_patch():
     """Flash readiness monitor patch to NVRAM region."""
-    from . import direct_can_flasher
-    from pathlib import Path
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Flash Readiness Monitor Patch (NVRAM) ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Flash Readiness Monitor Patch (NVRAM) ===\n{_H70}")
     
     click.echo("\n READINESS MONITOR PATCHING (MSD80)")
     click.echo("\nThis patches NVRAM to force readiness monitors to report 'ready'.")
@@ -5422,19 +5740,25 @@ def direct_can_flash_readiness_patch():
     
     # List available test patches
     test_maps_dir = Path('test_maps')
-    patches: List[Path] = list(test_maps_dir.glob('readiness_patch_*.bin'))
+    # (path, size) from one directory read; DirEntry carries the size
+    patches: List[Tuple[Path, int]] = []
+    if test_maps_dir.is_dir():
+        with os.scandir(test_maps_dir) as it:
+            for entry in it:
+                if entry.name.startswith('readiness_patch_') and entry.name.endswith('.bin'):
+                    patches.append((Path(entry.path), entry.stat().st_size))
     
     if not patches:
         click.echo("\n No readiness patches found in test_maps/")
         click.echo("\nRun patch_readiness_binary.py first to create test patches:")
         click.echo("  python patch_readiness_binary.py input.bin output.bin --nvram-offset 0x1F0000")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Display available patches
     click.echo("\nAvailable Readiness Patches:")
-    for idx, patch in enumerate(patches, 1):
-        size_mb = patch.stat().st_size / (1024 * 1024)
+    for idx, (patch, size) in enumerate(patches, 1):
+        size_mb = size / _MB
         # Extract offset from filename (e.g., readiness_patch_0x1F0000_TEST.bin)
         offset_str = patch.stem.split('_')[2]  # Gets "0x1F0000"
         click.echo(f"  {idx}. {patch.name}")
@@ -5457,9 +5781,9 @@ def direct_can_flash_readiness_patch():
             return
         # Extract offset from user
         offset_str: str = click.prompt("NVRAM offset (e.g., 0x1F0000)", type=str, default="0x1F0000")
-        nvram_offset = int(offset_str, 16)
+        nvram_offset = _parse_hex(offset_str)
     elif 1 <= choice <= len(patches):
-        patch_file = cast(Path, patches[choice - 1])
+        patch_file = patches[choice - 1][0]
         # Extract offset from filename
         offset_str: str = patch_file.stem.split('_')[2]
         nvram_offset = int(offset_str, 16)
@@ -5487,16 +5811,18 @@ def direct_can_flash_readiness_patch():
         click.echo("Aborted.")
         return
     
+    if not _join_backup_writes():
+        return
+    
     try:
         click.echo("\nInitializing CAN flasher...")
-        flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+        flasher = _get_flasher(interface, channel)
         
-        if not flasher.connect():
+        if flasher is None:
             click.echo(" Failed to connect to CAN bus")
             return
         
-        def progress(msg: str, pct: int) -> None:
-            click.echo(f"[{pct:3d}%] {msg}")
+        progress = _RateLimitedProgress(min_interval=0.1)
         
         if method == 1:
             # Full binary flash
@@ -5504,7 +5830,7 @@ def direct_can_flash_readiness_patch():
             success = flasher.flash_full_binary(patch_file, progress_callback=progress)
             # Normalize enum to boolean if needed
             try:
-                from .direct_can_flasher import WriteResult as _WR
+                _WR = direct_can_flasher.WriteResult
                 success = (success == _WR.SUCCESS)
             except Exception:
                 pass
@@ -5529,20 +5855,16 @@ def direct_can_flash_readiness_patch():
             )
             # Normalize enum to boolean if needed
             try:
-                from .direct_can_flasher import WriteResult as _WR
+                _WR = direct_can_flasher.WriteResult
                 success = (success == _WR.SUCCESS)
             except Exception:
                 pass
         
-        flasher.disconnect()
-        
         if success:
             click.echo("\n FLASH SUCCESSFUL!")
             
             # Prompt for verification
-            click.echo("\n" + "="*70)
-            click.echo("NEXT STEP: Verify Readiness Monitors")
-            click.echo("="*70)
+            click.echo(f"\n{_H70}\nNEXT STEP: Verify Readiness Monitors\n{_H70}")
             
             click.echo("\nThe ECU has restarted. Wait 10 seconds, then verify:")
             click.echo("\n📌 Recommended Verification Methods:")
@@ -5585,18 +5907,16 @@ def direct_can_flash_readiness_patch():
     except Exception as e:
         click.echo(f"\n ERROR: {e}")
         logger.exception("Readiness patch flash failed")
+        _release_flasher(interface, channel)
         click.echo("\n  CHECK ECU STATUS IMMEDIATELY")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_enter_programming():
     """Enter programming session via direct CAN."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Enter Programming Session ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Enter Programming Session ===\n{_H70}")
     
     interface = click.prompt("CAN interface", type=str, default='pcan')
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
@@ -5604,7 +5924,7 @@ def direct_can_enter_programming():
     click.echo("\nAttempting to enter programming session...")
     
     try:
-        with direct_can_flasher.DirectCANFlasher(interface, channel) as flasher:
+        with _cached_flasher(interface, channel) as flasher:
             if flasher.enter_programming_session():
                 click.echo(" Programming session established")
                 click.echo("ECU is ready for flash operations")
@@ -5614,16 +5934,13 @@ def direct_can_enter_programming():
     except Exception as e:
         click.echo(f" Error: {e}")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_test_security():
     """Test security access seed/key."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Test Security Access (Seed/Key) ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Test Security Access (Seed/Key) ===\n{_H70}")
     
     click.echo("\nCRITICAL LIMITATION:")
     click.echo("Seed/key algorithm implementation incomplete")
@@ -5641,7 +5958,7 @@ def direct_can_test_security():
     click.echo("\nTesting security access...")
     
     try:
-        with direct_can_flasher.DirectCANFlasher(interface, channel) as flasher:
+        with _cached_flasher(interface, channel) as flasher:
             # Enter programming session first
             if not flasher.enter_programming_session():
                 click.echo("Failed to enter programming session")
@@ -5671,16 +5988,13 @@ def direct_can_test_security():
     except Exception as e:
         click.echo(f" Error: {e}")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_view_config():
     """View CAN configuration."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Direct CAN Configuration ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Direct CAN Configuration ===\n{_H70}")
     
     flasher = direct_can_flasher.DirectCANFlasher('pcan', 'PCAN_USBBUS1')
     
@@ -5702,14 +6016,12 @@ def direct_can_view_config():
     click.echo(f"  Calibration start:  0x00100000")
     click.echo(f"  Calibration size:   0x80000 (512 KB)")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_seedkey_research():
     """Guide for seed/key algorithm research and implementation."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Seed/Key Algorithm Research ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Seed/Key Algorithm Research ===\n{_H70}")
     
     click.echo("\nThe seed/key algorithm is required for direct CAN flash operations.")
     click.echo("\nKnown requirements:")
@@ -5730,17 +6042,13 @@ def direct_can_seedkey_research():
         import subprocess
         subprocess.run(['python', 'seed_key_research.py', '--workflow'])
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_flash_full_binary():
     """Flash complete 2MB firmware binary to ECU."""
-    from . import direct_can_flasher
-    from pathlib import Path
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Flash Full Binary (2MB Complete Firmware) ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Flash Full Binary (2MB Complete Firmware) ===\n{_H70}")
     
     click.echo("\n  EXTREMELY DANGEROUS - FULL ECU REFLASH")
     click.echo("\nThis flashes the ENTIRE 2MB firmware (bootloader + program + calibration + NVRAM).")
@@ -5755,26 +6063,32 @@ def direct_can_flash_full_binary():
         return
     
     # Select bin file
-    bin_files: List[Path] = list(Path(".").glob("*.bin"))
-    bin_files.extend(Path("backups").rglob("*.bin"))
+    # One scandir of the working directory; DirEntry sizes come with the listing
+    bin_files: List[Tuple[Path, int]] = []
+    with os.scandir(".") as it:
+        for entry in it:
+            if entry.name.endswith(".bin") and entry.is_file():
+                bin_files.append((Path(entry.name), entry.stat().st_size))
+    if Path("backups").is_dir():
+        bin_files.extend(_backup_index(Path("backups")))
     
     if not bin_files:
         click.echo("\n No .bin files found")
         return
     
     click.echo("\nAvailable firmware files:")
-    for i, f in enumerate(bin_files, 1):
-        click.echo(f"{i}. {f} ({f.stat().st_size:,} bytes)")
+    for i, (f, size) in enumerate(bin_files, 1):
+        click.echo(f"{i}. {f} ({size:,} bytes)")
     
     choice = click.prompt("Select file", type=int)
     if choice < 1 or choice > len(bin_files):
         click.echo("Invalid selection")
         return
     
-    bin_file: Path = cast(Path, bin_files[choice - 1])
+    bin_file: Path = bin_files[choice - 1][0]
     
     # Detect software from bin using consolidated detection
-    detection = software_detector.detect_software_from_bin(str(bin_file))
+    detection = _detect_software(bin_file)
     
     click.echo(f"\nSelected: {bin_file}")
     click.echo(f"Size: {detection['size_bytes']:,} bytes")
@@ -5799,27 +6113,27 @@ def direct_can_flash_full_binary():
     interface = 'pcan' if interface_choice == 1 else 'socketcan'
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
     
+    if not _join_backup_writes():
+        return
+    
     try:
-        flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+        flasher = _get_flasher(interface, channel)
         
-        if not flasher.connect():
+        if flasher is None:
             click.echo(" CAN connection failed")
             return
         
-        def progress(msg: str, pct: int) -> None:
-            click.echo(f"[{pct:3d}%] {msg}")
+        progress = _RateLimitedProgress(min_interval=0.1)
         
         click.echo("\n Starting full binary flash...")
         success = flasher.flash_full_binary(bin_file, progress_callback=progress)
         # Normalize enum to boolean if needed
         try:
-            from .direct_can_flasher import WriteResult as _WR
+            _WR = direct_can_flasher.WriteResult
             success = (success == _WR.SUCCESS)
         except Exception:
             pass
         
-        flasher.disconnect()
-        
         if success:
             click.echo("\n FLASH SUCCESSFUL!")
             click.echo("ECU will reset. Wait 30 seconds before turning ignition on.")
@@ -5830,17 +6144,15 @@ def direct_can_flash_full_binary():
     except Exception as e:
         click.echo(f"\n ERROR: {e}")
         logger.exception("Full binary flash failed")
+        _release_flasher(interface, channel)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_read_memory():
     """Read arbitrary memory region from ECU."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Read Arbitrary Memory Region ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Read Arbitrary Memory Region ===\n{_H70}")
     
     click.echo("\nRead any memory address from ECU.")
     click.echo("Useful for:")
@@ -5853,8 +6165,8 @@ def direct_can_read_memory():
     size_str = click.prompt("Size (hex)", type=str, default="0x40000")
     
     try:
-        address = int(address_str, 16)
-        size = int(size_str, 16)
+        address = _parse_hex(address_str)
+        size = _parse_hex(size_str)
     except ValueError:
         click.echo(" Invalid hex format")
         return
@@ -5873,22 +6185,19 @@ def direct_can_read_memory():
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
     
     try:
-        flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+        flasher = _get_flasher(interface, channel)
         
-        if not flasher.connect():
+        if flasher is None:
             click.echo(" CAN connection failed")
             return
         
         if not flasher.unlock_ecu():
             click.echo(" Security access failed")
-            flasher.disconnect()
             return
         
         click.echo("\n📖 Reading memory...")
         data = flasher.read_memory(address, size)
         
-        flasher.disconnect()
-        
         if data:
             click.echo(f"\n Read {len(data):,} bytes")
             
@@ -5909,17 +6218,15 @@ def direct_can_read_memory():
     except Exception as e:
         click.echo(f"\n ERROR: {e}")
         logger.exception("Memory read failed")
+        _release_flasher(interface, channel)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_check_battery():
     """Check battery voltage via CAN."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Check Battery Voltage ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Check Battery Voltage ===\n{_H70}")
     
     click.echo("\nBattery voltage check is CRITICAL before flashing.")
     click.echo("Requirement: >12.5V (13.5V+ recommended)")
@@ -5934,9 +6241,9 @@ def direct_can_check_battery():
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
     
     try:
-        flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+        flasher = _get_flasher(interface, channel)
         
-        if not flasher.connect():
+        if flasher is None:
             click.echo(" CAN connection failed")
             return
         
@@ -5955,23 +6262,19 @@ def direct_can_check_battery():
                 click.echo("   Status: LOW (DO NOT FLASH - connect charger)")
         else:
             click.echo("\n Battery voltage check failed")
-        
-        flasher.disconnect()
     
     except Exception as e:
         click.echo(f"\n ERROR: {e}")
         logger.exception("Battery check failed")
+        _release_flasher(interface, channel)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_verify_checksums():
     """Verify ECU checksums (CRC)."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Verify ECU Checksums (CRC) ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Verify ECU Checksums (CRC) ===\n{_H70}")
     
     click.echo("\nBMW MSD80 uses CRC32 checksums to validate firmware integrity.")
     click.echo("Polynomial: 0x1EDC6F41 (BMW-specific)")
@@ -5989,15 +6292,14 @@ def direct_can_verify_checksums():
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
     
     try:
-        flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+        flasher = _get_flasher(interface, channel)
         
-        if not flasher.connect():
+        if flasher is None:
             click.echo(" CAN connection failed")
             return
         
         if not flasher.unlock_ecu():
             click.echo(" Security access failed")
-            flasher.disconnect()
             return
         
         click.echo("\n Verifying checksums...")
@@ -6013,23 +6315,19 @@ def direct_can_verify_checksums():
             click.echo(" Zone 1 (Program): CRC VALID")
         else:
             click.echo("  Zone 1 (Program): CRC check not available (protected)")
-        
-        flasher.disconnect()
     
     except Exception as e:
         click.echo(f"\n ERROR: {e}")
         logger.exception("Checksum verification failed")
+        _release_flasher(interface, channel)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_reset_ecu():
     """Reset ECU via UDS command."""
-    from . import direct_can_flasher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Reset ECU ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Reset ECU ===\n{_H70}")
     
     click.echo("\nReset types:")
     click.echo("  1. Hard reset (power cycle simulation)")
@@ -6056,9 +6354,9 @@ def direct_can_reset_ecu():
     channel = click.prompt("CAN channel", type=str, default='PCAN_USBBUS1')
     
     try:
-        flasher = direct_can_flasher.DirectCANFlasher(interface, channel)
+        flasher = _get_flasher(interface, channel)
         
-        if not flasher.connect():
+        if flasher is None:
             click.echo(" CAN connection failed")
             return
         
@@ -6074,15 +6372,14 @@ def direct_can_reset_ecu():
     except Exception as e:
         click.echo(f"\n ERROR: {e}")
         logger.exception("ECU reset failed")
+        _release_flasher(interface, channel)
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def direct_can_view_docs():
     """View direct CAN flash documentation."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Direct CAN Flash Documentation ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Direct CAN Flash Documentation ===\n{_H70}")
     
     docs_path = Path(__file__).parent.parent / "docs" / "direct_can_flash_guide.md"
     
@@ -6100,15 +6397,14 @@ def direct_can_view_docs():
         click.echo("  - Seed/Key Algorithm Research")
         
         if click.confirm("\nOpen in default editor?", default=True):
-            import subprocess
             if os.name == 'nt':
-                subprocess.run(['notepad', str(docs_path)])
+                _open_detached(['notepad', str(docs_path)])
             else:
-                subprocess.run(['xdg-open', str(docs_path)])
+                _open_detached(['xdg-open', str(docs_path)])
     else:
         click.echo(f"\n  Documentation not found at: {docs_path}")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_features_menu():
@@ -6180,9 +6476,7 @@ def advanced_burbles_menu():
     """Burbles/Pops configuration."""
     from . import map_patcher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Burbles/Pops & Bangs Configuration ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Burbles/Pops & Bangs Configuration ===\n{_H70}")
     
     click.echo("\n Add aggressive burbles and pops on deceleration!")
     click.echo("\nWhat this does:")
@@ -6196,7 +6490,7 @@ def advanced_burbles_menu():
     click.echo("  - Recommended for track/off-road use only")
     
     if not click.confirm("\n Apply burbles patch to a bin file?", default=False):
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Select input file
@@ -6212,7 +6506,7 @@ def advanced_burbles_menu():
     
     if not click.confirm("\n Apply burbles patch?", default=False):
         click.echo(" Cancelled")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     try:
@@ -6243,16 +6537,14 @@ def advanced_burbles_menu():
         click.echo(f"\n Error: {e}")
         logger.exception("Burbles patch failed")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_vmax_removal():
     """VMAX (speed limiter) removal."""
     from . import map_patcher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Speed Limiter (VMAX) Removal ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Speed Limiter (VMAX) Removal ===\n{_H70}")
     
     click.echo("\n🏁 Remove factory speed limiter!")
     click.echo("\nStock VMAX: 155 mph (250 km/h) or 130 mph (210 km/h)")
@@ -6263,7 +6555,7 @@ def advanced_vmax_removal():
     click.echo("  - User accepts all responsibility")
     
     if not click.confirm("\n Apply VMAX removal to bin file?", default=False):
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     # Select input file
@@ -6299,16 +6591,14 @@ def advanced_vmax_removal():
     except Exception as e:
         click.echo(f"\n Error: {e}")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_rpm_limiter():
     """RPM limiter adjustment."""
     from . import map_patcher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== RPM Limiter Adjustment ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== RPM Limiter Adjustment ===\n{_H70}")
     
     click.echo("\n Adjust RPM limiter settings")
     click.echo("\nStock soft cut: 7000 RPM")
@@ -6323,7 +6613,7 @@ def advanced_rpm_limiter():
     if target_rpm > 7500:
         click.echo("\n  WARNING: RPM > 7500 requires strengthened internals!")
         if not click.confirm("Continue anyway?", default=False):
-            input("\nPress Enter to continue...")
+            _pause()
             return
     
     # Select input file
@@ -6355,14 +6645,12 @@ def advanced_rpm_limiter():
     except Exception as e:
         click.echo(f"\n Error: {e}")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_launch_control():
     """Launch control configuration."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Launch Control ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Launch Control ===\n{_H70}")
     
     click.echo("\n🚧 COMING SOON!")
     click.echo("\nLaunch control features in development:")
@@ -6374,14 +6662,12 @@ def advanced_launch_control():
     click.echo("\nStatus: Awaiting map offset discovery")
     click.echo("See: docs/PROJECT_STATUS.md for feature status")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_rolling_antilag():
     """Rolling anti-lag configuration."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Rolling Anti-Lag ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Rolling Anti-Lag ===\n{_H70}")
     
     click.echo("\n🚧 COMING SOON!")
     click.echo("\nRolling anti-lag features:")
@@ -6391,14 +6677,12 @@ def advanced_rolling_antilag():
     click.echo("  - Turbo spool maintenance")
     click.echo("\nStatus: Awaiting map offset discovery")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_cold_start():
     """Cold start options."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Cold Start Options ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Cold Start Options ===\n{_H70}")
     
     click.echo("\n❄  Cold start tuning options:")
     click.echo("\nAvailable modifications:")
@@ -6410,14 +6694,12 @@ def advanced_cold_start():
     click.echo("DTC disable (catalyst/O2) available now")
     click.echo("Other features require map discovery")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_sport_display():
     """Sport display customization."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Sport Display Customization ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Sport Display Customization ===\n{_H70}")
     
     click.echo("\n🚧 COMING SOON!")
     click.echo("\nSport display features:")
@@ -6427,16 +6709,14 @@ def advanced_sport_display():
     click.echo("  - Lap timer integration")
     click.echo("\nStatus: Awaiting CAN message discovery")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_dtc_management():
     """DTC/Codeword management."""
     from . import map_patcher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== DTC/Codeword Management ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== DTC/Codeword Management ===\n{_H70}")
     
     click.echo("\n Disable unwanted diagnostic trouble codes")
     click.echo("\nAvailable DTC disables:")
@@ -6450,7 +6730,7 @@ def advanced_dtc_management():
     click.echo("  - SAI delete")
     
     if not click.confirm("\n Apply DTC disable patch?", default=False):
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     bin_file = click.prompt("Enter path to bin file", type=click.Path(exists=True))
@@ -6480,16 +6760,14 @@ def advanced_dtc_management():
     except Exception as e:
         click.echo(f"\n Error: {e}")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_stage_presets():
     """Apply stage presets."""
     from . import map_patcher
     
-    click.echo("\n" + "="*70)
-    click.echo("=== Stage Preset Application ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Stage Preset Application ===\n{_H70}")
     
     click.echo("\n Apply complete tuning stage presets")
     click.echo("\nAvailable presets:")
@@ -6509,7 +6787,7 @@ def advanced_stage_presets():
     
     if stage_choice not in [1, 2]:
         click.echo(" Invalid stage")
-        input("\nPress Enter to continue...")
+        _pause()
         return
     
     bin_file = click.prompt("Enter path to bin file", type=click.Path(exists=True))
@@ -6561,14 +6839,12 @@ def advanced_stage_presets():
     except Exception as e:
         click.echo(f"\n Error: {e}")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_custom_patch_builder():
     """Custom patch builder."""
-    click.echo("\n" + "="*70)
-    click.echo("=== Custom Patch Builder ===")
-    click.echo("="*70)
+    click.echo(f"\n{_H70}\n=== Custom Patch Builder ===\n{_H70}")
     
     click.echo("\n Build custom patch combinations")
     click.echo("\n🚧 COMING SOON!")
@@ -6580,7 +6856,7 @@ def advanced_custom_patch_builder():
     click.echo("  - Patch conflict detection")
     click.echo("\nFor now, use individual feature options above")
     
-    input("\nPress Enter to continue...")
+    _pause()
 
 
 def advanced_accel_logger_menu():
@@ -6588,9 +6864,7 @@ def advanced_accel_logger_menu():
     from . import accel_logger as _accel_mod
     global _accel_logger
 
-    click.echo("\n" + "="*60)
-    click.echo("=== Acceleration Logger ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Acceleration Logger ===\n{_H60}")
 
     while True:
         click.echo("\n1. Start Auto Monitor")
@@ -6856,9 +7130,7 @@ def advanced_data_logger_menu():
         if file_path:
             click.echo(f"Current log file: {file_path}")
 
-    click.echo("\n" + "="*60)
-    click.echo("=== Data Logger (Continuous OBD/UDS Logging) ===")
-    click.echo("="*60)
+    click.echo(f"\n{_H60}\n=== Data Logger (Continuous OBD/UDS Logging) ===\n{_H60}")
 
     while True:
         click.echo("\n1. Start logging with preset PIDs")
@@ -6923,5 +7195,23 @@ def cleanup():
     click.echo("\nGoodbye!")
 
 
-if __name__ == '__main__':
+@click.command()
+@click.option('--batch', '--no-prompt', 'batch', is_flag=True,
+              help="Don't wait for Enter after each operation (scripted runs).")
+@click.option('--cf-min-gap-ms', type=click.FloatRange(min=0), default=DirectCANFlasher.CF_MIN_GAP * 1000,
+              show_default=True, help="Minimum gap between ISO-TP consecutive frames, in milliseconds "
+                                      "(the ECU's STmin applies when larger).")
+@click.option('--can-fd', is_flag=True,
+              help="Open the adapter in CAN-FD mode and use 64-byte ISO-TP frames. "
+                   "MSD80/MSD81 PT-CAN is classic CAN; only for FD-capable gateways.")
+def main(batch: bool, cf_min_gap_ms: float, can_fd: bool):
+    """BMW N54 Flash Tool interactive CLI."""
+    set_batch_mode(batch)
+    # Frame pacing is per CAN interface; applies to every flasher created this run
+    DirectCANFlasher.CF_MIN_GAP = cf_min_gap_ms / 1000
+    DirectCANFlasher.CAN_FD = can_fd
     main_menu()
+
+
+if __name__ == '__main__':
+    main()
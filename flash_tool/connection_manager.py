@@ -27,17 +27,44 @@ Variables (Module-level):
 import os
 import configparser
 from typing import Optional, Dict, Any, List, Tuple, TypedDict, Protocol
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 from . import com_scanner
 from . import bmw_modules
+from . import obd_reader
 from .uds_client import UDSClient
 from .direct_can_flasher import UDSService
 
 logger = logging.getLogger(__name__)
 
 
+def _ping_module(uds: UDSClient, module: bmw_modules.BMWModule,
+                 read_dtcs: bool = False) -> Tuple[bool, List["obd_reader.DTC"]]:
+    """
+    Send TesterPresent (0x3E) to one module over the shared UDS client.
+
+    With read_dtcs, a module that answers is also asked for its DTCs on the
+    same client, so the scan needs a single pass over the modules.
+
+    Returns:
+        (responding, dtcs)
+    """
+    try:
+        res = uds.send_raw(module, UDSService(0x3E), b"\x00")
+    except Exception:
+        return False, []
+    if not (res and res[0]):
+        return False, []
+    if not read_dtcs:
+        return True, []
+    try:
+        return True, obd_reader.read_dtcs_from_module(module, uds_client=uds)
+    except Exception as e:
+        logger.error(f"Failed to read DTCs from {module.abbreviation}: {e}")
+        return True, []
+
+
 class Adapter(Protocol):
     """Protocol for connection adapters that can be managed.
     
@@ -424,8 +451,10 @@ class ConnectionManager:
     class ModulePingResult:
         module: bmw_modules.BMWModule
         responding: bool
+        dtcs: List["obd_reader.DTC"] = field(default_factory=list)
 
-    def scan_all_modules(self, protocol: str = "CAN") -> List["ConnectionManager.ModulePingResult"]:
+    def scan_all_modules(self, protocol: str = "CAN",
+                         read_dtcs: bool = False) -> List["ConnectionManager.ModulePingResult"]:
         """
         Scan for active BMW modules on the vehicle bus (Task 1.1.3).
         
@@ -434,9 +463,10 @@ class ConnectionManager:
         
         Args:
             protocol: Protocol to scan - "CAN" for UDS/CAN modules, "KLINE" for K-line modules, "ALL" for both
+            read_dtcs: Also read DTCs from each responding CAN module in the same pass
         
         Returns:
-            List of tuples (module, is_responding) for each scanned module
+            List of ModulePingResult (module, responding, dtcs) for each scanned module
         """
         results: List[ConnectionManager.ModulePingResult] = []
         
@@ -445,16 +475,13 @@ class ConnectionManager:
             can_modules = bmw_modules.get_can_modules()
             print(f"\nScanning {len(can_modules)} CAN modules (Tester Present)...")
 
+            # Modules share one tester ID pair, so probes go out one at a time
             uds = UDSClient()
             if uds.connect():
                 try:
                     for module in can_modules:
-                        try:
-                            res = uds.send_raw(module, UDSService(0x3E), b"\x00")
-                            responding = bool(res and res[0])
-                        except Exception:
-                            responding = False
-                        results.append(ConnectionManager.ModulePingResult(module=module, responding=responding))
+                        responding, dtcs = _ping_module(uds, module, read_dtcs)
+                        results.append(ConnectionManager.ModulePingResult(module=module, responding=responding, dtcs=dtcs))
                 finally:
                     try:
                         uds.disconnect()
@@ -476,6 +503,18 @@ class ConnectionManager:
         
         return results
     
+    def scan_and_read_dtcs(self, protocol: str = "CAN") -> List["ConnectionManager.ModulePingResult"]:
+        """
+        Ping every module and read DTCs from the ones that answer, in one pass.
+        
+        Args:
+            protocol: Same as scan_all_modules()
+        
+        Returns:
+            List of ModulePingResult with dtcs populated for responding modules
+        """
+        return self.scan_all_modules(protocol, read_dtcs=True)
+    
     def get_responding_modules(self) -> List[bmw_modules.BMWModule]:
         """
         Get list of modules that responded to last scan.
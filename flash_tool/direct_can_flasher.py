@@ -46,9 +46,11 @@ Requirements:
     - K+DCAN cable with CAN-capable firmware
 """
 
+import mmap
 import struct
 import time
 import logging
+import zlib
 from typing import Optional, List, Tuple, Dict, Callable, Type
 from pathlib import Path
 from enum import IntEnum
@@ -59,6 +61,7 @@ from types import TracebackType
 from .can_adapter import create_bus, Message, BusABC, CAN_AVAILABLE
 
 from . import bmw_checksum
+from . import security
 from .flash_safety import (
     WriteResult, FlashSafetyError, WriteFailureError,
     SecurityAccessError, ChecksumMismatchError, SessionLostError,
@@ -283,10 +286,15 @@ class DirectCANFlasher:
     RESPONSE_PENDING_TIMEOUT = 2.0  # Timeout for each 0x78 pending response
     MAX_PENDING_RETRIES = 10  # Max retries for response pending
     MAX_SESSION_RECOVERIES = 3  # Max recovery attempts when session is lost
+    CF_MIN_GAP = 0.001  # Minimum gap between consecutive frames, even when the ECU's STmin is 0
+    MAX_FC_WAITS = 10  # Flow Control WAIT frames tolerated before giving up (N_WFTmax)
+    CAN_FD = False  # Opt-in CAN-FD (64-byte frames); MSD80/MSD81 PT-CAN is classic 500k
+    FD_FRAME_LENGTHS = (8, 12, 16, 20, 24, 32, 48, 64)  # Valid CAN-FD payload sizes
+    VERIFY_PROGRESS_START = 90  # Percent where readback verification takes over the progress bar
     
     def __init__(self, interface: str = 'pcan', channel: str = 'PCAN_USBBUS1', 
                  bitrate: int = CAN_BITRATE, ecu_type: str = 'MSD80',
-                 connection_manager=None):
+                 connection_manager=None, can_fd: Optional[bool] = None):
         """
         Initialize direct CAN flasher.
         
@@ -295,12 +303,14 @@ class DirectCANFlasher:
             channel: CAN channel/device
             bitrate: CAN bitrate (default 500000)
             connection_manager: Optional ConnectionManager instance for auto-registration
+            can_fd: Use CAN-FD ISO-TP framing; defaults to the CAN_FD class setting
         """
         # Defer CAN availability check to connect() to allow mocking in tests
         self.interface = interface
         self.channel = channel
         self.bitrate = bitrate
         self._connection_manager = connection_manager
+        self.can_fd = self.CAN_FD if can_fd is None else can_fd
 
         # ECU type selection (MSD80 or MSD81) — instance-level overrides
         self.ecu_type = (ecu_type or 'MSD80').upper()
@@ -341,8 +351,19 @@ class DirectCANFlasher:
         try:
             logger.info(f"Connecting to CAN bus: {self.interface} {self.channel}")
 
-            self.bus = create_bus(interface=self.interface, channel=self.channel, bitrate=self.bitrate)
-            logger.info("CAN bus connected successfully")
+            self.bus = None
+            if self.can_fd:
+                # No probing on the vehicle bus: FD frames are form errors to
+                # classic nodes. Only fall back if the adapter can't open in FD.
+                try:
+                    self.bus = create_bus(interface=self.interface, channel=self.channel,
+                                          bitrate=self.bitrate, fd=True)
+                except OSError as e:
+                    logger.warning(f"Could not open CAN-FD bus ({e}); falling back to classic CAN")
+                    self.can_fd = False
+            if self.bus is None:
+                self.bus = create_bus(interface=self.interface, channel=self.channel, bitrate=self.bitrate)
+            logger.info(f"CAN bus connected successfully ({'CAN-FD' if self.can_fd else 'classic CAN'})")
             
             # Auto-register with connection_manager if provided
             if self._connection_manager:
@@ -381,7 +402,7 @@ class DirectCANFlasher:
         Send ISO-TP message and receive response.
         
         Implements ISO 15765-2 multi-frame protocol:
-        - Single frame: data length ≤ 7 bytes
+        - Single frame: data length ≤ 7 bytes (≤ 62 on CAN-FD)
         - Multi-frame: First frame + consecutive frames with flow control
         
         Args:
@@ -395,7 +416,7 @@ class DirectCANFlasher:
             raise RuntimeError("CAN bus not connected")
         
         # Send data
-        if len(data) <= 7:
+        if len(data) <= (62 if self.can_fd else 7):
             # Single frame
             self._send_single_frame(data)
         else:
@@ -405,63 +426,101 @@ class DirectCANFlasher:
         # Receive response
         return self._receive_isotp_message(timeout)
     
-    def _send_single_frame(self, data: bytes):
-        """Send single-frame ISO-TP message."""
-        frame_data = bytes([self.ISOTP_SINGLE_FRAME | len(data)]) + data
-        frame_data += b'\x00' * (8 - len(frame_data))  # Pad to 8 bytes
-        
-        msg = Message(
+    def _frame(self, payload: bytes) -> 'Message':
+        """Build a TX frame padded to 8 bytes, or to the next valid CAN-FD length."""
+        size = next(n for n in self.FD_FRAME_LENGTHS if n >= len(payload)) if self.can_fd else 8
+        return Message(
             arbitration_id=self.ECU_TX_ID,
-            data=frame_data,
-            is_extended_id=False
+            data=payload + b'\x00' * (size - len(payload)),
+            is_extended_id=False,
+            is_fd=self.can_fd,
+            bitrate_switch=self.can_fd
         )
+    
+    def _send_single_frame(self, data: bytes):
+        """Send single-frame ISO-TP message."""
+        if len(data) <= 7:
+            pci = bytes([self.ISOTP_SINGLE_FRAME | len(data)])
+        else:
+            # CAN-FD single frame: length moves to the second PCI byte
+            pci = bytes([self.ISOTP_SINGLE_FRAME, len(data)])
         
+        msg = self._frame(pci + data)
         self.bus.send(msg)
         logger.debug(f"[TX] {msg.arbitration_id:03X} [{' '.join(f'{b:02X}' for b in msg.data)}]")
     
     def _send_multi_frame(self, data: bytes):
         """Send multi-frame ISO-TP message."""
-        # First frame
+        # First frame; frames carry 8 bytes on classic CAN, 64 on CAN-FD
+        frame_len = 64 if self.can_fd else 8
         data_length = len(data)
         first_frame = bytes([
             self.ISOTP_FIRST_FRAME | ((data_length >> 8) & 0x0F),
             data_length & 0xFF
-        ]) + data[:6]
+        ]) + data[:frame_len - 2]
         
-        msg = Message(
-            arbitration_id=self.ECU_TX_ID,
-            data=first_frame,
-            is_extended_id=False
-        )
+        msg = self._frame(first_frame)
         self.bus.send(msg)
         logger.debug(f"[TX] FF: {msg.arbitration_id:03X} [{' '.join(f'{b:02X}' for b in msg.data)}]")
         
-        # Wait for flow control
-        flow_control = self._wait_for_flow_control()
-        if not flow_control:
-            raise RuntimeError("No flow control received")
-        
-        # Send consecutive frames
-        remaining_data = data[6:]
+        # Wait for flow control; it sets the block size and the CF spacing
+        block_size, gap = self._await_clear_to_send()
         sequence = 1
-        
-        while remaining_data:
-            chunk = remaining_data[:7]
-            remaining_data = remaining_data[7:]
+        sent_in_block = 0
+        first_in_block = True
+        
+        for offset in range(frame_len - 2, data_length, frame_len - 1):
+            if block_size and sent_in_block == block_size:
+                # Block complete: the ECU sends a new FC before the next block
+                block_size, gap = self._await_clear_to_send()
+                sent_in_block = 0
+                first_in_block = True
+            if not first_in_block:
+                time.sleep(gap)
+            first_in_block = False
             
-            cf_data = bytes([self.ISOTP_CONSECUTIVE_FRAME | (sequence & 0x0F)]) + chunk
-            cf_data += b'\x00' * (8 - len(cf_data))  # Pad
-            
-            msg = Message(
-                arbitration_id=self.ECU_TX_ID,
-                data=cf_data,
-                is_extended_id=False
-            )
+            chunk = data[offset:offset + frame_len - 1]
+            msg = self._frame(bytes([self.ISOTP_CONSECUTIVE_FRAME | (sequence & 0x0F)]) + chunk)
             self.bus.send(msg)
             logger.debug(f"[TX] CF: {msg.arbitration_id:03X} [{' '.join(f'{b:02X}' for b in msg.data)}]")
             
             sequence = (sequence + 1) % 16
-            time.sleep(0.001)  # Small delay between frames
+            sent_in_block += 1
+    
+    def _await_clear_to_send(self) -> Tuple[int, float]:
+        """
+        Wait for a Flow Control ClearToSend frame.
+        
+        Returns:
+            (block_size, gap): consecutive frames allowed before the next FC
+            (0 = no limit) and the delay to keep between them in seconds
+        
+        Raises:
+            RuntimeError: If no FC arrives, the ECU reports overflow, or it
+                keeps answering WAIT
+        """
+        for _ in range(self.MAX_FC_WAITS + 1):
+            flow_control = self._wait_for_flow_control()
+            if not flow_control:
+                raise RuntimeError("No flow control received")
+            
+            flow_status = flow_control[0] & 0x0F
+            if flow_status == 0x00:  # ClearToSend
+                block_size = flow_control[1] if len(flow_control) > 1 else 0
+                st_min = flow_control[2] if len(flow_control) > 2 else 0
+                if st_min <= 0x7F:
+                    separation = st_min / 1000  # 0-127 ms
+                elif 0xF1 <= st_min <= 0xF9:
+                    separation = (st_min - 0xF0) / 10000  # 100-900 us
+                else:
+                    separation = 0x7F / 1000  # Reserved values: use the maximum
+                return block_size, max(separation, self.CF_MIN_GAP)
+            if flow_status == 0x02:
+                raise RuntimeError("Flow control overflow: ECU cannot accept message")
+            # 0x01 Wait: the ECU needs more time and will send another FC
+            logger.debug("[RX] FC WAIT")
+        
+        raise RuntimeError("Too many flow control WAIT frames")
     
     def _wait_for_flow_control(self, timeout: float = 1.0) -> Optional[bytes]:
         """Wait for flow control frame."""
@@ -492,14 +551,18 @@ class DirectCANFlasher:
             # Single frame
             if frame_type == self.ISOTP_SINGLE_FRAME:
                 length = msg.data[0] & 0x0F
-                data = msg.data[1:1+length]
+                if length == 0 and len(msg.data) > 8:
+                    # CAN-FD single frame: length in the second PCI byte
+                    data = msg.data[2:2+msg.data[1]]
+                else:
+                    data = msg.data[1:1+length]
                 logger.debug(f"[RX] SF: {msg.arbitration_id:03X} [{' '.join(f'{b:02X}' for b in msg.data)}]")
                 return data
             
             # First frame (multi-frame response)
             elif frame_type == self.ISOTP_FIRST_FRAME:
                 total_length = ((msg.data[0] & 0x0F) << 8) | msg.data[1]
-                data = bytearray(msg.data[2:8])
+                data = bytearray(msg.data[2:2+total_length])
                 logger.debug(f"[RX] FF: {msg.arbitration_id:03X} [{' '.join(f'{b:02X}' for b in msg.data)}]")
                 
                 # Send flow control
@@ -520,7 +583,7 @@ class DirectCANFlasher:
                     if sequence != expected_sequence:
                         logger.warning(f"Sequence mismatch: expected {expected_sequence}, got {sequence}")
                     
-                    chunk_length = min(7, total_length - len(data))
+                    chunk_length = min(len(cf_msg.data) - 1, total_length - len(data))
                     data.extend(cf_msg.data[1:1+chunk_length])
                     logger.debug(f"[RX] CF: {cf_msg.arbitration_id:03X} [{' '.join(f'{b:02X}' for b in cf_msg.data)}]")
                     
@@ -551,13 +614,9 @@ class DirectCANFlasher:
             self.ISOTP_FLOW_CONTROL,  # Flow status: ContinueToSend
             0x00,  # Block size: 0 = no limit
             0x00   # Separation time: 0ms
-        ]) + b'\x00' * 5
+        ])
         
-        msg = Message(
-            arbitration_id=self.ECU_TX_ID,
-            data=fc_data,
-            is_extended_id=False
-        )
+        msg = self._frame(fc_data)
         self.bus.send(msg)
         logger.debug(f"[TX] FC: {msg.arbitration_id:03X} [{' '.join(f'{b:02X}' for b in msg.data)}]")
     
@@ -1156,17 +1215,9 @@ class DirectCANFlasher:
         
         Source: Analyzed from BMW tuning community research
         """
-        if len(seed) != 4:
-            raise ValueError(f"Seed must be 4 bytes, got {len(seed)}")
-        
-        key = bytearray(4)
-        key[0] = seed[0] ^ 0x48  # 'H' XOR
-        key[1] = seed[1] ^ 0x4D  # 'M' XOR
-        key[2] = seed[2] ^ seed[0]  # Cross-XOR with seed[0]
-        key[3] = seed[3] ^ seed[1]  # Cross-XOR with seed[1]
-        
+        key = security.compute_key('v1', seed)
         logger.info(f"Algorithm V1: seed={seed.hex()} -> key={key.hex()}")
-        return bytes(key)
+        return key
     
     def _calculate_key_v2(self, seed: bytes) -> bytes:
         """
@@ -1175,21 +1226,9 @@ class DirectCANFlasher:
         
         Alternative algorithm for some MSD80 variants.
         """
-        if len(seed) != 4:
-            raise ValueError(f"Seed must be 4 bytes, got {len(seed)}")
-        
-        # Rotate bytes (swap pairs)
-        rotated = bytearray([seed[1], seed[0], seed[3], seed[2]])
-        
-        # XOR with repeating MH pattern
-        key = bytearray(4)
-        key[0] = rotated[0] ^ 0x4D  # 'M'
-        key[1] = rotated[1] ^ 0x48  # 'H'
-        key[2] = rotated[2] ^ 0x4D  # 'M'
-        key[3] = rotated[3] ^ 0x48  # 'H'
-        
-        logger.info(f"Algorithm V2: seed={seed.hex()} -> rotated={rotated.hex()} -> key={key.hex()}")
-        return bytes(key)
+        key = security.compute_key('v2', seed)
+        logger.info(f"Algorithm V2: seed={seed.hex()} -> key={key.hex()}")
+        return key
     
     def _calculate_key_v3(self, seed: bytes) -> bytes:
         """
@@ -1198,18 +1237,9 @@ class DirectCANFlasher:
         
         Found in firmware analysis.
         """
-        if len(seed) != 4:
-            raise ValueError(f"Seed must be 4 bytes, got {len(seed)}")
-        
-        # XOR with repeating BM pattern
-        key = bytearray(4)
-        key[0] = seed[0] ^ 0x42  # 'B'
-        key[1] = seed[1] ^ 0x4D  # 'M'
-        key[2] = seed[2] ^ 0x42  # 'B'
-        key[3] = seed[3] ^ 0x4D  # 'M'
-        
+        key = security.compute_key('v3', seed)
         logger.info(f"Algorithm V3: seed={seed.hex()} -> key={key.hex()}")
-        return bytes(key)
+        return key
     
     def unlock_ecu(self, try_all_algorithms: bool = True, try_all_levels: bool = True) -> bool:
         """
@@ -1754,10 +1784,69 @@ class DirectCANFlasher:
 
     def flash_calibration_region(self, data: bytes, verify: bool = True,
                                  progress_callback: Optional[Callable[[str, int], None]] = None) -> bool:
-        """Compatibility wrapper that returns bool for uds_handler expectations."""
-        result = self.flash_calibration(data, progress_callback=progress_callback)
-        # Optionally a post-read verify could be added if verify=True; for now, rely on ECU-side checks
-        return result == WriteResult.SUCCESS
+        """Compatibility wrapper that returns bool for uds_handler expectations.
+
+        With verify=True the flashed region is read back and compared block by
+        block (see _verify_readback) on top of the ECU-side checksum routine.
+        The flash then reports 0-VERIFY_PROGRESS_START percent and the
+        readback the rest, so progress never starts over.
+        """
+        def scaled_progress(message: str, percent: int) -> None:
+            progress_callback(message, percent * self.VERIFY_PROGRESS_START // 100)
+
+        flash_progress = scaled_progress if verify and progress_callback else progress_callback
+        result = self.flash_calibration(data, progress_callback=flash_progress)
+        if result != WriteResult.SUCCESS:
+            return False
+        return not verify or self._verify_readback(data, self.SECTOR_CALIBRATION_START, progress_callback,
+                                                   start_percent=self.VERIFY_PROGRESS_START)
+
+    def _verify_readback(self, data: bytes, address: int,
+                         progress_callback: Optional[Callable[[str, int], None]] = None,
+                         start_percent: int = 0) -> bool:
+        """
+        Read a flashed region back (UDS 0x23) and compare CRC32s per block.
+        
+        UDS does not allow ReadMemoryByAddress while a download is open, so
+        this runs after RequestTransferExit rather than interleaved with the
+        TransferData blocks. Only CRCs are compared, over memoryview slices
+        of the written image, so nothing is copied on the host side.
+        
+        Readback is optional on the ECU side: if a block cannot be read (0x23
+        rejected, negative response, security not granted, short reply) the
+        check is skipped with a warning and the ECU checksum routine stands.
+        
+        Args:
+            data: Image that was written
+            address: Start address it was written to
+            progress_callback: Optional callback(message, percent)
+            start_percent: Percent the verification phase starts at; it
+                reports from there up to 100
+            
+        Returns:
+            bool: False only if a block reads back with a different CRC32
+        """
+        view = memoryview(data)
+        size = len(view)
+        block_size = self.MAX_TRANSFER_SIZE
+        for offset in range(0, size, block_size):
+            expected = view[offset:offset + block_size]
+            block = self.read_memory(address + offset, len(expected))
+            if block is None or len(block) != len(expected):
+                logger.warning(f"[WARNING] Readback unavailable at 0x{address + offset:08X}; "
+                               "skipping verification (ECU checksum routine already passed)")
+                if progress_callback:
+                    progress_callback("Readback unavailable, verification skipped", 100)
+                return True
+            if zlib.crc32(block) != zlib.crc32(expected):
+                logger.error(f"[FAILURE] Readback mismatch at 0x{address + offset:08X}")
+                return False
+            if progress_callback:
+                done = offset + len(expected)
+                progress_callback(f"Verifying readback... {done}/{size} bytes",
+                                  start_percent + done * (100 - start_percent) // size)
+        logger.info(f"[OK] Readback verified: {size} bytes")
+        return True
     
     # ========================================================================
     # High-Level Flash Operations
@@ -1892,7 +1981,7 @@ class DirectCANFlasher:
         - Never swallows errors
         
         Args:
-            cal_data: Calibration data (512 KB for MSD80)
+            cal_data: Calibration data (512 KB for MSD80); any bytes-like object
             progress_callback: Optional callback(message, percent)
             
         Returns:
@@ -2005,10 +2094,12 @@ class DirectCANFlasher:
         offset = 0
         total_blocks = (len(cal_data) + block_size - 1) // block_size
         
+        view = memoryview(cal_data)
         try:
             self.start_tester_present()
             while offset < len(cal_data):
-                chunk = cal_data[offset:offset + block_size]
+                # O(1) slice of the caller's buffer; the only copy is into the 0x36 request
+                chunk = view[offset:offset + block_size]
                 
                 self.transfer_data(block_sequence, chunk)
                 
@@ -2358,10 +2449,37 @@ class DirectCANFlasher:
             logger.error(error_msg)
             raise FlashSafetyError(error_msg, remediation="Verify the file path and try again.")
 
-        data = bin_file.read_bytes()
+        # An empty file cannot be mapped; reject it here with the same
+        # validation failure _flash_full_image reports for a bad size
+        if bin_file.stat().st_size == 0:
+            error_msg = "[FAILURE] ABORTING: Binary file validation failed.\nBinary data is empty."
+            logger.error(error_msg)
+            raise FlashSafetyError(
+                error_msg,
+                remediation="Ensure the firmware binary is correct for MSD80 and not corrupted."
+            )
 
+        # Map the image read-only; region and block slices below are views
+        # into the page cache rather than copies of a 2MB bytes object
+        with open(bin_file, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(mm)
+        try:
+            return self._flash_full_image(bin_file, data, progress_callback)
+        finally:
+            data.release()
+            try:
+                mm.close()
+            except BufferError:
+                # A propagating traceback still holds block views; the
+                # mapping is released once those frames are collected
+                pass
+
+    def _flash_full_image(self, bin_file: Path, data: memoryview,
+                          progress_callback: Optional[Callable[[str, int], None]]) -> WriteResult:
+        """Flash a mapped full binary image (body of flash_full_binary)."""
         # File validation (size and basic sanity)
-        valid, errors = self.binary_validator.validate_binary_file(bin_file)
+        valid, errors = self.binary_validator.validate_binary_data(data)
         if not valid:
             error_msg = "[FAILURE] ABORTING: Binary file validation failed.\n" + "\n".join(errors)
             logger.error(error_msg)
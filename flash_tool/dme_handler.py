@@ -25,13 +25,16 @@ Classes:
     DMEError(Exception) - DME operation failures
 
 Functions:
-    read_ecu_identification() -> Dict[str, Any]
-    read_injector_codes() -> Dict[str, Any]
-    read_vanos_data() -> Dict[str, Any]
-    read_boost_data() -> Dict[str, Any]
-    read_dme_errors() -> List[Dict[str, str]]
-    clear_dme_errors() -> bool
+    read_ecu_identification(flasher: Optional[DirectCANFlasher]) -> Dict[str, Any]
+    read_injector_codes(flasher: Optional[DirectCANFlasher]) -> Dict[str, Any]
+    read_vanos_data(flasher: Optional[DirectCANFlasher]) -> Dict[str, Any]
+    read_boost_data(flasher: Optional[DirectCANFlasher]) -> Dict[str, Any]
+    read_dme_errors(flasher: Optional[DirectCANFlasher]) -> List[obd_reader.DTC]
+    clear_dme_errors(flasher: Optional[DirectCANFlasher]) -> bool
     get_vin_from_ecu(use_cache: bool) -> str
+    open_session() -> ContextManager[Optional[DirectCANFlasher]]
+    read_dme_snapshot_async(flasher: Optional[DirectCANFlasher]) -> Dict[str, Any]
+    read_dme_snapshot(flasher: Optional[DirectCANFlasher]) -> Dict[str, Any]
 
 Variables (Module-level):
     logger: logging.Logger - Module logger
@@ -39,8 +42,12 @@ Variables (Module-level):
     _cache_timeout: int = 300 - Cache TTL in seconds
 """
 
-from typing import Dict, List, Any, Optional
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterator, List, Any, Optional
+import asyncio
+import functools
 import logging
+import threading
 import time
 from .uds_client import UDSClient
 from .direct_can_flasher import DirectCANFlasher, WriteResult
@@ -53,6 +60,10 @@ logger = logging.getLogger(__name__)
 _ecu_ident_cache = {}
 _cache_timeout = 300  # 5 minutes
 
+# The DME answers one diagnostic request at a time, so reads issued from
+# worker threads must not interleave on its ISO-TP channel
+_dme_lock = threading.Lock()
+
 
 class DMEError(Exception):
     """Raised when DME operation fails"""
@@ -100,12 +111,72 @@ def _get_ecu_connection():
     return uds
 
 
-def read_ecu_identification() -> Dict[str, Any]:
+def _drain_rx(bus) -> None:
+    """Drop frames left on a held bus by an earlier request that timed out."""
+    try:
+        while bus.recv(timeout=0) is not None:
+            pass
+    except Exception as exc:
+        logger.debug(f"Failed to drain CAN receive queue: {exc}")
+
+
+@contextmanager
+def _use_uds(flasher: Optional[DirectCANFlasher]) -> Iterator[UDSClient]:
+    """
+    Yield a UDSClient on `flasher`'s bus, or a new connection closed after the block.
+
+    A borrowed bus is left open; it belongs to the session that passed it in.
+    """
+    if flasher is not None:
+        _drain_rx(flasher.bus)
+        yield UDSClient(bus=flasher.bus)
+        return
+
+    uds = _get_ecu_connection()
+    try:
+        yield uds
+    finally:
+        try:
+            uds.disconnect()
+        except Exception as exc:
+            logger.debug(f"Failed to disconnect UDS client: {exc}")
+
+
+@contextmanager
+def _use_flasher(flasher: Optional[DirectCANFlasher]) -> Iterator[DirectCANFlasher]:
+    """
+    Yield `flasher` unchanged, or connect a new one for the block and close it.
+
+    Reads given an open session flasher must not open the CAN channel again:
+    PCAN allows one open per channel.
+    """
+    if flasher is not None:
+        _drain_rx(flasher.bus)
+        yield flasher
+        return
+
+    own = DirectCANFlasher()
+    if not own.connect():
+        raise DMEError("Unable to connect to ECU over CAN")
+    try:
+        yield own
+    finally:
+        try:
+            own.disconnect()
+        except Exception as exc:
+            logger.debug(f"Failed to disconnect flasher: {exc}")
+
+
+def read_ecu_identification(flasher: Optional[DirectCANFlasher] = None) -> Dict[str, Any]:
     """
     Read ECU identification information (software part numbers, VIN, dates).
     
     Uses native BMW N54 protocol via CAN bus.
     
+    Args:
+        flasher: Open DirectCANFlasher to use (e.g. from open_session());
+            a connection is opened and closed for this call when omitted
+    
     Returns:
         Dictionary with identification data:
         {
@@ -128,16 +199,8 @@ def read_ecu_identification() -> Dict[str, Any]:
     logger.info("Reading ECU identification via UDS...")
     try:
         # Use direct flasher for VIN retrieval
-        flasher = DirectCANFlasher()
-        if not flasher.connect():
-            raise DMEError("Unable to connect to ECU over CAN")
-        try:
+        with _use_flasher(flasher) as flasher:
             vin = flasher.read_vin() or 'Unknown'
-        finally:
-            try:
-                flasher.disconnect()
-            except Exception as exc:
-                logger.debug(f"Failed to disconnect flasher: {exc}")
         ident_norm = {
             'VIN': vin,
             'SW_REF': 'Unknown',
@@ -150,13 +213,17 @@ def read_ecu_identification() -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error reading ECU identification: {e}")
         raise DMEError(f"Failed to read ECU identification: {e}")
-def read_injector_codes() -> Dict[str, Any]:
+def read_injector_codes(flasher: Optional[DirectCANFlasher] = None) -> Dict[str, Any]:
     """
     Read injector correction codes (IKS - Injektorkorrekturwerte).
     
     Uses UDS ReadDataByIdentifier (0x22) with DID 0x0600.
     Reads correction values for 6 injectors (cylinders 1-6).
     
+    Args:
+        flasher: Open DirectCANFlasher to use (e.g. from open_session());
+            a connection is opened and closed for this call when omitted
+    
     Returns:
         Dictionary with injector data:
         {
@@ -179,11 +246,7 @@ def read_injector_codes() -> Dict[str, Any]:
     logger.info("Reading injector correction codes via UDS DID 0x0600...")
     try:
         # Connect via DirectCANFlasher (native BMW protocol)
-        flasher = DirectCANFlasher()
-        if not flasher.connect():
-            raise DMEError("Unable to connect to ECU over CAN")
-        
-        try:
+        with _use_flasher(flasher) as flasher:
             # Read DID 0x0600 (Injector Correction Codes)
             # Expected: 12 bytes (6 injectors × 2 bytes each, big-endian)
             did_data = flasher.read_did(0x0600)
@@ -206,12 +269,6 @@ def read_injector_codes() -> Dict[str, Any]:
             
             logger.info(f"Injector codes read successfully: {injector_values}")
             return injector_values
-            
-        finally:
-            try:
-                flasher.disconnect()
-            except Exception as exc:
-                logger.debug(f"Failed to disconnect flasher after injector read: {exc}")
     
     except DMEError:
         raise
@@ -457,7 +514,7 @@ def verify_injector_codes_did() -> Dict[str, Any]:
         }
 
 
-def read_vanos_data() -> Dict[str, Any]:
+def read_vanos_data(flasher: Optional[DirectCANFlasher] = None) -> Dict[str, Any]:
     """
     Read VANOS system timing and calibration data.
     
@@ -466,6 +523,10 @@ def read_vanos_data() -> Dict[str, Any]:
     
     Uses UDS ReadDataByIdentifier (0x22) with BMW-specific DIDs.
     
+    Args:
+        flasher: Open DirectCANFlasher to use (e.g. from open_session());
+            a connection is opened and closed for this call when omitted
+    
     Returns:
         Dictionary with VANOS data:
         {
@@ -502,11 +563,7 @@ def read_vanos_data() -> Dict[str, Any]:
     
     logger.info("Reading VANOS data via UDS/CAN...")
     
-    flasher = DirectCANFlasher()
-    if not flasher.connect():
-        raise DMEError("Unable to connect to ECU over CAN")
-    
-    try:
+    with _use_flasher(flasher) as flasher:
         vanos_data: Dict[str, Any] = {
             'intake_position': None,
             'exhaust_position': None,
@@ -572,15 +629,9 @@ def read_vanos_data() -> Dict[str, Any]:
                    f"intake_pos={vanos_data.get('intake_position')}°, "
                    f"exhaust_pos={vanos_data.get('exhaust_position')}°")
         return vanos_data
-        
-    finally:
-        try:
-            flasher.disconnect()
-        except Exception as exc:
-            logger.debug(f"Failed to disconnect flasher after VANOS read: {exc}")
 
 
-def read_boost_data() -> Dict[str, Any]:
+def read_boost_data(flasher: Optional[DirectCANFlasher] = None) -> Dict[str, Any]:
     """
     Read boost pressure and wastegate controller data.
     
@@ -589,6 +640,10 @@ def read_boost_data() -> Dict[str, Any]:
     
     Uses UDS ReadDataByIdentifier (0x22) with BMW-specific DIDs.
     
+    Args:
+        flasher: Open DirectCANFlasher to use (e.g. from open_session());
+            a connection is opened and closed for this call when omitted
+    
     Returns:
         Dictionary with boost data:
         {
@@ -645,11 +700,7 @@ def read_boost_data() -> Dict[str, Any]:
     
     logger.info("Reading boost/wastegate data via UDS/CAN...")
     
-    flasher = DirectCANFlasher()
-    if not flasher.connect():
-        raise DMEError("Unable to connect to ECU over CAN")
-    
-    try:
+    with _use_flasher(flasher) as flasher:
         boost_data: Dict[str, Any] = {
             'boost_actual': None,
             'boost_target': None,
@@ -725,15 +776,9 @@ def read_boost_data() -> Dict[str, Any]:
                    f"target={boost_data.get('boost_target')} bar, "
                    f"WG L/R={boost_data.get('wastegate_left')}%/{boost_data.get('wastegate_right')}%")
         return boost_data
-        
-    finally:
-        try:
-            flasher.disconnect()
-        except Exception as exc:
-            logger.debug(f"Failed to disconnect flasher after boost read: {exc}")
 
 
-def read_dme_errors() -> List[Dict[str, str]]:
+def read_dme_errors(flasher: Optional[DirectCANFlasher] = None) -> List[obd_reader.DTC]:
     """
     Reads DME fault codes via UDS/CAN.
 
@@ -742,18 +787,14 @@ def read_dme_errors() -> List[Dict[str, str]]:
 
     Uses UDS ReadDTCInformation service (0x19).
 
+    Args:
+        flasher: Open DirectCANFlasher whose bus to use (e.g. from
+            open_session()); a connection is opened and closed for this
+            call when omitted
+
     Returns:
-        List of fault code dictionaries:
-        [
-            {
-                'code': str,          # Fault code (e.g., '2E82', '0x2E82')
-                'description': str,   # Human-readable description
-                'status': str,        # 'active', 'stored', etc.
-                'frequency': int,     # Number of occurrences
-                'module': str         # Always 'DME' for this function
-            },
-            ...
-        ]
+        List of obd_reader.DTC objects (status is 'active', 'pending' or
+        'stored'; frequency defaults to 1; module is always 'DME')
 
     Raises:
         DMEError: If communication fails or codes cannot be read
@@ -763,35 +804,22 @@ def read_dme_errors() -> List[Dict[str, str]]:
         >>> if errors:
         ...     print(f"Found {len(errors)} fault codes:")
         ...     for err in errors:
-        ...         print(f"  {err['code']}: {err['description']}")
+        ...         print(f"  {err.code}: {err.description}")
         ... else:
         ...     print("No fault codes found")
     """
     logger.info("Reading DME fault codes via UDS/CAN...")
     try:
-        uds = _get_ecu_connection()
-        try:
+        with _use_uds(flasher) as uds:
             module = bmw_modules.get_module_by_abbreviation('DME')
             if not module:
                 raise DMEError("DME module definition not found")
-            dtcs = obd_reader.read_dtcs_from_module(module, uds_client=uds)
-            errors: List[Dict[str, Any]] = []
-            for dtc in dtcs:
-                status = 'active' if dtc.get('active') else ('pending' if dtc.get('pending') else 'stored')
-                errors.append({
-                    'code': dtc.get('code', 'UNKNOWN'),
-                    'description': dtc.get('description', f"DTC {dtc.get('code', 'UNKNOWN')}") ,
-                    'status': status,
-                    'frequency': dtc.get('frequency', 1),
-                    'module': 'DME'
-                })
+            errors = obd_reader.read_dtcs_from_module(module, uds_client=uds)
+            for dtc in errors:
+                if dtc.frequency is None:
+                    dtc.frequency = 1
             logger.info(f"Found {len(errors)} DME fault codes")
             return errors
-        finally:
-            try:
-                uds.disconnect()
-            except Exception as exc:
-                logger.debug(f"Failed to disconnect UDS client: {exc}")
     except Exception as e:
         logger.error(f"Error reading DME errors: {e}")
         raise DMEError(f"Failed to read DME errors: {e}")
@@ -1136,12 +1164,11 @@ def check_transmission_params_available() -> bool:
         return True
 
 
-def clear_dme_errors() -> bool:
-    """Clear DME fault memory over UDS/CAN."""
+def clear_dme_errors(flasher: Optional[DirectCANFlasher] = None) -> bool:
+    """Clear DME fault memory over UDS/CAN, on `flasher`'s bus when given."""
     logger.warning("Clearing DME fault memory via UDS/CAN...")
     try:
-        uds = _get_ecu_connection()
-        try:
+        with _use_uds(flasher) as uds:
             module = bmw_modules.get_module_by_abbreviation('DME')
             if not module:
                 raise DMEError("DME module definition not found")
@@ -1150,11 +1177,108 @@ def clear_dme_errors() -> bool:
                 return False
             remaining_codes = obd_reader.read_dtcs_from_module(module, uds_client=uds)
             return len(remaining_codes) == 0
-        finally:
-            try:
-                uds.disconnect()
-            except Exception as exc:
-                logger.debug(f"Failed to disconnect UDS client after error clear: {exc}")
     except Exception as e:
         logger.error(f"Error clearing DME errors: {e}")
         raise DMEError(f"Failed to clear DME errors: {e}")
+
+
+@contextmanager
+def open_session() -> Iterator[Optional[DirectCANFlasher]]:
+    """
+    Hold one CAN connection to the DME open for a block of DME operations.
+
+    Pass the yielded flasher to each read_*()/clear_dme_errors() call in the
+    block so they reuse this connection instead of opening and closing the
+    adapter every time; a call that opened its own would fail, since PCAN
+    allows one open per channel. The reads all work in the default
+    diagnostic session, so no extended session or TesterPresent keep-alive
+    is held (a keep-alive would also wait for replies on the shared bus).
+
+    If the adapter cannot be opened the block still runs (yielding None)
+    and each call opens its own connection as before.
+
+    Example:
+        >>> with open_session() as flasher:
+        ...     ident = read_ecu_identification(flasher=flasher)
+        ...     vanos = read_vanos_data(flasher=flasher)
+    """
+    flasher = DirectCANFlasher()
+    try:
+        connected = flasher.connect()
+    except Exception as e:
+        logger.warning(f"Could not open DME session: {e}")
+        connected = False
+
+    if not connected:
+        yield None
+        return
+
+    try:
+        yield flasher
+    finally:
+        try:
+            flasher.disconnect()
+        except Exception as exc:
+            logger.debug(f"Failed to disconnect session flasher: {exc}")
+
+
+# ============================================================================
+# Async snapshot reads
+# ============================================================================
+
+def _locked_call(func):
+    """Run a DME read while holding the channel lock."""
+    with _dme_lock:
+        return func()
+
+
+async def read_dme_snapshot_async(flasher: Optional[DirectCANFlasher] = None) -> Dict[str, Any]:
+    """
+    Read identification, injector, VANOS and boost data as one gathered batch.
+
+    Each read runs in the default executor so the event loop stays free
+    while the DME answers. All four share one connection and still reach
+    the ECU one at a time.
+
+    Args:
+        flasher: Open DirectCANFlasher to use (e.g. from open_session());
+            a session is opened for the batch when omitted
+
+    Returns:
+        Dictionary with keys 'ident', 'injectors', 'vanos' and 'boost'. Each
+        value is the corresponding read_*() result, or the exception that
+        read raised.
+
+    Example:
+        >>> snapshot = asyncio.run(read_dme_snapshot_async())
+        >>> print(snapshot['ident'].get('VIN'))
+    """
+    loop = asyncio.get_running_loop()
+    reads = {
+        'ident': read_ecu_identification,
+        'injectors': read_injector_codes,
+        'vanos': read_vanos_data,
+        'boost': read_boost_data,
+    }
+    with ExitStack() as stack:
+        if flasher is None:
+            flasher = stack.enter_context(open_session())
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, _locked_call, functools.partial(func, flasher=flasher))
+              for func in reads.values()),
+            return_exceptions=True,
+        )
+    return dict(zip(reads, results))
+
+
+def read_dme_snapshot(flasher: Optional[DirectCANFlasher] = None) -> Dict[str, Any]:
+    """
+    Synchronous wrapper around read_dme_snapshot_async().
+
+    Args:
+        flasher: Same as read_dme_snapshot_async()
+
+    Returns:
+        Same as read_dme_snapshot_async()
+    """
+    return asyncio.run(read_dme_snapshot_async(flasher))
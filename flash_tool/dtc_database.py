@@ -9,7 +9,7 @@ Created: November 3, 2025
 """
 
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable
 from enum import Enum
 
 
@@ -845,6 +845,25 @@ def lookup_dtc(code: str) -> Optional[DTC]:
     return BMW_DTCS.get(code)
 
 
+def lookup_dtcs(codes: Iterable[str]) -> Dict[str, DTC]:
+    """
+    Look up several DTCs in one call
+    
+    Args:
+        codes: DTC codes (e.g., ['P0300', '2A88'])
+    
+    Returns:
+        Dict mapping each known code (as given) to its DTC; unknown codes are omitted
+    """
+    get = BMW_DTCS.get
+    found = {}
+    for code in codes:
+        info = get(code.strip())
+        if info is not None:
+            found[code] = info
+    return found
+
+
 def search_dtcs(keyword: str) -> List[DTC]:
     """
     Search DTCs by keyword in description or details
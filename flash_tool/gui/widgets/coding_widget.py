@@ -357,7 +357,7 @@ def create_qt_widget(controller: CodingController, parent: Optional[Any] = None)
                     self._append('No DME errors found')
                     return
                 for d in data:
-                    self._append(f"{d.get('code')} | {d.get('status')} | {d.get('description')}")
+                    self._append(f"{d.code} | {d.status} | {d.description}")
             else:
                 self._append('Read DME errors failed: ' + str(res.get('error', 'unknown')))
 
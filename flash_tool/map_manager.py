@@ -153,8 +153,15 @@ class MapManager:
             logger.warning(f"Maps directory does not exist: {search_dir}")
             return []
         
-        # Recursively find all .bin files
-        for bin_file in search_dir.rglob('*.bin'):
+        # Recursively find all .bin files (os.walk + suffix check instead of
+        # rglob's per-entry pattern match and Path construction)
+        bin_files = [
+            Path(dirpath, name)
+            for dirpath, _, filenames in os.walk(search_dir)
+            for name in filenames
+            if os.path.normcase(name).endswith('.bin')
+        ]
+        for bin_file in bin_files:
             try:
                 metadata = self.get_map_metadata(bin_file)
                 maps.append(metadata)
@@ -38,7 +38,8 @@ Variables (Module-level):
     PRESET_MAP: Dict[str, Callable] - Preset configuration factory
 """
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
+from functools import lru_cache
 from typing import List, Optional, Tuple, Dict, Any, TYPE_CHECKING
 from enum import Enum
 
@@ -213,6 +214,18 @@ class MapOptions:
             'ethanol_content': self.ethanol_content
         }
     
+    def copy(self) -> 'MapOptions':
+        """Return an independent copy (each option group copied field by field)"""
+        return replace(
+            self,
+            burbles=replace(self.burbles),
+            vmax=replace(self.vmax),
+            dtc=replace(self.dtc, custom_codes=list(self.dtc.custom_codes)),
+            launch_control=replace(self.launch_control),
+            rev_limiter=replace(self.rev_limiter),
+            boost=replace(self.boost),
+        )
+    
     def get_enabled_options(self) -> List[str]:
         """Get list of enabled option names"""
         enabled = []
@@ -503,6 +516,13 @@ def get_preset(name: str) -> Optional[MapOptions]:
     if not preset_key:
         return None
     
+    snapshot = _preset_snapshot(preset_key)
+    return snapshot.copy() if snapshot else None
+
+
+@lru_cache(maxsize=None)
+def _preset_snapshot(preset_key: str) -> Optional[MapOptions]:
+    """Convert a tuning_parameters preset once; get_preset hands out copies"""
     # Lazy-load from tuning_parameters
     try:
         from flash_tool.tuning_parameters import ALL_PRESETS
@@ -224,8 +224,7 @@ class MapPatcher:
             logger.info(f"Updating {len(results['affected_zones'])} affected CRC zones...")
             
             # Convert modifications to format expected by update_all_affected_crcs
-            modifications = [(p.offset, p.size) for p in patch_set.patches if p in 
-                           [patch_set.patches[i] for i in range(len(results['applied_patches']))]]
+            modifications = [(r['offset'], r['size']) for r in results['applied_patches']]
             
             updated_count = crc_zones.update_all_affected_crcs(data, modifications, self.ecu_type)
             results['updated_crc_count'] = updated_count
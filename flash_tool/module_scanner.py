@@ -207,7 +207,7 @@ def read_module_dtcs(module_id: str) -> List[Dict[str, str]]:
         if not uds.connect():
             raise ModuleScanError("Unable to connect to ECU over CAN")
         dtc_dicts = obd_reader.read_dtcs_from_module(module, uds_client=uds)
-        return [{'code': d.get('code', 'UNKNOWN'), 'description': d.get('description', 'No description')} for d in dtc_dicts]
+        return [{'code': d.code, 'description': d.description} for d in dtc_dicts]
     finally:
         try:
             uds.disconnect()
@@ -245,7 +245,7 @@ def read_all_module_dtcs() -> Dict[str, List[Dict[str, str]]]:
     # Convert to the simple shape expected by this module
     for module_abbr, dtcs in multi.items():
         all_dtcs[module_abbr] = [
-            {'code': d.get('code', 'UNKNOWN'), 'description': d.get('description', 'No description')}
+            {'code': d.code, 'description': d.description}
             for d in dtcs
         ]
     
@@ -23,6 +23,7 @@ Features:
 Classes:
     OBDConnectionError(Exception) - Connection failures
     OBDReadError(Exception) - Read operation failures
+    DTC - Fault code read from a BMW module
 
 Functions:
     connect_obd(port: Optional[str], baudrate: int) -> obd.OBD
@@ -32,9 +33,14 @@ Functions:
     get_vehicle_info(connection: obd.OBD) -> Dict[str, str]
     disconnect_obd(connection: obd.OBD) -> None
     query_readiness_monitors(connection: obd.OBD) -> Dict[str, Any]
+    read_obd_dtcs_batch(connection: obd.OBD, modes: Tuple[int, ...]) -> List[Dict[str, str]]
+    read_dtcs_from_modules(modules: Sequence[BMWModule], uds_client) -> Dict[str, List[DTC]]
+    probe_dtcs_from_modules(modules: Sequence[BMWModule], uds_client) -> Dict[str, Optional[List[DTC]]]
+    clear_dtcs_from_modules(modules: Sequence[BMWModule], uds_client) -> Dict[str, bool]
 
 Variables (Module-level):
     OBD_AVAILABLE: bool - python-obd library availability
+    READINESS_MONITOR_KEYS: Tuple[str, ...] - Keys of the readiness monitors dict
     logger: logging.Logger - Module logger
 
 NOTE: python-obd is not compatible with Python 3.13+.
@@ -48,8 +54,11 @@ except Exception:
     obd = None
     OBD_AVAILABLE = False
 
-from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
+from typing import Optional, List, Dict, Any, Sequence, Tuple, TYPE_CHECKING
+import functools
+import io
 import logging
+from dataclasses import dataclass
 from . import bmw_modules
 from . import dtc_database
 from .dtc_utils import parse_dtc_response
@@ -61,6 +70,17 @@ if TYPE_CHECKING:
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Monitor keys returned in query_readiness_monitors()['monitors'], in display order
+READINESS_MONITOR_KEYS = (
+    'catalyst',
+    'heated_catalyst',
+    'evap_system',
+    'secondary_air',
+    'oxygen_sensor',
+    'oxygen_sensor_heater',
+    'egr_system',
+)
+
 
 class OBDConnectionError(Exception):
     """Raised when OBD connection fails"""
@@ -74,6 +94,54 @@ class OBDReadError(Exception):
     pass
 
 
+@dataclass(slots=True)
+class DTC:
+    """
+    Fault code read from a BMW module over UDS/KWP2000.
+    
+    Attributes:
+        code: DTC code (e.g., 'P0300', '2A88')
+        description: Human-readable description
+        status: 'active', 'pending' or 'stored'
+        severity: Severity level from the DTC database, or 'Unknown'
+        frequency: Occurrence count, if the module reports one
+        status_byte: Raw DTC status byte
+        pending: Status bit 0 (test failed this cycle)
+        confirmed: Status bit 3 (confirmed DTC)
+        active: Status bit 7 or bit 3
+        module: Abbreviation of the module that reported the code
+    """
+    code: str
+    description: str
+    status: str
+    severity: str = 'Unknown'
+    frequency: Optional[int] = None
+    status_byte: int = 0
+    pending: bool = False
+    confirmed: bool = False
+    active: bool = False
+    module: str = ''
+
+
+def _dtc_from_parsed(parsed: Dict[str, Any], module_abbr: str) -> DTC:
+    """Build a DTC from a dtc_utils.parse_dtc_response() dict."""
+    active = bool(parsed.get('active'))
+    pending = bool(parsed.get('pending'))
+    code = parsed.get('code', 'UNKNOWN')
+    return DTC(
+        code=code,
+        description=parsed.get('description') or f"DTC {code}",
+        status='active' if active else ('pending' if pending else 'stored'),
+        severity=parsed.get('severity', 'Unknown'),
+        frequency=parsed.get('frequency'),
+        status_byte=parsed.get('status', 0) if isinstance(parsed.get('status'), int) else 0,
+        pending=pending,
+        confirmed=bool(parsed.get('confirmed')),
+        active=active,
+        module=module_abbr,
+    )
+
+
 def _check_obd_available():
     """Check if python-obd is available, raise error if not."""
     if not OBD_AVAILABLE:
@@ -84,6 +152,23 @@ def _check_obd_available():
         )
 
 
+def _disable_elm_spaces(connection: obd.OBD) -> None:
+    """
+    Turn off ELM327 space printing (ATS0) to shrink every response.
+    
+    python-obd strips spaces before parsing, so responses parse the same
+    either way. Headers are left on (ATH1): python-obd needs them to group
+    frames by transmitting ECU.
+    
+    Args:
+        connection: Freshly connected OBD connection object
+    """
+    try:
+        connection.interface.send_and_parse(b"ATS0")
+    except Exception as e:
+        logger.debug(f"Adapter did not accept ATS0: {e}")
+
+
 def connect_obd(port: Optional[str] = None, baudrate: int = 38400):
     """
     Establish connection to vehicle via OBD-II interface.
@@ -116,6 +201,8 @@ def connect_obd(port: Optional[str] = None, baudrate: int = 38400):
         if not connection.is_connected():
             raise OBDConnectionError("Failed to establish OBD-II connection")
         
+        _disable_elm_spaces(connection)
+        
         logger.info(f"OBD-II connected successfully on {connection.port_name()}")
         return connection
     
@@ -499,7 +586,8 @@ def query_readiness_monitors(connection: obd.OBD) -> Dict[str, Any]:
 # Multi-Module DTC Functions (Task 1.1.4 - UDS/KWP2000)
 # ============================================================================
 
-def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['UDSClient'] = None) -> List[Dict[str, Any]]:
+def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['UDSClient'] = None,
+                          strict: bool = False) -> List[DTC]:
     """
     Read DTCs from a specific BMW module using UDS or KWP2000 (Task 1.1.4).
     
@@ -509,23 +597,21 @@ def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['U
     Args:
         module: BMWModule object specifying which module to query
         uds_client: Optional UDS client (from uds_handler or direct_can_flasher)
+        strict: Raise instead of returning an empty list when the module
+            cannot be read, so a failed read is not mistaken for "no codes"
     
     Returns:
-        List of DTC dictionaries with:
-            - code: DTC code (e.g., 'P0300', '2A88')
-            - status: Status byte (pending, confirmed, etc.)
-            - description: Human-readable description
-            - module: Module abbreviation (e.g., 'DME')
-            - severity: Severity level if in database
+        List of DTC objects (code, description, status, severity, module, ...)
     
     Raises:
-        OBDReadError: If DTC reading fails
+        OBDReadError: If DTC reading fails (with strict, also when the
+            module cannot be reached)
     
     Example:
         >>> dme = bmw_modules.get_module_by_abbreviation('DME')
         >>> dtcs = read_dtcs_from_module(dme)
         >>> for dtc in dtcs:
-        ...     print(f"{dtc['code']}: {dtc['description']}")
+        ...     print(f"{dtc.code}: {dtc.description}")
     """
     try:
         logger.info(f"Reading DTCs from {module.abbreviation} ({module.name})...")
@@ -546,10 +632,14 @@ def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['U
                     local_client = UDSClient()
                     if not local_client.connect():
                         logger.error("Failed to connect UDS client (CAN)")
+                        if strict:
+                            raise OBDReadError("UDS client (CAN) not connected")
                         return dtcs
                     client = local_client
                 except Exception as e:
                     logger.error(f"Unable to initialize UDS client: {e}")
+                    if strict:
+                        raise
                     return dtcs
             
             try:
@@ -564,6 +654,8 @@ def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['U
                 
             except Exception as e:
                 logger.error(f"UDS DTC read error for {module.abbreviation}: {e}")
+                if strict:
+                    raise
             finally:
                 if local_client:
                     try:
@@ -577,6 +669,8 @@ def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['U
                 from .kwp_client import KWPClient
             except Exception:
                 logger.error("KWP client not available; cannot read K-line DTCs")
+                if strict:
+                    raise OBDReadError("KWP client not available")
                 return dtcs
 
             local_client = None
@@ -589,6 +683,8 @@ def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['U
                 dtcs = client.read_dtcs(module, status_mask=0xFF)
             except Exception as e:
                 logger.error(f"KWP DTC read error for {module.abbreviation}: {e}")
+                if strict:
+                    raise
             finally:
                 if local_client:
                     try:
@@ -597,7 +693,7 @@ def read_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['U
                         pass
         
         logger.info(f"Found {len(dtcs)} DTCs in {module.abbreviation}")
-        return dtcs
+        return [_dtc_from_parsed(d, module.abbreviation) for d in dtcs]
         
     except Exception as e:
         logger.error(f"Error reading DTCs from {module.abbreviation}: {e}")
@@ -703,7 +799,125 @@ def clear_dtcs_from_module(module: bmw_modules.BMWModule, uds_client: Optional['
         raise OBDReadError(f"Failed to clear DTCs from {module.abbreviation}: {e}")
 
 
-def read_all_module_dtcs(protocol: str = "CAN", uds_client: Optional['UDSClient'] = None) -> Dict[str, List[Dict[str, Any]]]:
+def _for_each_module(func, modules: Sequence[bmw_modules.BMWModule],
+                     uds_client: Optional['UDSClient']) -> List[Tuple[str, Any]]:
+    """
+    Run func(module, client) for each module in turn over one UDS client.
+
+    All modules answer to the same tester ID pair on one CAN channel, so
+    requests must not overlap. When no client is supplied one is opened for
+    the whole pass instead of one per module.
+
+    Returns:
+        List of (module abbreviation, result) pairs in module order. A call
+        that raises yields the exception instance as its result.
+    """
+    if not modules:
+        return []
+
+    from flash_tool.uds_client import UDSClient
+    local_client: Optional[UDSClient] = None
+    client: Optional[UDSClient] = uds_client
+    if client is None and any(m.protocol in (bmw_modules.Protocol.UDS_CAN, bmw_modules.Protocol.BOTH)
+                              for m in modules):
+        try:
+            local_client = UDSClient()
+            if not local_client.connect():
+                logger.error("Failed to connect UDS client (CAN)")
+                local_client = None
+            else:
+                client = local_client
+        except Exception as e:
+            logger.error(f"Unable to initialize UDS client: {e}")
+            local_client = None
+
+    results: List[Tuple[str, Any]] = []
+    try:
+        for module in modules:
+            try:
+                results.append((module.abbreviation, func(module, client)))
+            except Exception as e:
+                results.append((module.abbreviation, e))
+    finally:
+        if local_client:
+            try:
+                local_client.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting local UDS client: {e}")
+    return results
+
+
+def read_dtcs_from_modules(modules: Sequence[bmw_modules.BMWModule],
+                           uds_client: Optional['UDSClient'] = None) -> Dict[str, List[DTC]]:
+    """
+    Read DTCs from several modules, one at a time over a shared UDS client.
+
+    Args:
+        modules: Modules to query
+        uds_client: Optional UDS client; one is opened for the pass if omitted
+
+    Returns:
+        Dictionary mapping module abbreviations to DTC lists, containing
+        only modules that reported DTCs
+    """
+    all_dtcs: Dict[str, List[DTC]] = {}
+    for abbr, dtcs in _for_each_module(read_dtcs_from_module, modules, uds_client):
+        if isinstance(dtcs, Exception):
+            logger.error(f"Failed to read DTCs from {abbr}: {dtcs}")
+        elif dtcs:
+            all_dtcs[abbr] = dtcs
+            logger.info(f"{abbr}: {len(dtcs)} DTCs found")
+    return all_dtcs
+
+
+def probe_dtcs_from_modules(modules: Sequence[bmw_modules.BMWModule],
+                            uds_client: Optional['UDSClient'] = None) -> Dict[str, Optional[List[DTC]]]:
+    """
+    Read DTCs from several modules, keeping failed reads apart from empty ones.
+
+    Args:
+        modules: Modules to query
+        uds_client: Optional UDS client; one is opened for the pass if omitted
+
+    Returns:
+        Dictionary mapping every module abbreviation to its DTC list (empty
+        when the module has no codes), or None when the read failed
+    """
+    results: Dict[str, Optional[List[DTC]]] = {}
+    read = functools.partial(read_dtcs_from_module, strict=True)
+    for abbr, dtcs in _for_each_module(read, modules, uds_client):
+        if isinstance(dtcs, Exception):
+            logger.error(f"Failed to read DTCs from {abbr}: {dtcs}")
+            results[abbr] = None
+        else:
+            results[abbr] = dtcs
+    return results
+
+
+def clear_dtcs_from_modules(modules: Sequence[bmw_modules.BMWModule],
+                            uds_client: Optional['UDSClient'] = None) -> Dict[str, bool]:
+    """
+    Clear DTCs from several modules, one at a time over a shared UDS client.
+
+    CAUTION: This erases stored fault codes from every module given.
+
+    Args:
+        modules: Modules to clear
+        uds_client: Optional UDS client; one is opened for the pass if omitted
+
+    Returns:
+        Dictionary mapping module abbreviations to clear success, in module order
+    """
+    results: Dict[str, bool] = {}
+    for abbr, success in _for_each_module(clear_dtcs_from_module, modules, uds_client):
+        if isinstance(success, Exception):
+            logger.error(f"Failed to clear {abbr}: {success}")
+            success = False
+        results[abbr] = bool(success)
+    return results
+
+
+def read_all_module_dtcs(protocol: str = "CAN", uds_client: Optional['UDSClient'] = None) -> Dict[str, List[DTC]]:
     """
     Read DTCs from all BMW modules (Task 1.1.4 complete implementation).
     
@@ -716,8 +930,8 @@ def read_all_module_dtcs(protocol: str = "CAN", uds_client: Optional['UDSClient'
     Returns:
         Dictionary mapping module abbreviations to lists of DTCs:
         {
-            'DME': [{code: 'P0300', description: '...', ...}, ...],
-            'EGS': [{code: 'P0700', description: '...', ...}, ...],
+            'DME': [DTC(code='P0300', description='...', ...), ...],
+            'EGS': [DTC(code='P0700', description='...', ...), ...],
             ...
         }
     
@@ -727,7 +941,7 @@ def read_all_module_dtcs(protocol: str = "CAN", uds_client: Optional['UDSClient'
         ...     if dtcs:
         ...         print(f"\n{module}: {len(dtcs)} codes")
         ...         for dtc in dtcs:
-        ...             print(f"  {dtc['code']}: {dtc['description']}")
+        ...             print(f"  {dtc.code}: {dtc.description}")
     """
     all_dtcs = {}
     
@@ -742,46 +956,17 @@ def read_all_module_dtcs(protocol: str = "CAN", uds_client: Optional['UDSClient'
         logger.error(f"Invalid protocol: {protocol}")
         return all_dtcs
     
-    # If scanning CAN modules and no UDS client provided, initialize one to reuse
-    from flash_tool.uds_client import UDSClient
-    local_client: Optional[UDSClient] = None
-    client: Optional[UDSClient] = uds_client
-    if client is None and protocol.upper() in ("CAN", "ALL"):
-        try:
-            local_client = UDSClient()
-            if not local_client.connect():
-                logger.error("Failed to connect UDS client (CAN)")
-            else:
-                client = local_client
-        except Exception as e:
-            logger.error(f"Unable to initialize UDS client: {e}")
-            local_client = None
-
     logger.info(f"Scanning {len(modules)} modules for DTCs...")
     
-    for module in modules:
-        try:
-            dtcs = read_dtcs_from_module(module, client)
-            if dtcs:
-                all_dtcs[module.abbreviation] = dtcs
-                logger.info(f"{module.abbreviation}: {len(dtcs)} DTCs found")
-        except Exception as e:
-            logger.error(f"Failed to read DTCs from {module.abbreviation}: {e}")
-            continue
+    all_dtcs = read_dtcs_from_modules(modules, uds_client)
     
     total_dtcs = sum(len(dtcs) for dtcs in all_dtcs.values())
     logger.info(f"Total DTCs found across all modules: {total_dtcs}")
-    
-    if local_client:
-        try:
-            local_client.disconnect()
-        except Exception as e:
-            logger.warning(f"Error disconnecting local UDS client: {e}")
 
     return all_dtcs
 
 
-def format_dtc_report(all_dtcs: Dict[str, List[Dict[str, Any]]]) -> str:
+def format_dtc_report(all_dtcs: Dict[str, List[DTC]]) -> str:
     """
     Format multi-module DTC report for display.
     
@@ -794,51 +979,45 @@ def format_dtc_report(all_dtcs: Dict[str, List[Dict[str, Any]]]) -> str:
     if not all_dtcs:
         return ""
     
-    report_lines = []
-    report_lines.append("=" * 80)
-    report_lines.append("BMW Multi-Module Diagnostic Report")
-    report_lines.append("=" * 80)
-    report_lines.append("")
+    rule = "=" * 80
+    buf = io.StringIO()
+    write = buf.write
+    write(f"{rule}\nBMW Multi-Module Diagnostic Report\n{rule}\n\n")
     
     for module_abbr, dtcs in sorted(all_dtcs.items()):
         module = bmw_modules.get_module_by_abbreviation(module_abbr)
         module_name = module.name if module else module_abbr
         
-        report_lines.append(f"\n{module_abbr} - {module_name} ({len(dtcs)} codes)")
-        report_lines.append("-" * 80)
+        write(f"\n{module_abbr} - {module_name} ({len(dtcs)} codes)\n")
+        write("-" * 80 + "\n")
         
+        infos = dtc_database.lookup_dtcs([dtc.code for dtc in dtcs])
         for dtc in dtcs:
-            severity = dtc.get('severity', 'Unknown')
             status_flags = []
-            pending = dtc.get('pending', dtc.get('status_pending', False))
-            confirmed = dtc.get('confirmed', dtc.get('status_confirmed', False))
-            active = dtc.get('active', dtc.get('status_active', False))
-            if pending:
+            if dtc.pending:
                 status_flags.append("PENDING")
-            if confirmed:
+            if dtc.confirmed:
                 status_flags.append("CONFIRMED")
-            if active:
+            if dtc.active:
                 status_flags.append("ACTIVE")
             
             status_str = ", ".join(status_flags) if status_flags else "STORED"
             
-            report_lines.append(f"  {dtc['code']:8} | {severity:10} | {status_str}")
-            report_lines.append(f"           | {dtc['description']}")
+            write(f"  {dtc.code:8} | {dtc.severity:10} | {status_str}\n")
+            write(f"           | {dtc.description}\n")
             
             # Add common causes if available in database
-            dtc_info = dtc_database.lookup_dtc(dtc['code'])
-            if dtc_info and len(dtc_info.common_causes) > 0:
-                report_lines.append(f"           | Common causes:")
+            dtc_info = infos.get(dtc.code)
+            if dtc_info and dtc_info.common_causes:
+                write("           | Common causes:\n")
                 for cause in dtc_info.common_causes[:3]:  # Show top 3
-                    report_lines.append(f"           |   - {cause}")
-            report_lines.append("")
+                    write(f"           |   - {cause}\n")
+            write("\n")
     
     total_dtcs = sum(len(dtcs) for dtcs in all_dtcs.values())
-    report_lines.append("=" * 80)
-    report_lines.append(f"Total: {len(all_dtcs)} modules with DTCs, {total_dtcs} total codes")
-    report_lines.append("=" * 80)
+    write(f"{rule}\nTotal: {len(all_dtcs)} modules with DTCs, {total_dtcs} total codes\n{rule}")
     
-    return "\n".join(report_lines)
+    return buf.getvalue()
 
 
 # ============================================================================
@@ -1212,6 +1391,65 @@ def read_pending_dtcs(connection: obd.OBD) -> List[Dict[str, str]]:
         raise OBDReadError(f"Failed to read pending DTCs: {e}")
 
 
+# Mode -> (python-obd command name, status tag) for read_obd_dtcs_batch()
+_DTC_BATCH_COMMANDS = {
+    0x03: ('GET_DTC', 'confirmed'),
+    0x07: ('PENDING_DTC', 'pending'),
+}
+
+
+def read_obd_dtcs_batch(connection: obd.OBD, modes: Tuple[int, ...] = (0x03, 0x07)) -> List[Dict[str, str]]:
+    """
+    Read stored (Mode 03) and pending (Mode 07) DTCs in a single pass.
+    
+    The requests are issued back-to-back on the same connection with one
+    connection check up front, instead of a full read_obd_dtcs() +
+    read_pending_dtcs() round trip each. The ELM327 aborts a command when
+    more input arrives before its prompt, so commands are not packed into
+    one serial write.
+    
+    Args:
+        connection: Active OBD connection object
+        modes: OBD modes to query (0x03 and/or 0x07)
+    
+    Returns:
+        List of dictionaries with 'code', 'description' and 'status' keys.
+        Status is 'confirmed' for Mode 03 codes and 'pending' for Mode 07.
+    
+    Raises:
+        OBDReadError: If reading DTCs fails
+    
+    Example:
+        >>> dtcs = read_obd_dtcs_batch(connection)
+        >>> pending = filter_dtcs_by_status(dtcs, 'pending')
+    """
+    try:
+        logger.info(f"Reading OBD-II DTCs (modes {', '.join(f'{m:02X}' for m in modes)})...")
+        
+        if not connection.is_connected():
+            raise OBDReadError("OBD connection not active")
+        
+        dtcs = []
+        for mode in modes:
+            command_name, status = _DTC_BATCH_COMMANDS[mode]
+            response = connection.query(getattr(obd.commands, command_name))
+            if response.is_null():
+                continue
+            for code, description in response.value:
+                dtcs.append({
+                    'code': code,
+                    'description': description,
+                    'status': status
+                })
+        
+        logger.info(f"Found {len(dtcs)} OBD-II DTCs")
+        return dtcs
+    
+    except Exception as e:
+        logger.error(f"Error reading OBD-II DTCs: {e}")
+        raise OBDReadError(f"Failed to read DTCs: {e}")
+
+
 def read_dtcs_by_status(connection: obd.OBD, status_mask: int = 0xFF) -> List[Dict[str, Any]]:
     """
     Read DTCs filtered by status mask (Mode 02).
@@ -1474,6 +1712,43 @@ def filter_dtcs_by_status(dtcs: List[Dict[str, Any]], status: str) -> List[Dict[
     return filtered if filtered else dtcs  # Return all if no status field found
 
 
+def index_dtcs_by_status(dtcs: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group DTCs by status in one pass for repeated filtering.
+    
+    Uses the same matching rules as filter_dtcs_by_status(), including its
+    fallback of returning all DTCs for a status with no matches, so
+    index[status] == filter_dtcs_by_status(dtcs, status) for every status.
+    
+    Args:
+        dtcs: List of DTC dictionaries (from read_*_dtcs functions)
+    
+    Returns:
+        Dictionary keyed by 'all', 'pending', 'confirmed', 'active', 'stored'
+    
+    Example:
+        >>> by_status = index_dtcs_by_status(read_obd_dtcs_batch(connection))
+        >>> print(f"Pending: {len(by_status['pending'])}")
+    """
+    index: Dict[str, List[Dict[str, Any]]] = {
+        'pending': [], 'confirmed': [], 'active': [], 'stored': []
+    }
+    for dtc in dtcs:
+        dtc_status = dtc.get('status', dtc.get('status_string', '')).lower()
+        
+        for status in ('pending', 'confirmed', 'active'):
+            if status in dtc_status:
+                index[status].append(dtc)
+        if 'stored' in dtc_status or 'history' in dtc_status:
+            index['stored'].append(dtc)
+    
+    for status, matched in index.items():
+        if not matched:
+            index[status] = dtcs
+    index['all'] = dtcs
+    return index
+
+
 def get_ecu_reset_status(connection: obd.OBD) -> Dict[str, Any]:
     """
     Detect if ECU was recently reset.
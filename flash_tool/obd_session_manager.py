@@ -17,6 +17,7 @@ Features:
     - Automatic reconnection on failure
     - Connection state tracking
     - Resource cleanup on exit
+    - Low USB-serial latency timer on Linux FTDI (K+DCAN) adapters
     - Singleton pattern for global access
 
 Classes:
@@ -31,11 +32,48 @@ Variables (Module-level):
 """
 
 import logging
+import os
+import time
 from typing import Optional
 from . import obd_reader
 
 logger = logging.getLogger(__name__)
 
+# FTDI USB-serial chips (K+DCAN cables) buffer RX bytes for up to this many ms
+# before handing them to the host; 1 ms lets ELM327/KWP replies through immediately.
+LOW_LATENCY_TIMER_MS = 1
+
+# Seconds a verified connection is handed out again without re-checking it
+CONNECTION_CHECK_TTL = 30.0
+
+
+def _set_low_latency(port: str) -> bool:
+    """
+    Lower the USB-serial latency timer for port (Linux FTDI only).
+    
+    pyserial already opens the tty non-canonical with VMIN=0/VTIME=0 and
+    select(), and python-obd stops reading at the '>' prompt, so the
+    remaining per-read delay on FTDI cables is the driver's 16 ms
+    latency timer. Best effort: returns False when not applicable or the
+    sysfs attribute is not writable.
+    
+    Args:
+        port: Serial device path (e.g., "/dev/ttyUSB0")
+        
+    Returns:
+        True if the latency timer was set
+    """
+    if not port or os.name != 'posix':
+        return False
+    timer_path = f"/sys/bus/usb-serial/devices/{os.path.basename(port)}/latency_timer"
+    try:
+        with open(timer_path, 'w') as f:
+            f.write(str(LOW_LATENCY_TIMER_MS))
+        logger.debug(f"Set {timer_path} to {LOW_LATENCY_TIMER_MS} ms")
+        return True
+    except OSError:
+        return False
+
 
 class OBDSessionManager:
     """
@@ -60,15 +98,21 @@ class OBDSessionManager:
         self._connection = None
         self._connected_port: Optional[str] = None
         self._baudrate = 38400
+        self._checked_at = 0.0
         self._connection_manager = connection_manager
     
-    def get_connection(self, port: str, baudrate: int = 38400):
+    def get_connection(self, port: str, baudrate: int = 38400, reinitialize: bool = False):
         """
         Get an active OBD connection, reusing existing if possible.
         
+        A connection verified within the last CONNECTION_CHECK_TTL seconds
+        is returned without re-checking it, so back-to-back menu operations
+        skip the liveness check entirely.
+        
         Args:
             port: COM port name (e.g., "COM3")
             baudrate: Baud rate for serial communication (default: 38400)
+            reinitialize: Drop any cached connection and reconnect
             
         Returns:
             OBD connection object or None if connection failed
@@ -76,13 +120,21 @@ class OBDSessionManager:
         Raises:
             OBDConnectionError: If connection cannot be established
         """
+        if reinitialize:
+            self.disconnect()
+        
         # Check if we can reuse the existing connection
         if self._connection is not None:
             # Same port and baudrate - reuse connection
             if self._connected_port == port and self._baudrate == baudrate:
+                now = time.monotonic()
+                if now - self._checked_at < CONNECTION_CHECK_TTL:
+                    return self._connection
+                
                 # Verify connection is still alive
                 if hasattr(self._connection, 'is_connected') and self._connection.is_connected():
                     logger.debug(f"Reusing existing OBD connection on {port}")
+                    self._checked_at = now
                     return self._connection
                 else:
                     logger.info(f"Existing connection on {port} is dead, reconnecting...")
@@ -94,10 +146,12 @@ class OBDSessionManager:
         
         # Establish new connection
         logger.info(f"Establishing new OBD connection on {port} @ {baudrate} baud")
+        _set_low_latency(port)
         try:
             self._connection = obd_reader.connect_obd(port, baudrate)
             self._connected_port = port
             self._baudrate = baudrate
+            self._checked_at = time.monotonic()
             
             # Auto-register with connection_manager if provided
             if self._connection_manager:
@@ -121,6 +175,7 @@ class OBDSessionManager:
             finally:
                 self._connection = None
                 self._connected_port = None
+                self._checked_at = 0.0
                 
                 # Auto-unregister from connection_manager if registered
                 if self._connection_manager:
@@ -185,11 +240,8 @@ class OBDSessionManager:
         if baudrate is None:
             baudrate = self._baudrate
         
-        # Disconnect and reconnect
-        self.disconnect()
-        
         if port is not None:
-            return self.get_connection(port, baudrate)
+            return self.get_connection(port, baudrate, reinitialize=True)
         else:
             logger.warning("Cannot reconnect: no port specified and no previous connection")
             return None
@@ -55,53 +55,41 @@ def list_algorithms() -> list[str]:
 # Algorithm Implementations
 # ============================================================================
 
-def _algorithm_v1(seed: bytes) -> bytes:
-    """MSS54/MSD80 common algorithm.
-    
-    XOR with 'MH' (0x4D48) constant + cross-XOR of seed bytes.
-    """
-    if len(seed) != 4:
-        raise ValueError(f"Seed must be 4 bytes, got {len(seed)}")
-    
-    key = bytearray(4)
-    key[0] = seed[0] ^ 0x48  # 'H'
-    key[1] = seed[1] ^ 0x4D  # 'M'
-    key[2] = seed[2] ^ seed[0]
-    key[3] = seed[3] ^ seed[1]
-    return bytes(key)
+# The 4-byte algorithms are whole-word operations on the big-endian seed,
+# so each is a couple of integer ops instead of four byte-level XORs.
+# The uint32 kernels are usable directly for offline key-space exploration.
 
+def _kernel_v1(seed: int) -> int:
+    """v1 on a uint32 seed: XOR 'HM' into the high half, cross-XOR the low half."""
+    return seed ^ (0x484D0000 | (seed >> 16))
 
-def _algorithm_v2(seed: bytes) -> bytes:
-    """MSD80 byte swap variant.
-    
-    Rotate seed bytes, then XOR with 'MH' pattern.
-    """
-    if len(seed) != 4:
-        raise ValueError(f"Seed must be 4 bytes, got {len(seed)}")
-    
-    rotated = bytearray([seed[1], seed[0], seed[3], seed[2]])
-    key = bytearray(4)
-    key[0] = rotated[0] ^ 0x4D
-    key[1] = rotated[1] ^ 0x48
-    key[2] = rotated[2] ^ 0x4D
-    key[3] = rotated[3] ^ 0x48
-    return bytes(key)
 
+def _kernel_v2(seed: int) -> int:
+    """v2 on a uint32 seed: swap the bytes of each half, XOR with 'MHMH'."""
+    return (((seed >> 8) & 0x00FF00FF) | ((seed & 0x00FF00FF) << 8)) ^ 0x4D484D48
 
-def _algorithm_v3(seed: bytes) -> bytes:
-    """BM constant variant.
-    
-    XOR with 'BM' (0x424D) constant.
-    """
-    if len(seed) != 4:
-        raise ValueError(f"Seed must be 4 bytes, got {len(seed)}")
-    
-    key = bytearray(4)
-    key[0] = seed[0] ^ 0x42  # 'B'
-    key[1] = seed[1] ^ 0x4D  # 'M'
-    key[2] = seed[2] ^ 0x42
-    key[3] = seed[3] ^ 0x4D
-    return bytes(key)
+
+def _kernel_v3(seed: int) -> int:
+    """v3 on a uint32 seed: XOR with 'BMBM'."""
+    return seed ^ 0x424D424D
+
+
+def _word_algorithm(kernel: Callable[[int], int]) -> Algorithm:
+    """Wrap a uint32 kernel as a 4-byte seed -> 4-byte key algorithm."""
+    def algorithm(seed: bytes) -> bytes:
+        if len(seed) != 4:
+            raise ValueError(f"Seed must be 4 bytes, got {len(seed)}")
+        return kernel(int.from_bytes(seed, 'big')).to_bytes(4, 'big')
+    algorithm.__doc__ = kernel.__doc__
+    return algorithm
+
+
+# MSS54/MSD80 common algorithm: XOR with 'MH' (0x4D48) constant + cross-XOR of seed bytes
+_algorithm_v1 = _word_algorithm(_kernel_v1)
+# MSD80 byte swap variant: rotate seed bytes, then XOR with 'MH' pattern
+_algorithm_v2 = _word_algorithm(_kernel_v2)
+# BM constant variant: XOR with 'BM' (0x424D) constant
+_algorithm_v3 = _word_algorithm(_kernel_v3)
 
 
 def _algorithm_rftx(seed: bytes) -> bytes:
@@ -9,8 +9,10 @@ segmented message transport over CAN bus. It supports:
 Works with real CAN hardware via `python-can`.
 """
 import logging
+import select
 import time
 import struct
+from collections import deque
 from typing import Optional, Tuple
 from .can_adapter import create_bus, Message, CAN_AVAILABLE
 
@@ -50,6 +52,7 @@ class UDSClient:
     N_BS_TIMEOUT = 1.0  # Sender wait for Flow Control
     N_CR_TIMEOUT = 1.0  # Receiver wait for Consecutive Frames
     CF_DELAY = 0.001    # Delay between consecutive frames (1ms, can be adjusted by FC)
+    RX_DRAIN_MAX = 32   # Frames pulled from the bus per wakeup
 
     def __init__(self, bus=None, tx_id: int = ECU_TX_ID_DEFAULT, rx_id: int = ECU_RX_ID_DEFAULT,
                  bitrate: int = 500000, interface: str = 'pcan', channel: str = 'PCAN_USBBUS1'):
@@ -74,6 +77,8 @@ class UDSClient:
         self.interface = interface
         self.channel = channel
         self.bitrate = bitrate
+        # Frames already read from the bus but not yet consumed
+        self._rx_backlog = deque()
 
         adapter = "python-can" if CAN_AVAILABLE else "mock"
         logger.info(f"UDSClient initialized (adapter={adapter}) tx=0x{tx_id:03X} rx=0x{rx_id:03X}")
@@ -201,6 +206,39 @@ class UDSClient:
             if remaining_data and separation_time > 0:
                 time.sleep(separation_time)
 
+    def _recv(self, timeout: float):
+        """Return the next received frame, or None on timeout.
+
+        One blocking read wakes the caller; every frame already queued
+        behind it (up to RX_DRAIN_MAX) is then drained without blocking, so
+        a multi-frame response costs one wakeup per burst, not per frame.
+        """
+        if self._rx_backlog:
+            return self._rx_backlog.popleft()
+
+        try:
+            msg = self.bus.recv(timeout=timeout)
+        except TypeError:
+            # Minimal buses without a timeout argument: no draining
+            return self.bus.recv()
+        if msg is None:
+            return None
+
+        fileno = getattr(self.bus, 'fileno', None)
+        try:
+            fd = fileno() if callable(fileno) else -1
+        except Exception:
+            fd = -1
+
+        while len(self._rx_backlog) < self.RX_DRAIN_MAX:
+            if fd >= 0 and not select.select([fd], [], [], 0)[0]:
+                break
+            extra = self.bus.recv(timeout=0)
+            if extra is None:
+                break
+            self._rx_backlog.append(extra)
+        return msg
+
     def _wait_for_flow_control(self, timeout: float = None) -> Optional[Tuple[int, int, int]]:
         """Wait for Flow Control frame from receiver.
 
@@ -219,10 +257,7 @@ class UDSClient:
         start_time = time.time()
 
         while time.time() - start_time < timeout:
-            try:
-                msg = self.bus.recv(timeout=0.1)
-            except TypeError:
-                msg = self.bus.recv()
+            msg = self._recv(0.1)
 
             if not msg:
                 continue
@@ -268,10 +303,7 @@ class UDSClient:
         start_time = time.time()
 
         while time.time() - start_time < timeout:
-            try:
-                msg = self.bus.recv(timeout=0.1)
-            except TypeError:
-                msg = self.bus.recv()
+            msg = self._recv(0.1)
 
             if not msg:
                 continue
@@ -306,10 +338,7 @@ class UDSClient:
                         logger.warning("Consecutive Frame timeout")
                         return None
 
-                    try:
-                        cf_msg = self.bus.recv(timeout=0.1)
-                    except TypeError:
-                        cf_msg = self.bus.recv()
+                    cf_msg = self._recv(0.1)
 
                     if not cf_msg:
                         continue
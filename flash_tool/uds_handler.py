@@ -41,7 +41,7 @@ Variables (Module-level):
 import struct
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from enum import Enum
 from . import map_offsets  # Real offset constants
 from . import offset_database  # Multi-version offset support
@@ -80,11 +80,24 @@ class UDSHandler:
     as the primary and only supported workflow.
     """
     
-    def __init__(self, logger=None, can_interface: str = 'pcan', can_channel: str = 'PCAN_USBBUS1'):
+    def __init__(self, logger=None, can_interface: str = 'pcan', can_channel: str = 'PCAN_USBBUS1',
+                 can_fd: Optional[bool] = None):
         self.logger = logger
         self.session_active = False
         self.security_unlocked = False
-        self._flasher = DirectCANFlasher(logger=logger, can_interface=can_interface, can_channel=can_channel)
+        # can_fd=None follows DirectCANFlasher.CAN_FD (set by the CLI's --can-fd option)
+        self._flasher = DirectCANFlasher(interface=can_interface, channel=can_channel, can_fd=can_fd)
+    
+    def _connect(self) -> None:
+        """Open the CAN bus on first use; later calls reuse it so sessions survive."""
+        if self._flasher.bus is None and not self._flasher.connect():
+            raise ConnectionError("Could not connect to CAN interface")
+    
+    def close(self) -> None:
+        """Release the CAN bus."""
+        self._flasher.disconnect()
+        self.session_active = False
+        self.security_unlocked = False
         
     def log(self, message: str, level: str = "INFO"):
         """Log message if logger available"""
@@ -108,7 +121,7 @@ class UDSHandler:
         self.log("Entering programming diagnostic session via direct CAN...")
         
         try:
-            self._flasher.connect()
+            self._connect()
             if self._flasher.enter_diagnostic_session(UdsDiagnosticSession.PROGRAMMING):
                 self.session_active = True
                 self.log("✓ Programming session established")
@@ -131,7 +144,7 @@ class UDSHandler:
         self.log("Reading VIN from ECU via direct CAN...")
         
         try:
-            self._flasher.connect()
+            self._connect()
             # Standard DID for VIN is 0xF190
             response = self._flasher.read_data_by_identifier(0xF190)
             
@@ -165,7 +178,7 @@ class UDSHandler:
         self.log("Requesting security seed from ECU via direct CAN...")
         
         try:
-            self._flasher.connect()
+            self._connect()
             seed = self._flasher.request_seed(level=1) # Level 1 for flashing/programming
             if seed:
                 self.log(f"✓ Received seed: {seed.hex()}")
@@ -189,7 +202,7 @@ class UDSHandler:
         """
         self.log("Sending security key to ECU via direct CAN...")
         try:
-            self._flasher.connect()
+            self._connect()
             if self._flasher.send_key(level=1, key=key):
                 self.log("✓ Security key accepted. ECU unlocked.")
                 self.security_unlocked = True
@@ -210,7 +223,7 @@ class UDSHandler:
         """
         self.log("Attempting to unlock ECU via direct CAN...")
         try:
-            self._flasher.connect()
+            self._connect()
             # The unlock_ecu method in DirectCANFlasher handles the full seed/key exchange
             if self._flasher.unlock_ecu(try_all_algorithms=True):
                 self.log("✓ ECU unlocked successfully.")
@@ -256,13 +269,15 @@ class UDSHandler:
             self.log(f"Error reading calibration: {e}", "ERROR")
             return None
     
-    def flash_calibration_region(self, data: bytes, verify: bool = True) -> bool:
+    def flash_calibration_region(self, data: bytes, verify: bool = True,
+                                 progress_callback: Optional[Callable[[str, int], None]] = None) -> bool:
         """
         Flash calibration region to ECU
         
         Args:
             data: Calibration data to flash
             verify: Verify flash after writing
+            progress_callback: Optional callback(message, percent)
             
         Returns:
             bool: True if successful
@@ -281,7 +296,8 @@ class UDSHandler:
         
         try:
             # DirectCANFlasher has a high-level method for this entire process
-            success = self._flasher.flash_calibration_region(data, verify=verify)
+            success = self._flasher.flash_calibration_region(data, verify=verify,
+                                                             progress_callback=progress_callback)
             
             if success:
                 self.log("✓ Calibration flash successful")
@@ -307,7 +323,7 @@ class UDSHandler:
         self.log(f"Resetting ECU (type 0x{reset_type:02X}) via direct CAN...")
         
         try:
-            self._flasher.connect()
+            self._connect()
             
             # Map the integer to the EcuResetType enum if it exists
             try: